@@ -0,0 +1,254 @@
+"""
+PATIENT VOICE HOT-PATH BENCHMARK
+Measures latency, throughput and allocations of the per-turn stages, and the
+cold-import time of the modules short-lived jobs start from:
+    python benchmark.py --size 5000 --save baseline.json
+    python benchmark.py --size 5000 --compare baseline.json
+Exits non-zero when a stage regresses past --tolerance against the baseline,
+or when an import goes over its IMPORT_BUDGETS_MS entry.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from syncare import DoctorInsightsGenerator, PatientVoiceInterface
+
+# Trigger words in the three languages patients mix, plus everyday filler
+TRIGGER_WORDS = {
+    "english": ["money", "stole", "steal", "sister", "home", "mother", "alone", "forget", "can't remember", "Solapur", "Pankaj", "bus"],
+    "marathi": ["chori", "ghar", "tai", "aai", "paise", "एकटी", "घर"],
+    "hindi": ["behen", "mama", "ghar jaana hai", "paisa", "akeli", "बहन"],
+}
+FILLER_WORDS = {
+    "english": ["where", "is", "my", "the", "today", "please", "I", "want", "to", "go", "now", "they", "took", "again"],
+    "marathi": ["kuthe", "aahe", "majha", "mala", "nahi", "kay", "zala", "lavkar", "आज"],
+    "hindi": ["kahan", "hai", "mera", "mujhe", "nahin", "kya", "hua", "abhi", "आज"],
+}
+
+# Budgets for the cumulative cold import time (standard library included) of the
+# entry points used by alert handlers, cron summarizers and session workers,
+# which pay it on every start
+IMPORT_BUDGETS_MS = {
+    "syncare": 25.0,
+    "syncare.storage": 50.0,
+    "syncare.series": 50.0,
+    "syncare.risk": 45.0,
+    "syncare.family": 50.0,
+    "syncare.medication": 30.0,
+    "syncare.correlation": 50.0,
+    "syncare.insights": 50.0,
+    "syncare.patient": 45.0,
+    "syncare.sessions": 60.0,
+}
+
+def generate_corpus(size: int, seed: int = 7, trigger_rate: float = 0.35,
+                    min_words: int = 4, max_words: int = 24) -> List[Tuple[str, datetime.datetime]]:
+    """Deterministic (utterance, timestamp) pairs spread over one day"""
+    rng = random.Random(seed)
+    languages = list(FILLER_WORDS)
+    start = datetime.datetime(2026, 2, 8, 6, 0)
+    corpus = []
+    for i in range(size):
+        language = rng.choice(languages)
+        words = []
+        for _ in range(rng.randint(min_words, max_words)):
+            pool = TRIGGER_WORDS if rng.random() < trigger_rate else FILLER_WORDS
+            words.append(rng.choice(pool[rng.choice(languages) if rng.random() < 0.3 else language]))
+        corpus.append((" ".join(words), start + datetime.timedelta(seconds=int(16 * 3600 * i / max(size, 1)))))
+    return corpus
+
+def _percentile(sorted_samples: List[int], fraction: float) -> int:
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+def measure(operation: Callable[[int], object], count: int, repeat_allocations: int = 200) -> Dict:
+    """Time `operation(i)` for i in range(count), then sample its allocations"""
+    samples = []
+    clock = time.perf_counter_ns
+    for i in range(count):
+        begin = clock()
+        operation(i)
+        samples.append(clock() - begin)
+    samples.sort()
+    total_ns = sum(samples)
+
+    # Allocation tracking distorts timings, so it runs as its own pass
+    allocation_runs = min(count, repeat_allocations)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(allocation_runs):
+        operation(i)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    return {
+        "ops": count,
+        "ops_per_sec": round(count / (total_ns / 1e9), 1) if total_ns else None,
+        "p50_us": round(_percentile(samples, 0.50) / 1000, 3),
+        "p99_us": round(_percentile(samples, 0.99) / 1000, 3),
+        "max_us": round(samples[-1] / 1000, 3),
+        "retained_bytes_per_op": round(allocated / allocation_runs, 1),
+        "retained_blocks_per_op": round(blocks / allocation_runs, 2),
+        "peak_traced_bytes": peak,
+    }
+
+def measure_import(module: str, runs: int = 5) -> Dict:
+    """Best-of-`runs` cold import of `module` in a fresh interpreter, via -X importtime"""
+    # Deployed jobs start from cached bytecode, so an untimed first run fills a
+    # throwaway bytecode cache that the timed runs then read
+    with tempfile.TemporaryDirectory() as pycache:
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+        # Run beside this script so `-c` finds the package wherever the benchmark is started from
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        subprocess.run(command, capture_output=True, env=env, cwd=cwd, check=True)
+        reports = [subprocess.run(command, capture_output=True, text=True, env=env, cwd=cwd, check=True).stderr
+                   for _ in range(runs)]
+    own_us, total_us = [], []
+    for report in reports:
+        own = total = 0
+        for line in report.splitlines():
+            fields = line.partition(":")[2].split("|")
+            if len(fields) != 3 or not fields[0].strip().isdigit():
+                continue
+            name = fields[2].strip()
+            if name == "syncare" or name.startswith("syncare."):
+                own += int(fields[0])
+            if name == module:
+                total = int(fields[1])
+        own_us.append(own)
+        total_us.append(total)
+    total_ms = min(total_us) / 1000
+    budget = IMPORT_BUDGETS_MS.get(module)
+    return {
+        "own_ms": round(min(own_us) / 1000, 3),
+        "total_ms": round(total_ms, 3),
+        "budget_ms": budget,
+        "within_budget": budget is None or total_ms <= budget,
+    }
+
+def run_benchmarks(size: int, seed: int) -> Dict:
+    corpus = generate_corpus(size, seed)
+    interface = PatientVoiceInterface()
+    companion = interface.companion
+    insights = DoctorInsightsGenerator(interface.patient, interface.analyzer)
+    interaction_log = [interface.listen_mode(text, ts)["log_to_doctor"] for text, ts in corpus]
+    for entry, (_, ts) in zip(interaction_log, corpus):
+        insights.record_interaction(ts, entry["state"], entry["triggers"])
+    day = corpus[0][1].date()
+
+    stages = {
+        "generate_response": lambda i: companion.generate_response(*corpus[i]),
+        "listen_mode": lambda i: interface.listen_mode(*corpus[i]),
+        "daily_summary_from_log": lambda i: insights.generate_daily_summary(day, interaction_log),
+        "daily_summary_snapshot": lambda i: insights.generate_daily_summary(day),
+    }
+    counts = {
+        "generate_response": size,
+        "listen_mode": size,
+        "daily_summary_from_log": max(1, min(size, 200)),
+        "daily_summary_snapshot": size,
+    }
+
+    results = {name: measure(operation, counts[name]) for name, operation in stages.items()}
+
+    texts = [text for text, _ in corpus]
+    stamps = [ts for _, ts in corpus]
+    begin = time.perf_counter_ns()
+    companion.classify_batch(texts, stamps)
+    elapsed = time.perf_counter_ns() - begin
+    results["classify_batch"] = {
+        "ops": size,
+        "ops_per_sec": round(size / (elapsed / 1e9), 1) if elapsed else None,
+        "total_ms": round(elapsed / 1e6, 3),
+    }
+
+    return {
+        "meta": {
+            "corpus_size": size,
+            "seed": seed,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "stages": results,
+        "imports": {module: measure_import(module) for module in IMPORT_BUDGETS_MS},
+    }
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Stages whose p50/p99 grew or throughput fell by more than `tolerance`"""
+    regressions = []
+    for stage, base in baseline.get("stages", {}).items():
+        now = current["stages"].get(stage)
+        if now is None:
+            continue
+        for metric in ("p50_us", "p99_us"):
+            if base.get(metric) and now.get(metric) and now[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{stage}.{metric}: {base[metric]} -> {now[metric]}")
+        if base.get("ops_per_sec") and now.get("ops_per_sec") and now["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{stage}.ops_per_sec: {base['ops_per_sec']} -> {now['ops_per_sec']}")
+    for module, base in baseline.get("imports", {}).items():
+        now = current.get("imports", {}).get(module)
+        if now and base.get("total_ms") and now["total_ms"] > base["total_ms"] * (1 + tolerance):
+            regressions.append(f"import {module}.total_ms: {base['total_ms']} -> {now['total_ms']}")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the patient voice hot path")
+    parser.add_argument("--size", type=int, default=5000, help="synthetic utterances to generate")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.size, args.seed)
+
+    print(f"{'stage':<26}{'ops/sec':>14}{'p50 us':>12}{'p99 us':>12}{'bytes/op':>12}")
+    for stage, stats in results["stages"].items():
+        print(f"{stage:<26}{stats.get('ops_per_sec') or 0:>14,.0f}{stats.get('p50_us', 0):>12}"
+              f"{stats.get('p99_us', 0):>12}{stats.get('retained_bytes_per_op', 0):>12}")
+
+    print(f"\n{'import':<26}{'own ms':>14}{'total ms':>12}{'budget ms':>12}")
+    over_budget = []
+    for module, stats in results["imports"].items():
+        print(f"{module:<26}{stats['own_ms']:>14}{stats['total_ms']:>12}{stats['budget_ms']:>12}"
+              f"{'' if stats['within_budget'] else '  OVER'}")
+        if not stats["within_budget"]:
+            over_budget.append(module)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("corpus_size") != args.size:
+            print(f"Warning: baseline used --size {baseline['meta'].get('corpus_size')}", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+BULK TRANSCRIPT IMPORT
+Classifies historical transcript exports and writes them to the interaction log:
+    python bulk_import.py recordings.ndjson --log-root data/logs --series-root data/series
+    python bulk_import.py export.csv --log-root data/logs --workers 8
+    cat export.ndjson | python bulk_import.py - --format ndjson --log-root data/logs
+Rows are read as a stream and classified in per-patient chunks on a process
+pool; at most --max-buffered rows are held in memory whatever the input size.
+Each row needs a patient id, an ISO timestamp and the transcript text (see
+--patient-field/--time-field/--text-field). Timestamps with a UTC offset are
+converted to naive local time, like every other time in the system. Rows of
+one patient should be in time order. With --strict the whole input is checked
+before anything is imported. Unlike listen_mode, every trigger an utterance hits is recorded,
+not only the one the companion would have answered.
+"""
+
+import argparse
+import csv
+import datetime
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from syncare import (
+    BehavioralPatternAnalyzer, DailySeriesStore, InteractionLogStore, InteractionRecord, PatientContext,
+    STATES_BY_CODE, TranscriptIndex, VoiceCompanionAI, triggers_from_mask
+)
+
+Row = Tuple[str, datetime.datetime, str]
+
+# Per-process companion used by _classify_chunk
+_companion: Optional[VoiceCompanionAI] = None
+
+def _init_worker() -> None:
+    global _companion
+    context = PatientContext().intern()
+    _companion = VoiceCompanionAI(context, BehavioralPatternAnalyzer(context))
+
+def _classify_chunk(texts: List[str], timestamps: List[datetime.datetime]) -> Tuple[bytes, bytes]:
+    if _companion is None:
+        _init_worker()
+    batch = _companion.classify_batch(texts, timestamps)
+    return batch.state_codes.tobytes(), batch.trigger_masks.tobytes()
+
+def read_rows(stream: Iterable[str], fmt: str, patient_field: str, time_field: str, text_field: str,
+              errors: List[str]) -> Iterator[Row]:
+    """(patient id, timestamp, text) per usable row; problems are appended to `errors`"""
+    records: Iterable = csv.DictReader(stream) if fmt == "csv" else (line for line in stream if line.strip())
+    for number, record in enumerate(records, 1):
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            text = record[text_field] or ""
+            if not isinstance(text, str):
+                errors.append(f"row {number}: {text_field} is {type(text).__name__}, not text")
+                continue
+            timestamp = datetime.datetime.fromisoformat(record[time_field])
+            if timestamp.tzinfo is not None:
+                timestamp = timestamp.astimezone().replace(tzinfo=None)
+            row = (str(record[patient_field]), timestamp, text)
+        except json.JSONDecodeError as exc:
+            errors.append(f"row {number}: invalid JSON ({exc.msg})")
+            continue
+        except (KeyError, TypeError, ValueError) as exc:
+            errors.append(f"row {number}: {exc!r}")
+            continue
+        yield row
+
+class BulkImporter:
+    """Fans per-patient chunks out to a process pool and writes results in input order"""
+
+    def __init__(self, log_store: InteractionLogStore, series_store: Optional[DailySeriesStore] = None,
+                 transcript_index: Optional[TranscriptIndex] = None, workers: Optional[int] = None,
+                 chunk_size: int = 2000, max_buffered: int = 50_000):
+        self.log_store = log_store
+        self.series_store = series_store
+        self.transcript_index = transcript_index
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_buffered = max_buffered
+        self.rows = 0
+        self.patients: Dict[str, int] = {}
+
+    def run(self, rows: Iterable[Row]) -> None:
+        if self.workers == 0:
+            self._run(rows, None)
+        else:
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker) as executor:
+                self._run(rows, executor)
+
+    def _run(self, rows: Iterable[Row], executor: Optional[ProcessPoolExecutor]) -> None:
+        buffers: Dict[str, Tuple[List[str], List[datetime.datetime]]] = {}
+        pending: Deque[Tuple[Future, str, List[str], List[datetime.datetime]]] = deque()
+        max_pending = 2 * ((self.workers or os.cpu_count() or 1) if executor else 1)
+        buffered = 0
+
+        def submit(patient_id: str) -> None:
+            nonlocal buffered
+            texts, timestamps = buffers.pop(patient_id)
+            buffered -= len(texts)
+            # Backpressure: don't read ahead of the workers by more than a few chunks
+            while len(pending) >= max_pending:
+                self._write(*pending.popleft())
+            if executor is None:
+                future = Future()
+                future.set_result(_classify_chunk(texts, timestamps))
+            else:
+                future = executor.submit(_classify_chunk, texts, timestamps)
+            pending.append((future, patient_id, texts, timestamps))
+
+        for patient_id, timestamp, text in rows:
+            texts, timestamps = buffers.setdefault(patient_id, ([], []))
+            texts.append(text)
+            timestamps.append(timestamp)
+            buffered += 1
+            if len(texts) >= self.chunk_size:
+                submit(patient_id)
+            elif buffered >= self.max_buffered:
+                submit(max(buffers, key=lambda pid: len(buffers[pid][0])))
+        for patient_id in list(buffers):
+            submit(patient_id)
+        while pending:
+            self._write(*pending.popleft())
+
+    def _write(self, future: Future, patient_id: str, texts: List[str], timestamps: List[datetime.datetime]) -> None:
+        state_bytes, mask_bytes = future.result()
+        masks = memoryview(mask_bytes).cast("H")
+        series = self.series_store.get(patient_id) if self.series_store is not None else None
+        for text, timestamp, state_code, mask in zip(texts, timestamps, state_bytes, masks):
+            state = STATES_BY_CODE[state_code]
+            triggers = triggers_from_mask(mask)
+            self.log_store.append_record(patient_id, InteractionRecord.of(timestamp, state, triggers, text))
+            if series is not None:
+                series.record_interaction(timestamp, state, triggers)
+            if self.transcript_index is not None:
+                self.transcript_index.add(patient_id, timestamp, text)
+        self.rows += len(texts)
+        self.patients[patient_id] = self.patients.get(patient_id, 0) + len(texts)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import transcript exports into the interaction log")
+    parser.add_argument("input", help="NDJSON or CSV file, or - for stdin")
+    parser.add_argument("--format", choices=("ndjson", "csv"), help="default: from the file extension")
+    parser.add_argument("--log-root", required=True, help="InteractionLogStore directory")
+    parser.add_argument("--series-root", help="DailySeriesStore directory for per-day aggregates")
+    parser.add_argument("--index-root", help="TranscriptIndex directory for utterance search")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count, 0: in-process)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="rows per classification chunk")
+    parser.add_argument("--max-buffered", type=int, default=50_000, help="rows held before chunks are forced out")
+    parser.add_argument("--patient-field", default="patient_id")
+    parser.add_argument("--time-field", default="timestamp")
+    parser.add_argument("--text-field", default="patient_said")
+    parser.add_argument("--strict", action="store_true", help="import nothing if any row is unusable")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "ndjson")
+    if args.input == "-":
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    else:
+        stream = open(args.input, encoding="utf-8", newline="")
+
+    errors: List[str] = []
+    if args.strict:
+        # Check every row first; stdin can only be read once, so spool it to disk
+        if args.input == "-":
+            spooled = tempfile.TemporaryFile("w+", encoding="utf-8", newline="")
+            with stream:
+                for line in stream:
+                    spooled.write(line)
+            spooled.seek(0)
+            stream = spooled
+        for _ in read_rows(stream, fmt, args.patient_field, args.time_field, args.text_field, errors):
+            pass
+        if errors:
+            stream.close()
+            _report_errors(errors)
+            print("Nothing imported (--strict)", file=sys.stderr)
+            return 1
+        stream.seek(0)
+
+    series_store = DailySeriesStore(args.series_root) if args.series_root else None
+    transcript_index = TranscriptIndex(args.index_root) if args.index_root else None
+    started = time.perf_counter()
+    with stream, InteractionLogStore(args.log_root) as log_store:
+        importer = BulkImporter(log_store, series_store, transcript_index, args.workers,
+                                args.chunk_size, args.max_buffered)
+        importer.run(read_rows(stream, fmt, args.patient_field, args.time_field, args.text_field, errors))
+    if series_store is not None:
+        series_store.save()
+    if transcript_index is not None:
+        transcript_index.close()
+    elapsed = time.perf_counter() - started
+
+    _report_errors(errors)
+    print(f"Imported {importer.rows:,} interactions for {len(importer.patients):,} patients "
+          f"in {elapsed:.1f}s ({importer.rows / elapsed if elapsed else 0:,.0f} rows/sec)")
+    return 0
+
+def _report_errors(errors: List[str]) -> None:
+    for error in errors[:20]:
+        print(f"Skipped {error}", file=sys.stderr)
+    if len(errors) > 20:
+        print(f"... and {len(errors) - 20} more unusable rows", file=sys.stderr)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+SYNCARE
+Patient, family and doctor interfaces for dementia companion care.
+
+Submodules are imported on first use of one of their names, so a job that only
+needs e.g. `InteractionLogStore` does not pay for the voice pipeline:
+    from syncare import InteractionLogStore      # loads syncare.storage + syncare.model
+"""
+
+import importlib
+from typing import Dict, List
+
+# Public name -> submodule that defines it
+_EXPORTS: Dict[str, str] = {
+    "CognitiveState": "model",
+    "EmotionalTrigger": "model",
+    "PatientContext": "model",
+    "STATES_BY_CODE": "model",
+    "STATE_CODES": "model",
+    "TriggerMask": "model",
+    "TRIGGER_BITS": "model",
+    "triggers_from_mask": "model",
+    "InteractionRecord": "model",
+    "TRIGGER_VOCABULARY": "matching",
+    "STATE_CUE_VOCABULARY": "matching",
+    "TriggerHit": "matching",
+    "TriggerScan": "matching",
+    "TriggerMatcher": "matching",
+    "DEFAULT_TRIGGER_MATCHER": "matching",
+    "StreamingTriggerScanner": "matching",
+    "BatchClassification": "matching",
+    "RESPONSE_TEMPLATES": "templates",
+    "TemplateRegistry": "templates",
+    "DEFAULT_TEMPLATE_REGISTRY": "templates",
+    "StageHook": "instrumentation",
+    "LatencyHistogram": "instrumentation",
+    "LatencyRegistry": "instrumentation",
+    "SlidingWindowCounter": "frequency",
+    "TriggerFrequencyTracker": "frequency",
+    "BehavioralPatternAnalyzer": "analysis",
+    "DISTRESS_TRIGGER_MASK": "risk",
+    "SundownRiskProfile": "risk",
+    "EscalationAlert": "risk",
+    "EscalationDetector": "risk",
+    "VoiceCompanionAI": "companion",
+    "DailySummaryAggregator": "series",
+    "TIME_BANDS": "series",
+    "PatientDailySeries": "series",
+    "DailySeriesStore": "series",
+    "TRIGGER_RECOMMENDATIONS": "correlation",
+    "LaggedCorrelation": "correlation",
+    "CorrelationEngine": "correlation",
+    "DEFAULT_CORRELATION_ENGINE": "correlation",
+    "run_nightly_correlations": "correlation",
+    "DEFAULT_DOSE_TIMES": "medication",
+    "DoseLedger": "medication",
+    "DoseLedgerStore": "medication",
+    "DoctorInsightsGenerator": "insights",
+    "InteractionLogStore": "storage",
+    "PatientContextStore": "storage",
+    "tokenize_transcript": "search",
+    "TranscriptIndex": "search",
+    "InterventionSchedule": "scheduling",
+    "ScheduledEvent": "scheduling",
+    "InterventionScheduler": "scheduling",
+    "PatientVoiceInterface": "patient",
+    "StreamingUtterance": "patient",
+    "FAMILY_ALERT_MESSAGES": "family",
+    "TRIGGER_FAMILY_ALERTS": "family",
+    "FamilyDashboardView": "family",
+    "MaterializedFamilyView": "family",
+    "VideoChunk": "video",
+    "VideoIngestResult": "video",
+    "video_chunk_bitrate": "video",
+    "VideoIngestor": "video",
+    "CHAT_TOPICS": "doctor",
+    "normalize_question": "doctor",
+    "CHAT_TOPIC_INDEX": "doctor",
+    "match_chat_topic": "doctor",
+    "ChatAnswerCache": "doctor",
+    "DoctorDashboard": "doctor",
+    "PatientSession": "sessions",
+    "SessionManager": "sessions",
+    "SessionStateStore": "sessions",
+    "shard_for_patient": "sessions",
+    "ShardedSessionPool": "sessions",
+}
+
+__all__: List[str] = list(_EXPORTS)
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
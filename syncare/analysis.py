@@ -0,0 +1,53 @@
+"""Behavioral pattern analysis of single utterances"""
+
+import datetime
+from typing import Dict, Optional
+
+from .model import EmotionalTrigger, PatientContext
+from .matching import DEFAULT_TRIGGER_MATCHER, TriggerMatcher, TriggerScan
+from .templates import DEFAULT_TEMPLATE_REGISTRY, TemplateRegistry
+from .frequency import TriggerFrequencyTracker
+
+class BehavioralPatternAnalyzer:
+    """Analyzes behaviors to extract psychological meaning"""
+   
+    def __init__(self, patient_context: PatientContext, matcher: TriggerMatcher = DEFAULT_TRIGGER_MATCHER,
+                 templates: TemplateRegistry = DEFAULT_TEMPLATE_REGISTRY,
+                 frequencies: Optional[TriggerFrequencyTracker] = None):
+        self.context = patient_context
+        self.matcher = matcher
+        self.templates = templates
+        # Fed by VoiceCompanionAI with every classified utterance
+        self.frequencies = frequencies or TriggerFrequencyTracker()
+        self.pattern_history = []
+   
+    def analyze_money_paranoia(self, utterance: str, time_of_day: datetime.time, scan: Optional[TriggerScan] = None) -> Dict:
+        scan = scan or self.matcher.scan(utterance)
+        if not scan.has(EmotionalTrigger.MONEY_ANXIETY):
+            return None
+       
+        return {
+            "surface_behavior": "Reports money/property theft",
+            "psychological_root": "Grief for lost competence and agency",
+            "ai_response_template": self.templates.render(self.context)["money_anxiety"],
+            "risk_level": "MODERATE" if time_of_day.hour < 16 else "HIGH"
+        }
+   
+    def analyze_sister_obsession(self, utterance: str, frequency_today: int, scan: Optional[TriggerScan] = None) -> Dict:
+        scan = scan or self.matcher.scan(utterance)
+        if not scan.has(EmotionalTrigger.SISTER_URGENCY):
+            return None
+       
+        return {
+            "surface_behavior": "Repeatedly mentions sister",
+            "psychological_root": "Anticipatory grief + last biological witness",
+            "ai_response_template": self.templates.render(self.context)["sister_urgency"],
+            "frequency_threshold": f"Mentioned {frequency_today}x today"
+        }
+   
+    def analyze_pankaj_hallucinations(self, reported_vision: str, state: str) -> Dict:
+        return {
+            "surface_behavior": "Hallucinates Pankaj at various ages",
+            "psychological_root": "Maternal identity preservation + role reversal anxiety",
+            "ai_response_template": self.templates.render(self.context)["pankaj_hallucination"]
+        }
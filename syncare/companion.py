@@ -0,0 +1,163 @@
+"""The voice companion that answers the patient"""
+
+import datetime
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .model import CognitiveState, EmotionalTrigger, InteractionRecord, PatientContext, STATE_CODES, STATES_BY_CODE, TRIGGER_BITS, triggers_from_mask, _wall_micros
+from .matching import BatchClassification, TriggerScan
+from .instrumentation import _report_stage, StageHook
+from .analysis import BehavioralPatternAnalyzer
+from .risk import DISTRESS_TRIGGER_MASK, EscalationAlert, EscalationDetector, SundownRiskProfile
+
+class VoiceCompanionAI:
+    """Real-time conversational AI for patient"""
+   
+    def __init__(self, patient_context: PatientContext, analyzer: BehavioralPatternAnalyzer,
+                 sundown_profile: Optional[SundownRiskProfile] = None,
+                 escalation: Optional[EscalationDetector] = None):
+        self.context = patient_context
+        self.analyzer = analyzer
+        self.conversation_history = []
+        self.current_state = CognitiveState.STABLE
+        self.matcher = analyzer.matcher
+        self.sundown_profile = sundown_profile or SundownRiskProfile()
+        self.escalation = escalation or EscalationDetector()
+        # Empty by default: timing costs one truthiness check per stage
+        self.stage_hooks: List[StageHook] = []
+       
+    def detect_cognitive_state(self, voice_input: str, time: datetime.datetime, scan: Optional[TriggerScan] = None) -> CognitiveState:
+        profile = self.sundown_profile
+        sundown = profile.is_sundown(time)
+        if sundown and not profile.trained:
+            return CognitiveState.SUNDOWNING
+       
+        scan = scan or self.matcher.scan(voice_input)
+        return STATES_BY_CODE[self._state_code(time.hour, scan.cue_mask, sundown, profile.trained)]
+
+    @staticmethod
+    def _state_code(hour: int, cue_mask: int, sundown: bool, learned: bool = False) -> int:
+        # A learned sundown cell is a risk estimate; an agitated cue in the turn itself outranks it
+        agitated = cue_mask & (1 << STATE_CODES[CognitiveState.AGITATED])
+        if sundown and not (learned and agitated):
+            return STATE_CODES[CognitiveState.SUNDOWNING]
+        if agitated:
+            return STATE_CODES[CognitiveState.AGITATED]
+        if cue_mask & (1 << STATE_CODES[CognitiveState.TEMPORAL_DISPLACEMENT]) and hour > 15:
+            return STATE_CODES[CognitiveState.TEMPORAL_DISPLACEMENT]
+        return STATE_CODES[CognitiveState.STABLE]
+
+    def classify_batch(self, utterances: Sequence[str], timestamps: Sequence[datetime.datetime]) -> BatchClassification:
+        """Classify many (utterance, time) pairs into columnar state codes and trigger masks.
+
+        Unlike generate_response, each row's mask holds every trigger the
+        utterance hit, not only the one the companion would answer.
+        """
+        if len(utterances) != len(timestamps):
+            raise ValueError(f"{len(utterances)} utterances but {len(timestamps)} timestamps")
+
+        state_codes = array("B", bytes(len(utterances)))
+        trigger_masks = array("H", bytes(2 * len(utterances)))
+        scan_masks = self.matcher.scan_masks
+        state_code = self._state_code
+        is_sundown = self.sundown_profile.is_sundown
+        learned = self.sundown_profile.trained
+
+        for i, (utterance, timestamp) in enumerate(zip(utterances, timestamps)):
+            trigger_mask, cue_mask = scan_masks(utterance)
+            state_codes[i] = state_code(timestamp.hour, cue_mask, is_sundown(timestamp), learned)
+            trigger_masks[i] = trigger_mask
+
+        return BatchClassification(state_codes=state_codes, trigger_masks=trigger_masks)
+   
+    def generate_response(self, user_input: str, current_time: datetime.datetime) -> Dict:
+        record, ai_utterance, clinical_note, _ = self.respond(user_input, current_time)
+        return {
+            "cognitive_state": STATES_BY_CODE[record.state_code].value,
+            "detected_triggers": [trigger.value for trigger in triggers_from_mask(record.trigger_mask)],
+            "response_strategy": "",
+            "ai_utterance": ai_utterance,
+            "clinical_note": clinical_note
+        }
+
+    def respond(self, user_input: str, current_time: datetime.datetime, scan: Optional[TriggerScan] = None
+                ) -> Tuple[InteractionRecord, str, str, Optional[EscalationAlert]]:
+        """(record, AI utterance, clinical note, escalation alert) for one turn; generate_response without the dict"""
+        received = time.perf_counter_ns()
+        hooks = self.stage_hooks
+        if hooks:
+            mark = received
+
+        # One lowercase + scan per utterance, shared by every check below
+        scan = scan or self.matcher.scan(user_input)
+        self.analyzer.frequencies.record(current_time, scan.triggers)
+        if hooks:
+            mark = _report_stage(hooks, "trigger_scan", mark)
+        sundown = self.sundown_profile.is_sundown(current_time)
+        state = self.detect_cognitive_state(user_input, current_time, scan)
+        self.sundown_profile.observe(current_time, bool(scan.cue_mask or scan.trigger_mask & DISTRESS_TRIGGER_MASK))
+        if hooks:
+            mark = _report_stage(hooks, "state_detection", mark)
+        state, alert = self.escalation.update(current_time, state, scan.trigger_mask, scan.cue_mask, sundown, received)
+        if hooks:
+            mark = _report_stage(hooks, "escalation", mark)
+       
+        money_analysis = self.analyzer.analyze_money_paranoia(user_input, current_time.time(), scan)
+        if hooks:
+            mark = _report_stage(hooks, "analyze_money_paranoia", mark)
+        sister_analysis = self.analyzer.analyze_sister_obsession(
+            user_input,
+            frequency_today=self.analyzer.frequencies.count(EmotionalTrigger.SISTER_URGENCY, "day"),
+            scan=scan
+        )
+        if hooks:
+            mark = _report_stage(hooks, "analyze_sister_obsession", mark)
+        templates = self.analyzer.templates.render(self.context)
+       
+        if money_analysis:
+            trigger = EmotionalTrigger.MONEY_ANXIETY
+            ai_utterance = money_analysis["ai_response_template"]
+            clinical_note = "Patient expressing competence grief via financial paranoia"
+       
+        elif sister_analysis:
+            trigger = EmotionalTrigger.SISTER_URGENCY
+            ai_utterance = sister_analysis["ai_response_template"]
+            clinical_note = "Patient seeking final witness to pre-disease identity"
+       
+        elif scan.has(EmotionalTrigger.HOME_LONGING):
+            trigger = EmotionalTrigger.HOME_LONGING
+            ai_utterance = templates["home_longing"]
+            clinical_note = "Temporal displacement - seeking identity-anchored location"
+       
+        elif scan.has(EmotionalTrigger.PANKAJ_SAFETY):
+            trigger = EmotionalTrigger.PANKAJ_SAFETY
+            ai_utterance = templates["pankaj_safety"]
+            clinical_note = "Maternal identity preservation"
+       
+        elif scan.has(EmotionalTrigger.MATERNAL_GRIEF):
+            trigger = EmotionalTrigger.MATERNAL_GRIEF
+            ai_utterance = templates["maternal_grief"]
+            clinical_note = "Deep grief activation - maternal loss resurfacing"
+       
+        elif scan.has(EmotionalTrigger.ISOLATION_PANIC):
+            trigger = EmotionalTrigger.ISOLATION_PANIC
+            ai_utterance = templates["isolation_panic"]
+            clinical_note = "Isolation panic - requires immediate relational anchoring"
+       
+        elif scan.has(EmotionalTrigger.COMPETENCE_LOSS):
+            trigger = EmotionalTrigger.COMPETENCE_LOSS
+            ai_utterance = templates["competence_loss"]
+            clinical_note = "Self-perceived competence erosion - redirect to preserved skills"
+       
+        else:
+            trigger = None
+            ai_utterance = templates["baseline"]
+            clinical_note = "Baseline engagement"
+
+        record = InteractionRecord(
+            _wall_micros(current_time), STATE_CODES[state], TRIGGER_BITS[trigger] if trigger else 0, user_input
+        )
+        if hooks:
+            _report_stage(hooks, "response_selection", mark)
+        return record, ai_utterance, clinical_note, alert
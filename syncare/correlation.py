@@ -0,0 +1,237 @@
+"""Nightly lagged correlations over the daily series"""
+
+import datetime
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+
+from .model import CognitiveState, EmotionalTrigger
+from .series import DailySeriesStore, PatientDailySeries
+from .medication import DoseLedger, NO_DOSE, _popcount, SUNDOWN_MINUTE
+
+def _rolling_mean(values: Sequence[float], window: int) -> List[float]:
+    """Trailing mean over up to `window` values, one running sum pass"""
+    means, running = [], 0.0
+    for i, value in enumerate(values):
+        running += value
+        if i >= window:
+            running -= values[i - window]
+        means.append(running / min(i + 1, window))
+    return means
+
+def _day_over_day(values: Sequence[float]) -> List[float]:
+    return [b - a for a, b in zip(values, values[1:])]
+
+def _pearson(xs: Sequence[float], ys: Sequence[float]) -> Optional[float]:
+    n = len(xs)
+    if n < 3:
+        return None
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    if not sxx or not syy:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / (sxx * syy) ** 0.5
+
+# Two-sided normal quantile for the 95% confidence interval on r
+_Z_95 = 1.959963984540054
+
+def _fisher_z(r: float) -> float:
+    # Clamped so a perfect correlation stays finite
+    return math.atanh(max(min(r, 0.999999), -0.999999))
+
+def _fisher_p_value(r: float, n: int) -> float:
+    """Two-sided p-value for r over n pairs, from the Fisher z-transform"""
+    z = _fisher_z(r) * math.sqrt(max(n - 3, 1))
+    return math.erfc(abs(z) / math.sqrt(2))
+
+def _fisher_interval(r: float, n: int) -> Tuple[float, float]:
+    """95% confidence interval for r over n pairs"""
+    z, half_width = _fisher_z(r), _Z_95 / math.sqrt(max(n - 3, 1))
+    return math.tanh(z - half_width), math.tanh(z + half_width)
+
+def _benjamini_hochberg(p_values: Sequence[float]) -> List[float]:
+    """Benjamini-Hochberg adjusted p-values, in the order given"""
+    order = sorted(range(len(p_values)), key=p_values.__getitem__)
+    adjusted = [1.0] * len(p_values)
+    running = 1.0
+    for rank in range(len(order), 0, -1):
+        i = order[rank - 1]
+        running = min(running, p_values[i] * len(p_values) / rank)
+        adjusted[i] = running
+    return adjusted
+
+# States that count as agitation in the 16:00-19:59 band for medication_efficacy
+EVENING_DISTRESS_STATES = (CognitiveState.AGITATED, CognitiveState.SUNDOWNING, CognitiveState.EPISODE)
+
+# What to do when a theme is rising, phrased like the video-analysis recommendations
+TRIGGER_RECOMMENDATIONS: Dict[EmotionalTrigger, str] = {
+    EmotionalTrigger.MONEY_ANXIETY: "Secure 'property folder' with photos/docs",
+    EmotionalTrigger.SISTER_URGENCY: "Schedule a regular call about her sister",
+    EmotionalTrigger.PANKAJ_SAFETY: "Mandate daily 18:00 Pankaj interaction",
+    EmotionalTrigger.HOME_LONGING: "Daily 'home tour' audio sessions",
+    EmotionalTrigger.MATERNAL_GRIEF: "Incorporate maternal artifacts in routine",
+    EmotionalTrigger.ISOLATION_PANIC: "Pre-empt with afternoon relational check-ins",
+    EmotionalTrigger.COMPETENCE_LOSS: "Competence-building tasks pre-sundown",
+}
+
+@dataclass
+class LaggedCorrelation:
+    """`leader` on day t against `follower` on day t + lag_days"""
+
+    leader: str
+    follower: str
+    lag_days: int
+    r: float
+    n: int
+    p_value: float
+    interval: Tuple[float, float]  # 95% confidence interval for r
+
+def _series_label(key) -> str:
+    if isinstance(key, EmotionalTrigger):
+        return key.value.replace("_", " ")
+    state, band = key
+    return f"{band} {state.value.replace('_', ' ')} time"
+
+class CorrelationEngine:
+    """Lagged correlations between every trigger series and time-of-day state series.
+
+    Each series is the window's per-day values; constant series are
+    dropped up front. Pairs are tested at lags 0..max_lag with a Fisher-z
+    p-value, adjusted (Benjamini-Hochberg) across every test run for the
+    patient, and only significant pairs are ranked, each with a Fisher-z
+    95% interval for r.
+    """
+
+    def __init__(self, max_lag: int = 3, alpha: float = 0.05, min_abs_r: float = 0.5, min_overlap: int = 5):
+        self.max_lag = max_lag
+        self.alpha = alpha
+        self.min_abs_r = min_abs_r
+        self.min_overlap = min_overlap
+
+    def _series(self, series: PatientDailySeries, end: datetime.date, days: int,
+                recorded: Sequence[bool]) -> Dict[object, List[int]]:
+        values = {trigger: series.window(column, end, days) for trigger, column in series.trigger_columns.items()}
+        # STABLE time is just the complement of the other states, so leave it out
+        values.update({key: series.window(column, end, days) for key, column in series.band_columns.items()
+                       if key[0] is not CognitiveState.STABLE})
+        return {key: v for key, v in values.items() if len({x for x, on in zip(v, recorded) if on}) > 1}
+
+    def correlate(self, series: PatientDailySeries, end: datetime.date, days: int) -> List[LaggedCorrelation]:
+        # Days with nothing recorded (before the first turn, or gaps) are missing, not zero
+        recorded = series.recorded_days(end, days)
+        values = self._series(series, end, days, recorded)
+        keys = list(values)
+        tests = []
+        for i, a in enumerate(keys):
+            for j, b in enumerate(keys):
+                # Same-day correlation is symmetric, so test each pair once
+                if i == j or (i > j and self.max_lag == 0):
+                    continue
+                # Two time-of-day state series aren't an interesting pairing
+                if not isinstance(a, EmotionalTrigger) and not isinstance(b, EmotionalTrigger):
+                    continue
+                for lag in range(0 if i < j else 1, self.max_lag + 1):
+                    pairs = [(x, y) for x, y, x_on, y_on in zip(values[a], values[b][lag:], recorded, recorded[lag:])
+                             if x_on and y_on]
+                    if len(pairs) < self.min_overlap:
+                        continue
+                    xs, ys = zip(*pairs)
+                    r = _pearson(xs, ys)
+                    if r is not None:
+                        tests.append((a, b, lag, r, len(xs)))
+
+        # Adjusted across all tests for the patient
+        adjusted = _benjamini_hochberg([_fisher_p_value(r, n) for _, _, _, r, n in tests])
+
+        found = [
+            LaggedCorrelation(_series_label(a), _series_label(b), lag, r, n, adjusted[i], _fisher_interval(r, n))
+            for i, (a, b, lag, r, n) in enumerate(tests)
+            if adjusted[i] <= self.alpha and abs(r) >= self.min_abs_r
+        ]
+        found.sort(key=lambda c: (c.p_value, -abs(c.r)))
+        return found
+
+    def emerging_patterns(self, series: PatientDailySeries, end: datetime.date, days: int, limit: int = 5) -> List[Dict]:
+        patterns = []
+        for c in self.correlate(series, end, days)[:limit]:
+            when = "the same day" if c.lag_days == 0 else f"{c.lag_days} day{'s' if c.lag_days > 1 else ''} later"
+            direction = "rises" if c.r > 0 else "falls"
+            patterns.append({
+                "pattern": f"{c.follower.capitalize()} {direction} {when} when {c.leader} rises "
+                           f"(r={c.r:+.2f}, n={c.n} days)",
+                "clinical_significance": (
+                    (f"Leading indicator - {c.leader} precedes {c.follower}" if c.r > 0 else
+                     f"Leading indicator - {c.leader} displaces later {c.follower}") if c.lag_days else
+                    (f"Co-occurring - {c.leader} and {c.follower} move together" if c.r > 0 else
+                     f"Co-occurring - {c.leader} displaces {c.follower}")
+                ),
+                "recommendation": TRIGGER_RECOMMENDATIONS.get(
+                    next((t for t in EmotionalTrigger if _series_label(t) == c.leader), None),
+                    "Review linked themes together at the weekly pattern review"),
+                "correlation": round(c.r, 3),
+                "confidence_interval": [round(c.interval[0], 3), round(c.interval[1], 3)],
+                "lag_days": c.lag_days,
+                "p_value": round(c.p_value, 4)
+            })
+        return patterns
+
+    def medication_efficacy(self, series: PatientDailySeries, ledger: DoseLedger, end: datetime.date,
+                            days: int) -> Optional[str]:
+        """Evening agitation against dose timing and missed doses; None without resolved doses in the window"""
+        taken = [_popcount(mask) for mask in ledger.window(ledger.taken, end, days)]
+        missed = [_popcount(mask) for mask in ledger.window(ledger.missed, end, days)]
+        resolved = sum(taken) + sum(missed)
+        if not resolved:
+            return None
+        evening = [sum(seconds) / 60 for seconds in zip(*(
+            series.window(series.band_columns[(state, "evening")], end, days) for state in EVENING_DISTRESS_STATES
+        ))]
+        recorded = series.recorded_days(end, days)
+        findings = [f"{sum(taken)}/{resolved} doses taken ({sum(taken) / resolved:.0%})"]
+
+        covered = [minutes for minutes, t, m, on in zip(evening, taken, missed, recorded) if on and t and not m]
+        uncovered = [minutes for minutes, m, on in zip(evening, missed, recorded) if on and m]
+        if covered and uncovered:
+            findings.append(f"evening agitation {sum(uncovered) / len(uncovered):.0f} min/day on days with a missed "
+                            f"dose vs {sum(covered) / len(covered):.0f} min/day when all were taken")
+
+        # Hours between the last dose before 16:00 and 16:00 itself, against that evening's agitation
+        gaps, agitation = [], []
+        for minute, minutes, on in zip(ledger.window(ledger.last_before_sundown, end, days), evening, recorded):
+            if on and minute != NO_DOSE:
+                gaps.append((SUNDOWN_MINUTE - minute) / 60)
+                agitation.append(minutes)
+        r = _pearson(gaps, agitation) if len(gaps) >= self.min_overlap else None
+        if r is not None:
+            findings.append(f"r={r:+.2f} between hours since the last pre-16:00 dose and evening agitation "
+                            f"(n={len(gaps)} days)")
+            if r >= self.min_abs_r:
+                findings.append("consider moving the afternoon dose closer to 16:00")
+            elif r <= -self.min_abs_r:
+                findings.append("agitation not explained by dose wearing off - review environmental triggers")
+        elif gaps:
+            findings.append(f"dose timing recorded on {len(gaps)} days, too few to relate to evening agitation")
+        return "; ".join(findings)
+
+DEFAULT_CORRELATION_ENGINE = CorrelationEngine()
+
+def _nightly_patterns(path: str, end: Optional[datetime.date], days: int, engine: CorrelationEngine) -> List[Dict]:
+    series = PatientDailySeries.load(path)
+    return engine.emerging_patterns(series, end or series.last_day(), days) if series.days else []
+
+def run_nightly_correlations(store: "DailySeriesStore", end: Optional[datetime.date] = None, days: int = 28,
+                             engine: CorrelationEngine = DEFAULT_CORRELATION_ENGINE,
+                             workers: int = 1) -> Dict[str, List[Dict]]:
+    """emerging_patterns for every patient in a series store, optionally across processes"""
+    store.save()
+    patient_ids = store.patient_ids()
+    paths = [store._path(pid) for pid in patient_ids]
+    if workers <= 1:
+        results = [_nightly_patterns(path, end, days, engine) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # Kept out of module import for short-lived jobs
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_nightly_patterns, paths, [end] * len(paths), [days] * len(paths),
+                                    [engine] * len(paths), chunksize=max(1, len(paths) // (workers * 4))))
+    return dict(zip(patient_ids, results))
@@ -0,0 +1,364 @@
+"""Doctor dashboard and chat"""
+
+import datetime
+import os
+import re
+import time
+from collections import OrderedDict
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .model import _DAY_MICROS, EmotionalTrigger, PatientContext, STATES_BY_CODE, triggers_from_mask
+from .analysis import BehavioralPatternAnalyzer
+from .insights import DoctorInsightsGenerator
+from .storage import InteractionLogStore
+from .search import TranscriptIndex
+
+if TYPE_CHECKING:
+    from .video import VideoIngestor
+
+# Doctor chat topics, in answer priority order when a question touches several
+CHAT_TOPICS = {
+    EmotionalTrigger.MONEY_ANXIETY: (
+        ("money", "paranoia", "paranoid", "theft", "stolen", "steal", "property", "financial", "rupee"),
+        "Financial delusions stem from agency loss; root in widowhood trauma and property pride."
+    ),
+    EmotionalTrigger.SISTER_URGENCY: (
+        ("sister", "sibling", "obsession", "obsessed", "tai", "behen"),
+        "Sister as final sibling tie; triggers anticipatory loss, layered with maternal echoes."
+    ),
+    EmotionalTrigger.HOME_LONGING: (
+        ("home", "longing", "solapur", "house", "ghar", "disorientation", "displacement"),
+        "Spatial disorientation masks deeper isolation; Solapur symbolizes intact identity era."
+    ),
+    EmotionalTrigger.MATERNAL_GRIEF: (
+        ("maternal", "mother", "grief", "grieving", "aai", "mama"),
+        "Mother fixation reveals core abandonment fear; childlessness amplifies via Pankaj projection."
+    ),
+    EmotionalTrigger.ISOLATION_PANIC: (
+        ("isolation", "isolated", "panic", "alone", "lonely", "loneliness", "abandonment"),
+        "Existential aloneness surges in displacement; requires multi-sensory reconnection."
+    ),
+    EmotionalTrigger.COMPETENCE_LOSS: (
+        ("competence", "memory", "forget", "forgetting", "remember", "failure", "confidence"),
+        "Memory lapses interpreted as total failure; counter with granular success validations."
+    ),
+}
+
+_QUESTION_TOKEN = re.compile(r"[\w\u0900-\u097F]+")
+
+def _stem(token: str) -> str:
+    """Strip common English inflections, e.g. "stealing" and "steals" to "steal" """
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    for suffix in ("ness", "ing", "ed", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3 and not token.endswith("ss"):
+            return token[:-len(suffix)]
+    return token
+
+def normalize_question(question: str) -> str:
+    """Case-, punctuation- and inflection-insensitive form of a doctor question"""
+    return " ".join(_stem(token) for token in _QUESTION_TOKEN.findall(question.lower()))
+
+def _build_topic_index() -> Dict[str, List[EmotionalTrigger]]:
+    """Stemmed term -> themes it points at"""
+    index: Dict[str, List[EmotionalTrigger]] = {}
+    for trigger, (terms, _) in CHAT_TOPICS.items():
+        for term in terms:
+            index.setdefault(_stem(term), []).append(trigger)
+    return index
+
+CHAT_TOPIC_INDEX = _build_topic_index()
+
+def match_chat_topic(normalized_question: str) -> Optional[EmotionalTrigger]:
+    """Theme with the most indexed terms in the question; ties go to CHAT_TOPICS order"""
+    scores: Dict[EmotionalTrigger, int] = {}
+    for token in normalized_question.split():
+        for trigger in CHAT_TOPIC_INDEX.get(token, ()):
+            scores[trigger] = scores.get(trigger, 0) + 1
+    if not scores:
+        return None
+    return max(CHAT_TOPICS, key=lambda trigger: scores.get(trigger, 0))
+
+class ChatAnswerCache:
+    """Per-patient doctor chat answers, expired after `ttl_seconds` or on new interactions"""
+
+    def __init__(self, ttl_seconds: float = 900.0, max_entries: int = 4096,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int, Dict]]" = OrderedDict()
+
+    def get(self, patient_id: str, question: str, generation: int) -> Optional[Dict]:
+        key = (patient_id, question)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, cached_generation, answer = entry
+        if cached_generation != generation or expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return answer
+
+    def put(self, patient_id: str, question: str, generation: int, answer: Dict) -> None:
+        self._entries[(patient_id, question)] = (self.clock() + self.ttl_seconds, generation, answer)
+        self._entries.move_to_end((patient_id, question))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, patient_id: str) -> None:
+        for key in [key for key in self._entries if key[0] == patient_id]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DoctorDashboard:
+    """Complete clinical interface.
+
+    The context, analyzer, insights engine, video ingestor and chat cache
+    are built on first use, so a job that only reads the log or searches
+    transcripts never constructs them.
+    """
+   
+    def __init__(self, patient_id: str, log_store: Optional[InteractionLogStore] = None,
+                 insights_engine: Optional[DoctorInsightsGenerator] = None,
+                 patient_context: Optional[PatientContext] = None,
+                 chat_cache: Optional[ChatAnswerCache] = None,
+                 transcript_index: Optional[TranscriptIndex] = None):
+        self.patient_id = patient_id
+        self.log_store = log_store
+        self.transcript_index = transcript_index
+        # Supplied collaborators go straight into __dict__, where they shadow the cached_property builders
+        if chat_cache is not None:
+            self.chat_cache = chat_cache
+        if insights_engine is not None:
+            self.insights_engine = insights_engine
+            self.patient_context = insights_engine.context
+            self.analyzer = insights_engine.analyzer
+        elif patient_context is not None:
+            self.patient_context = patient_context
+
+    @cached_property
+    def patient_context(self) -> PatientContext:
+        return PatientContext().intern()
+
+    @cached_property
+    def analyzer(self) -> BehavioralPatternAnalyzer:
+        return BehavioralPatternAnalyzer(self.patient_context)
+
+    @cached_property
+    def insights_engine(self) -> DoctorInsightsGenerator:
+        return DoctorInsightsGenerator(self.patient_context, self.analyzer)
+
+    @cached_property
+    def video_ingestor(self) -> "VideoIngestor":
+        from .video import VideoIngestor  # Only needed once a recording is uploaded
+        return VideoIngestor()
+
+    @cached_property
+    def chat_cache(self) -> ChatAnswerCache:
+        return ChatAnswerCache()
+       
+    def view_calendar_insights(self, date: datetime.date) -> Dict:
+        day_num = date.day
+        if self.log_store is not None:  # Real interactions logged by listen_mode
+            records = self.log_store.read_day_records(self.patient_id, date)
+            day_interactions = []
+            for record in records:
+                minute_of_day = record.micros % _DAY_MICROS // 60_000_000
+                day_interactions.append({
+                    "time": f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}",
+                    "state": STATES_BY_CODE[record.state_code].value,
+                    "triggers": [trigger.value for trigger in triggers_from_mask(record.trigger_mask)]
+                })
+        # Otherwise simulate interactions based on day - completely different themes each day
+        elif day_num == 8:  # Day 1: Focus on Money Anxiety + Competence Loss
+            day_interactions = [
+                {"time": "08:15", "state": "stable", "triggers": ["competence_loss"]},
+                {"time": "12:30", "state": "agitated", "triggers": ["money_anxiety"]},
+                {"time": "16:00", "state": "sundowning", "triggers": ["money_anxiety", "competence_loss"]},
+                {"time": "18:00", "state": "stable", "triggers": ["pankaj_safety"]}
+            ]
+        elif day_num == 9:  # Day 2: Focus on Sister Urgency + Maternal Grief
+            day_interactions = [
+                {"time": "08:15", "state": "stable", "triggers": ["maternal_grief"]},
+                {"time": "14:30", "state": "confused", "triggers": ["sister_urgency"]},
+                {"time": "16:45", "state": "sundowning", "triggers": ["sister_urgency", "maternal_grief", "episode"]},
+                {"time": "18:00", "state": "stable", "triggers": ["pankaj_safety"]}
+            ]
+        elif day_num == 10:  # Day 3: Focus on Home Longing + Isolation Panic
+            day_interactions = [
+                {"time": "08:15", "state": "stable", "triggers": ["isolation_panic"]},
+                {"time": "15:20", "state": "temporal_displacement", "triggers": ["home_longing"]},
+                {"time": "17:00", "state": "sundowning", "triggers": ["home_longing", "isolation_panic"]},
+                {"time": "18:30", "state": "agitated", "triggers": ["isolation_panic", "pankaj_safety"]}
+            ]
+        else:
+            day_interactions = [
+                {"time": "08:15", "state": "stable", "triggers": []},
+                {"time": "16:00", "state": "sundowning", "triggers": ["money_anxiety"]},
+                {"time": "18:00", "state": "stable", "triggers": []}
+            ]
+       
+        if self.log_store is None:
+            daily_summary = self.insights_engine.generate_daily_summary(date, day_interactions)
+        elif date in self.insights_engine.daily_aggregates and \
+                self.insights_engine.daily_aggregates[date].total == len(day_interactions):
+            # Running counters fed by listen_mode already cover the whole day
+            daily_summary = self.insights_engine.generate_daily_summary(date)
+        else:
+            daily_summary = self.insights_engine.rebuild_daily_summary(date, records)
+       
+        return {
+            "date": date.strftime("%B %d, %Y"),
+            "quick_stats": {
+                "overall_state": daily_summary["overall_state"],
+                "episodes": daily_summary["episode_count"]
+            },
+            "timeline": day_interactions,
+            "ai_narrative": daily_summary["narrative_summary"]
+        }
+   
+    def get_ai_pattern_analysis(self, timeframe: str = "week") -> Dict:
+        series = self.insights_engine.daily_series
+        if series.days:  # Computed from interactions recorded through listen_mode
+            days = {"3days": 3, "week": 7, "month": 30}.get(timeframe, 7)
+            return self.insights_engine.analyze_series(series, series.last_day(), days)
+
+        # 3-day data with different daily themes but common sundowning and Pankaj
+        week_data = [
+            {"date": "2026-02-08", "triggers": {"money_anxiety": 2, "competence_loss": 2, "pankaj_safety": 1}},
+            {"date": "2026-02-09", "triggers": {"sister_urgency": 3, "maternal_grief": 2, "pankaj_safety": 1}},
+            {"date": "2026-02-10", "triggers": {"home_longing": 2, "isolation_panic": 2, "pankaj_safety": 1}}
+        ]
+       
+        patterns = {
+            "period_summary": "3-Day Pattern Analysis (Feb 8-10, 2026)",
+            "emerging_patterns": [
+                {
+                    "pattern": "Sundowning episodes daily, anchored by Pankaj mentions across all days",
+                    "clinical_significance": "Pankaj as universal emotional stabilizer amid varying distress themes",
+                    "recommendation": "Mandate daily 18:00 Pankaj interaction to mitigate escalation"
+                },
+                {
+                    "pattern": "Thematic progression: Day1 Competence/Money -> Day2 Relational/Maternal -> Day3 Existential/Isolation",
+                    "clinical_significance": "Layered grief unfolding; no repetition, indicating adaptive but deepening vulnerability",
+                    "recommendation": "Tailor interventions per theme: Financial review (D1), Family photos (D2), Virtual tours (D3)"
+                }
+            ],
+            "medication_efficacy": "Stable until 16:00; Day2/3 breakthroughs suggest environmental triggers over pharmacological",
+            "treatment_recommendations": ["Theme-specific de-escalation kits", "Weekly pattern review with family"]
+        }
+        return patterns
+   
+    def analyze_uploaded_video(self, video_file: str, context: Dict) -> Dict:
+        recording = None
+        if os.path.exists(video_file):
+            recording = self.video_ingestor.ingest(video_file)
+            context = dict(context, duration_seconds=round(recording.duration_seconds, 3))
+            if recording.creation_time is not None:
+                context["timestamp"] = recording.creation_time.isoformat()
+        day_num = datetime.datetime.fromisoformat(context["timestamp"]).day if "timestamp" in context else 8
+        if day_num == 9:  # Day 2: Maternal/Sister episode
+            analysis = {
+                "episode_timestamp": context.get("timestamp"),
+                "trigger_identification": {
+                    "immediate_trigger": "Sister reference evoking maternal loss",
+                    "underlying_cause": "Sundown + unresolved sibling grief"
+                },
+                "behavioral_markers": {
+                    "speech_pattern": "Emotional Marathi lamentations",
+                    "physical_signs": ["Clutching chest", "Vocal tremors"]
+                },
+                "de_escalation_analysis": {
+                    "what_worked": "Redirect to shared family memories",
+                    "why_it_worked": "Bridged grief to preserved relational bonds"
+                },
+                "recommendations": [
+                    "Incorporate maternal artifacts in routine",
+                    "Pre-empt with afternoon relational check-ins"
+                ]
+            }
+        elif day_num == 10:  # Day 3: Isolation/Home episode
+            analysis = {
+                "episode_timestamp": context.get("timestamp"),
+                "trigger_identification": {
+                    "immediate_trigger": "Home longing query",
+                    "underlying_cause": "Displacement amplified by isolation"
+                },
+                "behavioral_markers": {
+                    "speech_pattern": "Whispered pleas for return",
+                    "physical_signs": ["Gazing at door", "Fidgeting with belongings"]
+                },
+                "de_escalation_analysis": {
+                    "what_worked": "Virtual Solapur imagery description",
+                    "why_it_worked": "Reoriented spatial identity without confrontation"
+                },
+                "recommendations": [
+                    "Daily 'home tour' audio sessions",
+                    "Isolation screening via mood logs"
+                ]
+            }
+        else:  # Default or Day 1: Money/Competence
+            analysis = {
+                "episode_timestamp": context.get("timestamp"),
+                "trigger_identification": {
+                    "immediate_trigger": "Property theft delusion",
+                    "underlying_cause": "Competence erosion in sundown"
+                },
+                "behavioral_markers": {
+                    "speech_pattern": "Accusatory financial recounting",
+                    "physical_signs": ["Rummaging drawers", "Raised voice"]
+                },
+                "de_escalation_analysis": {
+                    "what_worked": "Ownership affirmation via achievement recall",
+                    "why_it_worked": "Restored agency narrative"
+                },
+                "recommendations": [
+                    "Secure 'property folder' with photos/docs",
+                    "Competence-building tasks pre-sundown"
+                ]
+            }
+        if recording is not None:
+            peak = max(recording.chunk_results, key=lambda r: r.get("kbps", 0), default=None)
+            analysis["recording"] = {
+                "duration_seconds": context["duration_seconds"],
+                "keyframe_count": len(recording.keyframes),
+                "peak_activity_seconds": [peak["start_seconds"], peak["end_seconds"]] if peak and "kbps" in peak else None
+            }
+        return analysis
+   
+    def search_utterances(self, query: str, **filters) -> List[Dict]:
+        """What the patient said matching `query`; filters as for TranscriptIndex.search"""
+        if self.transcript_index is None:
+            return []
+        return self.transcript_index.search(self.patient_id, query, **filters)
+
+    def chat_with_ai(self, doctor_question: str) -> Dict:
+        question = normalize_question(doctor_question)
+        generation = self.insights_engine.interactions_recorded
+        answer = self.chat_cache.get(self.patient_id, question, generation)
+        if answer is None:
+            answer = self._answer_question(question)
+            self.chat_cache.put(self.patient_id, question, generation, answer)
+        return {"doctor_asked": doctor_question, **answer}
+
+    def _answer_question(self, question: str) -> Dict:
+        theme = match_chat_topic(question)
+        if theme is None:
+            return {
+                "ai_analysis": "Query analyzed; theme-specific insights available.",
+                "recommended_action": "Specify trigger for deeper dive"
+            }
+
+        series = self.insights_engine.daily_series
+        last_day = series.last_day()
+        return {
+            "ai_analysis": CHAT_TOPICS[theme][1],
+            "recommended_action": "Integrate into daily protocol",
+            "theme": theme.value,
+            "mentions_last_7_days": sum(series.window(series.trigger_columns[theme], last_day, 7)) if last_day else 0
+        }
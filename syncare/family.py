@@ -0,0 +1,309 @@
+"""Family dashboard, kept up to date from the interaction stream"""
+
+import datetime
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+from .model import CognitiveState, EmotionalTrigger, InteractionRecord, STATES_BY_CODE, triggers_from_mask
+from .medication import DoseLedger
+
+# Family alert types and what relatives are told about them
+FAMILY_ALERT_MESSAGES: Dict[str, str] = {
+    "pankaj_call_needed": "She's been asking about Pankaj - a quick call would help",
+    "maternal_grief_alert": "Mentioning mother a lot - share a family photo",
+    "isolation_check": "Feeling isolated - suggest a walk or call",
+    "competence_support": "Doubting memory - remind her of her achievements",
+    "missed_doses": "Several doses missed in a row - please check her tablets",
+    "episode_alert": "She had a distressing episode - please check in on her",
+}
+
+# Triggers that raise a family alert the first time they come up each day
+TRIGGER_FAMILY_ALERTS: Dict[EmotionalTrigger, str] = {
+    EmotionalTrigger.PANKAJ_SAFETY: "pankaj_call_needed",
+    EmotionalTrigger.MATERNAL_GRIEF: "maternal_grief_alert",
+    EmotionalTrigger.ISOLATION_PANIC: "isolation_check",
+    EmotionalTrigger.COMPETENCE_LOSS: "competence_support",
+}
+
+@dataclass
+class FamilyDashboardView:
+    """Family-friendly status view"""
+   
+    patient_name: str
+    current_status: Dict
+    today_summary: Dict
+    recent_alerts: List[Dict]
+    medication_compliance: Optional[Dict]  # None when no doses are prescribed
+    last_updated: Optional[datetime.datetime] = None  # Render time when not given
+   
+    def render_dashboard(self) -> Dict:
+        return {
+            "header": {
+                "patient": self.patient_name,
+                "last_updated": (self.last_updated or datetime.datetime.now()).strftime("%I:%M %p"),
+                "overall_status": self.current_status["overall_mood"]
+            },
+            "current_state": {
+                "mood": self.current_status["overall_mood"],
+                "activity": self.current_status["current_activity"],
+                "needs_attention": self.current_status["alert_level"] == "HIGH"
+            },
+            "todays_overview": self._overview(),
+            "alerts": self._format_alerts(),
+            "reassurance": self._generate_reassurance()
+        }
+   
+    def _overview(self) -> Dict:
+        overview = {"meals": self.today_summary["meals_completed"]}
+        if self.medication_compliance is not None:
+            overview["medications"] = f"{self.medication_compliance['taken']}/{self.medication_compliance['total']}"
+        overview["episodes"] = self.today_summary["episodes_count"]
+        return overview
+
+    def _format_alerts(self) -> List[str]:
+        return [FAMILY_ALERT_MESSAGES[alert["type"]] for alert in self.recent_alerts if alert["type"] in FAMILY_ALERT_MESSAGES]
+   
+    def _generate_reassurance(self) -> str:
+        if self.today_summary["episodes_count"] == 0:
+            return "She's had a good day today."
+        else:
+            return "She had some confusion but AI helped her through it."
+
+class MaterializedFamilyView:
+    """One patient's family dashboard, kept current from the interaction stream.
+
+    Interactions, meals, doses and caregiver notes update the counters in
+    place and bump `version` only when what relatives see changes. The
+    rendered dashboard is cached per version, so fetch(since_version) for
+    an unchanged view is an integer comparison. Subscribers are called
+    with (version, dashboard) after every change. Counters reset on the
+    first event of a later day; late events from an earlier day are
+    ignored. Doses come from a DoseLedger, which each event also asks
+    for doses that have fallen due untaken; without one (nothing
+    prescribed) there are no dose alerts or compliance line.
+    """
+
+    MOODS = {
+        CognitiveState.STABLE: "calm",
+        CognitiveState.AGITATED: "frustrated",
+        CognitiveState.CONFUSED: "confused",
+        CognitiveState.SUNDOWNING: "restless",
+        CognitiveState.EPISODE: "distressed",
+        CognitiveState.TEMPORAL_DISPLACEMENT: "disoriented",
+    }
+    ALERT_LEVELS = {
+        CognitiveState.STABLE: "LOW",
+        CognitiveState.AGITATED: "MEDIUM",
+        CognitiveState.CONFUSED: "MEDIUM",
+        CognitiveState.TEMPORAL_DISPLACEMENT: "MEDIUM",
+        CognitiveState.SUNDOWNING: "HIGH",
+        CognitiveState.EPISODE: "HIGH",
+    }
+
+    def __init__(self, patient_name: str, meals_planned: int = 3, dose_ledger: Optional[DoseLedger] = None,
+                 activity: str = "Resting at home", max_alerts: int = 5, missed_dose_alert_streak: int = 2):
+        self.patient_name = patient_name
+        self.meals_planned = meals_planned
+        self.dose_ledger = dose_ledger
+        self.missed_dose_alert_streak = missed_dose_alert_streak
+        self.max_alerts = max_alerts
+        self.version = 0
+        self.mood = self.MOODS[CognitiveState.STABLE]
+        self.alert_level = self.ALERT_LEVELS[CognitiveState.STABLE]
+        self.activity = activity
+        self.day: Optional[datetime.date] = None
+        self.meals = 0
+        self.episodes = 0
+        self.alerts: List[Dict] = []
+        self.last_updated: Optional[datetime.datetime] = None
+        self._in_episode = False
+        self._rendered: Optional[Dict] = None
+        self._subscribers: List[Callable[[int, Dict], None]] = []
+        self._lock = threading.Lock()
+
+    def _stale(self, timestamp: datetime.datetime) -> bool:
+        """True for a late event from a day before the one on show; it must not reset today"""
+        return self.day is not None and timestamp.date() < self.day
+
+    def _roll_day(self, timestamp: datetime.datetime) -> bool:
+        day = timestamp.date()
+        if self.day is not None and day <= self.day:
+            return False
+        self.day = day
+        self.meals = self.episodes = 0
+        self._in_episode = False  # Counted per day, like the doctor's daily summary
+        self.alerts = []
+        return True
+
+    def _alert(self, alert_type: str, timestamp: datetime.datetime) -> bool:
+        if any(alert["type"] == alert_type for alert in self.alerts):
+            return False
+        self.alerts.append({"type": alert_type, "timestamp": timestamp.strftime("%H:%M")})
+        del self.alerts[:-self.max_alerts]
+        return True
+
+    def _close_doses(self, timestamp: datetime.datetime) -> bool:
+        """Mark overdue doses missed; True if that raised the missed-doses alert"""
+        if self.dose_ledger is None:
+            return False
+        missed = self.dose_ledger.close_due(timestamp)
+        return bool(missed) and self.dose_ledger.missed_streak >= self.missed_dose_alert_streak and \
+            self._alert("missed_doses", timestamp)
+
+    def observe(self, record: InteractionRecord) -> None:
+        """Fold one interaction into the view"""
+        timestamp = record.timestamp
+        state = STATES_BY_CODE[record.state_code]
+        with self._lock:
+            if self._stale(timestamp):
+                return
+            changed = self._roll_day(timestamp)
+            changed = self._close_doses(timestamp) or changed
+            if (self.mood, self.alert_level) != (self.MOODS[state], self.ALERT_LEVELS[state]):
+                self.mood, self.alert_level = self.MOODS[state], self.ALERT_LEVELS[state]
+                changed = True
+            if state is CognitiveState.EPISODE and not self._in_episode:
+                self.episodes += 1
+                self._alert("episode_alert", timestamp)
+                changed = True
+            self._in_episode = state is CognitiveState.EPISODE
+            for trigger in triggers_from_mask(record.trigger_mask):
+                alert_type = TRIGGER_FAMILY_ALERTS.get(trigger)
+                if alert_type is not None:
+                    changed = self._alert(alert_type, timestamp) or changed
+            update = self._changed(timestamp) if changed else None
+        self._publish(update)
+
+    def record_meal(self, timestamp: datetime.datetime) -> None:
+        with self._lock:
+            if self._stale(timestamp):
+                return
+            self._roll_day(timestamp)
+            self.meals += 1
+            update = self._changed(timestamp)
+        self._publish(update)
+
+    def record_medication(self, timestamp: datetime.datetime) -> Optional[datetime.datetime]:
+        """Confirm a dose taken at `timestamp`; returns the scheduled dose it counted for, if any"""
+        if self.dose_ledger is None:
+            return None
+        with self._lock:
+            if self._stale(timestamp):
+                # The ledger keeps every day; only the view stays on today
+                return self.dose_ledger.confirm(timestamp)
+            self._roll_day(timestamp)
+            # Confirm first, so a late dose isn't marked missed on the way
+            dose = self.dose_ledger.confirm(timestamp)
+            self._close_doses(timestamp)
+            update = self._changed(timestamp)
+        self._publish(update)
+        return dose
+
+    def check_doses(self, now: datetime.datetime) -> None:
+        """Pick up doses that fell due untaken since the last event, e.g. from a scheduled job"""
+        with self._lock:
+            if self._stale(now):
+                return
+            changed = self._roll_day(now)
+            changed = self._close_doses(now) or changed
+            update = self._changed(now) if changed else None
+        self._publish(update)
+
+    def set_dose_ledger(self, dose_ledger: DoseLedger) -> None:
+        """Start tracking doses once a schedule has been prescribed"""
+        with self._lock:
+            if dose_ledger is self.dose_ledger:
+                return
+            self.dose_ledger = dose_ledger
+            update = self._changed(self.last_updated)
+        self._publish(update)
+
+    def set_activity(self, activity: str, timestamp: datetime.datetime) -> None:
+        with self._lock:
+            if self._stale(timestamp):
+                return
+            changed = self._roll_day(timestamp) or activity != self.activity
+            self.activity = activity
+            update = self._changed(timestamp) if changed else None
+        self._publish(update)
+
+    def rename(self, patient_name: str) -> None:
+        with self._lock:
+            if patient_name == self.patient_name:
+                return
+            self.patient_name = patient_name
+            update = self._changed(self.last_updated)
+        self._publish(update)
+
+    def _changed(self, timestamp: datetime.datetime) -> Optional[Tuple[int, Dict]]:
+        self.version += 1
+        self.last_updated = timestamp
+        self._rendered = None
+        return (self.version, self._render()) if self._subscribers else None
+
+    def _publish(self, update: Optional[Tuple[int, Dict]]) -> None:
+        if update is not None:
+            for subscriber in list(self._subscribers):
+                subscriber(*update)
+
+    def _render(self) -> Dict:
+        if self._rendered is None:
+            self._rendered = FamilyDashboardView(
+                patient_name=self.patient_name,
+                current_status={"overall_mood": self.mood, "current_activity": self.activity,
+                                "alert_level": self.alert_level},
+                today_summary={"meals_completed": f"{self.meals}/{self.meals_planned}",
+                               "episodes_count": self.episodes},
+                recent_alerts=list(self.alerts),
+                medication_compliance=self.dose_ledger.summary(self.day) if self.dose_ledger is not None else None,
+                last_updated=self.last_updated
+            ).render_dashboard()
+        return self._rendered
+
+    def render_dashboard(self) -> Dict:
+        with self._lock:
+            return self._render()
+
+    def fetch(self, since_version: Optional[int] = None) -> Dict:
+        """The dashboard, or just {"version", "changed": False} if nothing changed since `since_version`"""
+        with self._lock:
+            if since_version == self.version:
+                return {"version": self.version, "changed": False}
+            return {"version": self.version, "changed": True, "dashboard": self._render()}
+
+    def to_dict(self) -> Dict:
+        """Today's counters and alerts; the name, plan and dose ledger come from elsewhere"""
+        with self._lock:
+            return {
+                "version": self.version,
+                "mood": self.mood,
+                "alert_level": self.alert_level,
+                "activity": self.activity,
+                "day": self.day.isoformat() if self.day else None,
+                "meals": self.meals,
+                "episodes": self.episodes,
+                "alerts": list(self.alerts),
+                "last_updated": self.last_updated.isoformat() if self.last_updated else None,
+                "in_episode": self._in_episode,
+            }
+
+    def restore(self, data: Dict) -> None:
+        """Resume from a to_dict() snapshot"""
+        with self._lock:
+            self.version = data["version"]
+            self.mood = data["mood"]
+            self.alert_level = data["alert_level"]
+            self.activity = data["activity"]
+            self.day = datetime.date.fromisoformat(data["day"]) if data["day"] else None
+            self.meals = data["meals"]
+            self.episodes = data["episodes"]
+            self.alerts = list(data["alerts"])
+            self.last_updated = datetime.datetime.fromisoformat(data["last_updated"]) if data["last_updated"] else None
+            self._in_episode = data["in_episode"]
+            self._rendered = None
+
+    def subscribe(self, callback: Callable[[int, Dict], None]) -> Callable[[], None]:
+        """Call `callback(version, dashboard)` on every change; returns an unsubscribe function"""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback) if callback in self._subscribers else None
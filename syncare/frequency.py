@@ -0,0 +1,127 @@
+"""Sliding-window trigger frequency counters"""
+
+import datetime
+from array import array
+from typing import Dict, Optional, Sequence
+
+from .model import EmotionalTrigger
+
+class SlidingWindowCounter:
+    """Hierarchical ring buffers of counts with running totals per window.
+
+    Windows of up to an hour are counted per minute in a ring that long;
+    longer windows are counted per hour (the current hour and the whole
+    hours before it) in a second ring, so hour/day/week windows cost 60
+    minute slots and 168 hour slots rather than a 10080-slot minute ring.
+    Totals are adjusted as slots enter and leave each window, so reading
+    a window is O(1) and advancing is amortized O(1).
+    """
+
+    _EPOCH = datetime.datetime(1970, 1, 1)
+    _MINUTE = datetime.timedelta(minutes=1)
+
+    def __init__(self, windows_minutes: Sequence[int] = (60, 1440, 10080)):
+        self.windows = tuple(windows_minutes)
+        # (per-hour ring?, span in that ring's slots) for each window
+        self._spans = [(window > 60, -(-window // 60) if window > 60 else window) for window in self.windows]
+        self.minute_size = max([span for hourly, span in self._spans if not hourly], default=1)
+        self.hour_size = max([span for hourly, span in self._spans if hourly], default=1)
+        self.minutes = array("I", bytes(4 * self.minute_size))
+        self.hours = array("I", bytes(4 * self.hour_size))
+        self.totals = [0] * len(self.windows)
+        self.current_minute: Optional[int] = None
+
+    @classmethod
+    def minute_of(cls, timestamp: datetime.datetime) -> int:
+        return (timestamp.replace(tzinfo=None) - cls._EPOCH) // cls._MINUTE
+
+    def advance(self, minute: int) -> None:
+        if self.current_minute is None or minute <= self.current_minute:
+            if self.current_minute is None:
+                self.current_minute = minute
+            return
+        self._advance_ring(self.minutes, False, self.current_minute, minute)
+        self._advance_ring(self.hours, True, self.current_minute // 60, minute // 60)
+        self.current_minute = minute
+
+    def _advance_ring(self, ring: array, hourly: bool, current: int, target: int) -> None:
+        size, totals = len(ring), self.totals
+        if target - current >= size:
+            ring[:] = array(ring.typecode, bytes(ring.itemsize * size))
+            for j, (window_hourly, _) in enumerate(self._spans):
+                if window_hourly is hourly:
+                    totals[j] = 0
+            return
+        for slot in range(current + 1, target + 1):
+            for j, (window_hourly, span) in enumerate(self._spans):
+                if window_hourly is hourly:
+                    totals[j] -= ring[(slot - span) % size]
+            ring[slot % size] = 0
+
+    def add(self, timestamp: datetime.datetime, n: int = 1) -> None:
+        minute = self.minute_of(timestamp)
+        self.advance(minute)
+        # Ages are > 0 for late, out-of-order events
+        minute_age = self.current_minute - minute
+        hour_age = self.current_minute // 60 - minute // 60
+        if minute_age < self.minute_size:
+            self.minutes[minute % self.minute_size] += n
+        if hour_age < self.hour_size:
+            self.hours[minute // 60 % self.hour_size] += n
+        for j, (hourly, span) in enumerate(self._spans):
+            if (hour_age if hourly else minute_age) < span:
+                self.totals[j] += n
+
+    def count(self, window_minutes: int, now: Optional[datetime.datetime] = None) -> int:
+        if now is not None:
+            self.advance(self.minute_of(now))
+        return self.totals[self.windows.index(window_minutes)]
+
+    def to_dict(self) -> Dict:
+        return {"windows": list(self.windows), "current_minute": self.current_minute,
+                "minutes": self.minutes.tolist(), "hours": self.hours.tolist(), "totals": self.totals}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SlidingWindowCounter":
+        counter = cls(data["windows"])
+        counter.current_minute = data["current_minute"]
+        counter.minutes = array("I", data["minutes"])
+        counter.hours = array("I", data["hours"])
+        counter.totals = list(data["totals"])
+        return counter
+
+class TriggerFrequencyTracker:
+    """Per-trigger sliding-window mention counts for one patient"""
+
+    WINDOWS = {"hour": 60, "day": 1440, "week": 10080}
+
+    def __init__(self):
+        self._counters: Dict[EmotionalTrigger, SlidingWindowCounter] = {}
+
+    def record(self, timestamp: datetime.datetime, triggers) -> None:
+        """Count one mention per trigger the utterance hit"""
+        for trigger in triggers:
+            counter = self._counters.get(trigger)
+            if counter is None:
+                counter = self._counters[trigger] = SlidingWindowCounter(tuple(self.WINDOWS.values()))
+            counter.add(timestamp)
+
+    def count(self, trigger: EmotionalTrigger, window: str = "day", now: Optional[datetime.datetime] = None) -> int:
+        counter = self._counters.get(trigger)
+        if counter is None:
+            return 0
+        return counter.count(self.WINDOWS[window], now)
+
+    def snapshot(self, now: Optional[datetime.datetime] = None) -> Dict[str, Dict[str, int]]:
+        return {
+            trigger.value: {window: self.count(trigger, window, now) for window in self.WINDOWS}
+            for trigger in self._counters
+        }
+
+    def to_dict(self) -> Dict:
+        return {trigger.value: counter.to_dict() for trigger, counter in self._counters.items()}
+
+    def restore(self, data: Dict) -> None:
+        """Replace the counts with a to_dict() snapshot"""
+        self._counters = {EmotionalTrigger(name): SlidingWindowCounter.from_dict(counter)
+                          for name, counter in data.items()}
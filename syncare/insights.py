@@ -0,0 +1,192 @@
+"""Doctor-facing insights built from recorded interactions"""
+
+import datetime
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Union
+
+from .model import CognitiveState, EmotionalTrigger, InteractionRecord, PatientContext, STATES_BY_CODE, triggers_from_mask
+from .matching import BatchClassification
+from .analysis import BehavioralPatternAnalyzer
+from .series import DailySummaryAggregator, PatientDailySeries
+from .medication import DoseLedger
+from .correlation import CorrelationEngine, _day_over_day, DEFAULT_CORRELATION_ENGINE, _rolling_mean, TRIGGER_RECOMMENDATIONS
+
+class DoctorInsightsGenerator:
+    """Clinical analysis for physician dashboard"""
+   
+    def __init__(self, patient_context: PatientContext, analyzer: BehavioralPatternAnalyzer, retain_days: int = 31,
+                 daily_series: Optional[PatientDailySeries] = None,
+                 correlation_engine: CorrelationEngine = DEFAULT_CORRELATION_ENGINE,
+                 dose_ledger: Optional[DoseLedger] = None):
+        self.context = patient_context
+        self.analyzer = analyzer
+        self.retain_days = retain_days
+        self.daily_aggregates: Dict[datetime.date, DailySummaryAggregator] = {}
+        if daily_series is not None:
+            self.daily_series = daily_series
+        self.correlation_engine = correlation_engine
+        self.dose_ledger = dose_ledger
+        self.interactions_recorded = 0  # Bumped per interaction so cached answers can tell they're stale
+
+    @cached_property
+    def daily_series(self) -> PatientDailySeries:
+        """Built on the first recorded interaction or series read"""
+        return PatientDailySeries()
+
+    def record_interaction(self, timestamp: datetime.datetime, state: str, triggers: Sequence[str]) -> None:
+        """O(1) update of the running summary for the interaction's day"""
+        self.interactions_recorded += 1
+        self._aggregate_for(timestamp.date()).add(state, triggers)
+        self.daily_series.record_interaction(
+            timestamp, CognitiveState(state),
+            [EmotionalTrigger(t) for t in triggers if t in EmotionalTrigger._value2member_map_]
+        )
+
+    def add_record(self, record: InteractionRecord) -> None:
+        """record_interaction for an already integer-coded record"""
+        self.interactions_recorded += 1
+        timestamp = record.timestamp
+        self._aggregate_for(timestamp.date()).add_record(record)
+        self.daily_series.record_interaction(timestamp, STATES_BY_CODE[record.state_code],
+                                             triggers_from_mask(record.trigger_mask))
+
+    def _aggregate_for(self, date: datetime.date) -> DailySummaryAggregator:
+        aggregate = self.daily_aggregates.get(date)
+        if aggregate is None:
+            aggregate = self.daily_aggregates[date] = DailySummaryAggregator()
+            while len(self.daily_aggregates) > self.retain_days:
+                del self.daily_aggregates[min(self.daily_aggregates)]
+        return aggregate
+   
+    def generate_daily_summary(self, date: datetime.date,
+                               interaction_log: Optional[Sequence[Union[Dict, InteractionRecord]]] = None) -> Dict:
+        """Summary for one day; without a log, a snapshot of the running counters"""
+        if interaction_log is None:
+            aggregate = self.daily_aggregates.get(date) or DailySummaryAggregator()
+            return aggregate.snapshot(date)
+
+        return DailySummaryAggregator.from_log(interaction_log).snapshot(date)
+
+    def rebuild_daily_summary(self, date: datetime.date, interaction_log: Sequence[Union[Dict, InteractionRecord]]) -> Dict:
+        """Recompute a day from its full log and keep it as the running aggregate"""
+        aggregate = self.daily_aggregates[date] = DailySummaryAggregator.from_log(interaction_log)
+        return aggregate.snapshot(date)
+
+    def to_dict(self) -> Dict:
+        """The running day aggregates; the daily series and dose ledger are saved by their own stores"""
+        return {"daily_aggregates": {date.isoformat(): aggregate.to_dict()
+                                     for date, aggregate in self.daily_aggregates.items()}}
+
+    def restore(self, data: Dict) -> None:
+        self.daily_aggregates = {datetime.date.fromisoformat(date): DailySummaryAggregator.from_dict(aggregate)
+                                 for date, aggregate in data["daily_aggregates"].items()}
+
+    def generate_batch_summary(self, date: datetime.date, batch: BatchClassification) -> Dict:
+        """Daily summary straight from classify_batch columns"""
+        aggregate = DailySummaryAggregator()
+        aggregate.add_counts(
+            len(batch),
+            {state.value: n for state, n in batch.state_counts().items()},
+            {trigger.value: n for trigger, n in batch.trigger_counts().items()},
+            batch.episode_count()
+        )
+        return aggregate.snapshot(date)
+   
+    def generate_weekly_pattern_analysis(self, week_data: List[Dict]) -> Dict:
+        """Patterns in a list of {"date": iso, "triggers": {name: count}} days"""
+        series = PatientDailySeries()
+        for day in week_data:
+            series.add_trigger_counts(
+                datetime.date.fromisoformat(day["date"]),
+                {EmotionalTrigger(name): n for name, n in day.get("triggers", {}).items()}
+            )
+        analysis = self.analyze_series(series, series.last_day(), max(series.days, 1))
+        return {
+            "week_summary": f"Pattern analysis for past {max(series.days, 1)} days",
+            "emerging_patterns": analysis["emerging_patterns"],
+            "medication_efficacy": analysis["medication_efficacy"],
+            "treatment_recommendations": analysis["treatment_recommendations"]
+        }
+
+    def analyze_series(self, series: PatientDailySeries, end: Optional[datetime.date], days: int) -> Dict:
+        """Trend, correlation and sundowning patterns over the `days` ending at `end`"""
+        end = end or datetime.date.today()
+        start = end - datetime.timedelta(days=days - 1)
+        trigger_values = {trigger: series.window(column, end, days) for trigger, column in series.trigger_columns.items()}
+        previous_values = {trigger: series.window(column, start - datetime.timedelta(days=1), days)
+                           for trigger, column in series.trigger_columns.items()}
+        patterns = []
+        # Trends only span the recorded days; the window's zero-filled edges aren't observations
+        recorded = [i for i, on in enumerate(series.recorded_days(end, days)) if on]
+        span = slice(recorded[0], recorded[-1] + 1) if recorded else slice(0)
+        span_days = len(range(days)[span])
+
+        # Rising themes: trailing 3-day mean at the end of the window vs the start
+        for trigger, values in trigger_values.items():
+            values = values[span]
+            total = sum(values)
+            if total < 3:
+                continue
+            rolling = _rolling_mean(values, 3)
+            deltas = _day_over_day(values)
+            previous_total = sum(previous_values[trigger])
+            rising_days = sum(1 for delta in deltas if delta > 0)
+            if (span_days >= 3 and rolling[-1] >= 1.5 * max(rolling[min(2, span_days - 1)], 0.5)) or \
+                    (previous_total and total >= 1.5 * previous_total):
+                label = trigger.value.replace("_", " ")
+                change = f"{previous_total} -> {total} mentions vs previous period" if previous_total else \
+                    f"3-day average {rolling[min(2, span_days - 1)]:.1f} -> {rolling[-1]:.1f}/day"
+                patterns.append({
+                    "pattern": f"{label.capitalize()} rising ({change}; up on {rising_days} of {len(deltas)} days)",
+                    "clinical_significance": f"Escalating {label} theme",
+                    "recommendation": TRIGGER_RECOMMENDATIONS[trigger]
+                })
+
+        # Themes and time-of-day states that move together, same day or lagged
+        patterns.extend(self.correlation_engine.emerging_patterns(series, end, days))
+
+        sundown_seconds = series.window(series.state_columns[CognitiveState.SUNDOWNING], end, days)
+        sundown_days = sum(1 for seconds in sundown_seconds if seconds)
+        if sundown_days:
+            patterns.append({
+                "pattern": f"Sundowning on {sundown_days} of {days} days, averaging "
+                           f"{sum(sundown_seconds) / sundown_days / 60:.0f} min on affected days",
+                "clinical_significance": "Late-afternoon vulnerability window",
+                "recommendation": "Keep pre-sundown intervention before 16:00"
+            })
+
+        efficacy = self.correlation_engine.medication_efficacy(series, self.dose_ledger, end, days) \
+            if self.dose_ledger is not None else None
+
+        recommendations = []
+        for pattern in patterns:
+            if pattern["recommendation"] not in recommendations:
+                recommendations.append(pattern["recommendation"])
+
+        return {
+            "period_summary": f"{days}-Day Pattern Analysis ({start.strftime('%b %d')} - {end.strftime('%b %d, %Y')})",
+            "emerging_patterns": patterns,
+            "medication_efficacy": efficacy or "Dose timing not recorded for this period",
+            "treatment_recommendations": recommendations
+        }
+   
+    def analyze_episode_video(self, video_metadata: Dict) -> Dict:
+        return {
+            "episode_timestamp": video_metadata.get("timestamp"),
+            "trigger_identification": {
+                "immediate_trigger": "Novel stimulus (doorbell)",
+                "underlying_cause": "Sundown vulnerability window"
+            },
+            "behavioral_markers": {
+                "speech_pattern": "Marathi childhood phrases",
+                "physical_signs": ["Hand-wringing", "Pacing"]
+            },
+            "de_escalation_analysis": {
+                "what_worked": "Mentioning Vaishampa Hospital",
+                "why_it_worked": "Activated preserved identity memory"
+            },
+            "recommendations": [
+                "Create career memory box with hospital ID",
+                "Use identity-anchoring phrases during episodes"
+            ]
+        }
@@ -0,0 +1,86 @@
+"""Per-stage latency hooks and histograms"""
+
+import bisect
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# A stage hook receives the stage name and its duration in nanoseconds
+StageHook = Callable[[str, int], None]
+
+def _report_stage(hooks: List[StageHook], stage: str, since_ns: int) -> int:
+    elapsed = time.perf_counter_ns() - since_ns
+    for hook in hooks:
+        hook(stage, elapsed)
+    # Restart the clock after the hooks so their cost isn't billed to the next stage
+    return time.perf_counter_ns()
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram, Prometheus style"""
+
+    BUCKETS_SECONDS: Tuple[float, ...] = (
+        0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0
+    )
+    _BUCKETS_NS = tuple(int(bound * 1e9) for bound in BUCKETS_SECONDS)
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(self.BUCKETS_SECONDS) + 1)  # last is +Inf
+        self.count = 0
+        self.sum_ns = 0
+
+    def observe(self, elapsed_ns: int) -> None:
+        self.bucket_counts[bisect.bisect_left(self._BUCKETS_NS, elapsed_ns)] += 1
+        self.count += 1
+        self.sum_ns += elapsed_ns
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound (seconds) of the bucket holding quantile q"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.BUCKETS_SECONDS + (float("inf"),), self.bucket_counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+class LatencyRegistry:
+    """Per-stage histograms; pass the registry itself as a stage hook"""
+
+    def __init__(self, metric_name: str = "syncare_stage_latency_seconds"):
+        self.metric_name = metric_name
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def __call__(self, stage: str, elapsed_ns: int) -> None:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram()
+        histogram.observe(elapsed_ns)
+
+    def to_prometheus(self) -> str:
+        name = self.metric_name
+        lines = [f"# HELP {name} Time spent in each companion pipeline stage",
+                 f"# TYPE {name} histogram"]
+        for stage, histogram in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, n in zip(histogram.BUCKETS_SECONDS, histogram.bucket_counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum_ns / 1e9:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict:
+        return {
+            stage: {
+                "count": histogram.count,
+                "sum_seconds": histogram.sum_ns / 1e9,
+                "p50_seconds": histogram.quantile(0.5),
+                "p99_seconds": histogram.quantile(0.99),
+                "buckets": dict(zip([f"{bound:g}" for bound in histogram.BUCKETS_SECONDS] + ["+Inf"],
+                                    histogram.bucket_counts)),
+            }
+            for stage, histogram in sorted(self.histograms.items())
+        }
@@ -0,0 +1,264 @@
+"""Single-pass trigger and state-cue matching over utterances"""
+
+import re
+from array import array
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+from .model import CognitiveState, EmotionalTrigger, STATE_CODES, STATES_BY_CODE, TRIGGER_BITS, triggers_from_mask
+
+# Keyword vocabularies for every emotional trigger. Order matters: it is the
+# priority generate_response uses when an utterance hits several triggers.
+TRIGGER_VOCABULARY: Dict[EmotionalTrigger, Tuple[str, ...]] = {
+    EmotionalTrigger.MONEY_ANXIETY: ("loot", "steal", "rob", "money", "taken", "chori"),
+    EmotionalTrigger.SISTER_URGENCY: ("sister", "behen", "tai"),
+    EmotionalTrigger.HOME_LONGING: ("solapur", "home", "ghar"),
+    EmotionalTrigger.PANKAJ_SAFETY: ("pankaj",),
+    EmotionalTrigger.MATERNAL_GRIEF: ("mother", "mama"),
+    EmotionalTrigger.ISOLATION_PANIC: ("alone", "isolated"),
+    EmotionalTrigger.COMPETENCE_LOSS: ("can't remember", "forget"),
+}
+
+# Words that move detect_cognitive_state away from STABLE
+STATE_CUE_VOCABULARY: Dict[CognitiveState, Tuple[str, ...]] = {
+    CognitiveState.AGITATED: ("loot", "steal", "chori", "money"),
+    CognitiveState.TEMPORAL_DISPLACEMENT: ("solapur", "ghar", "home", "bus"),
+}
+
+@dataclass
+class TriggerHit:
+    """One keyword occurrence inside an utterance"""
+
+    trigger: EmotionalTrigger
+    keyword: str
+    start: int
+    end: int
+
+@dataclass
+class TriggerScan:
+    """Everything the matcher found in a single utterance"""
+
+    hits: List[TriggerHit]
+    triggers: Dict[EmotionalTrigger, int]
+    state_cues: Dict[CognitiveState, int]
+    trigger_mask: int = 0
+    cue_mask: int = 0
+
+    def has(self, trigger: EmotionalTrigger) -> bool:
+        return trigger in self.triggers
+
+    def has_cue(self, state: CognitiveState) -> bool:
+        return state in self.state_cues
+
+    def primary_trigger(self) -> Optional[EmotionalTrigger]:
+        for trigger in TRIGGER_VOCABULARY:
+            if trigger in self.triggers:
+                return trigger
+        return None
+
+class TriggerMatcher:
+    """Single-pass keyword matcher compiled from all trigger vocabularies.
+
+    The regex and keyword tables are compiled on the first scan, so jobs
+    that import the pipeline without classifying text never pay for it.
+    """
+
+    _COMPILED = ("pattern", "max_keyword_length", "_expansions", "_keyword_masks")
+
+    def __init__(self,
+                 trigger_vocabulary: Dict[EmotionalTrigger, Tuple[str, ...]] = TRIGGER_VOCABULARY,
+                 state_cues: Dict[CognitiveState, Tuple[str, ...]] = STATE_CUE_VOCABULARY):
+        self.trigger_vocabulary = trigger_vocabulary
+        self.state_cues = state_cues
+
+    def __getattr__(self, name: str):
+        # Only reached while the compiled attributes are missing from __dict__
+        if name not in TriggerMatcher._COMPILED:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self._compile()
+        return self.__dict__[name]
+
+    def _compile(self) -> None:
+        trigger_vocabulary, state_cues = self.trigger_vocabulary, self.state_cues
+        keyword_triggers: Dict[str, List[EmotionalTrigger]] = {}
+        keyword_cues: Dict[str, List[CognitiveState]] = {}
+        for trigger, keywords in trigger_vocabulary.items():
+            for keyword in keywords:
+                keyword_triggers.setdefault(keyword.lower(), []).append(trigger)
+        for state, keywords in state_cues.items():
+            for keyword in keywords:
+                keyword_cues.setdefault(keyword.lower(), []).append(state)
+
+        keywords = sorted(set(keyword_triggers) | set(keyword_cues), key=len, reverse=True)
+        self.max_keyword_length = len(keywords[0]) if keywords else 0
+
+        # The regex reports the longest keyword starting at each position; any
+        # shorter keyword that is a prefix of it matches there too, so expand
+        # each keyword into every (keyword, triggers, cues) it implies.
+        self._expansions: Dict[str, Tuple[Tuple[str, Tuple[EmotionalTrigger, ...], Tuple[CognitiveState, ...]], ...]] = {}
+        for keyword in keywords:
+            self._expansions[keyword] = tuple(
+                (other, tuple(keyword_triggers.get(other, ())), tuple(keyword_cues.get(other, ())))
+                for other in keywords
+                if keyword.startswith(other)
+            )
+
+        # Bitmasks per matched keyword (prefix expansions folded in) for the
+        # batch path, which only needs to know which triggers/cues occurred
+        self._keyword_masks: Dict[str, Tuple[int, int]] = {}
+        for keyword, expansions in self._expansions.items():
+            trigger_mask = cue_mask = 0
+            for _, keyword_triggers, keyword_cues in expansions:
+                for trigger in keyword_triggers:
+                    trigger_mask |= TRIGGER_BITS[trigger]
+                for state in keyword_cues:
+                    cue_mask |= 1 << STATE_CODES[state]
+            self._keyword_masks[keyword] = (trigger_mask, cue_mask)
+
+        # Zero-width lookahead so overlapping keywords are all reported
+        alternation = "|".join(re.escape(k) for k in keywords) or "(?!)"
+        self.pattern = re.compile(f"(?=({alternation}))")
+
+    def scan(self, utterance: str) -> TriggerScan:
+        hits: List[TriggerHit] = []
+        triggers: Dict[EmotionalTrigger, int] = {}
+        cues: Dict[CognitiveState, int] = {}
+
+        for match in self.pattern.finditer(utterance.lower()):
+            start = match.start()
+            for keyword, keyword_triggers, keyword_cues in self._expansions[match.group(1)]:
+                end = start + len(keyword)
+                for trigger in keyword_triggers:
+                    hits.append(TriggerHit(trigger, keyword, start, end))
+                    triggers[trigger] = triggers.get(trigger, 0) + 1
+                for state in keyword_cues:
+                    cues[state] = cues.get(state, 0) + 1
+
+        trigger_mask = cue_mask = 0
+        for trigger in triggers:
+            trigger_mask |= TRIGGER_BITS[trigger]
+        for state in cues:
+            cue_mask |= 1 << STATE_CODES[state]
+
+        return TriggerScan(hits=hits, triggers=triggers, state_cues=cues,
+                           trigger_mask=trigger_mask, cue_mask=cue_mask)
+
+    def scan_masks(self, utterance: str) -> Tuple[int, int]:
+        """(trigger_mask, cue_mask) for an utterance without building hits"""
+        trigger_mask = cue_mask = 0
+        keyword_masks = self._keyword_masks
+        for keyword in self.pattern.findall(utterance.lower()):
+            t, c = keyword_masks[keyword]
+            trigger_mask |= t
+            cue_mask |= c
+        return trigger_mask, cue_mask
+
+DEFAULT_TRIGGER_MATCHER = TriggerMatcher()
+
+class StreamingTriggerScanner:
+    """TriggerMatcher over an utterance that arrives as transcript deltas.
+
+    Only the last max_keyword_length - 1 characters are rescanned with each
+    delta, so a keyword split across deltas ("cho" + "ri") still matches.
+    A match is settled once no longer keyword could still start at its
+    position; feed() also reports the unsettled matches in the tail, so a
+    keyword is visible as soon as its last character arrives. close()
+    returns exactly what matcher.scan would on the whole utterance.
+    """
+
+    def __init__(self, matcher: TriggerMatcher = DEFAULT_TRIGGER_MATCHER):
+        self.matcher = matcher
+        self._parts: List[str] = []
+        self._tail = ""
+        self._tail_start = 0
+        self._hits: List[TriggerHit] = []
+        self._triggers: Dict[EmotionalTrigger, int] = {}
+        self._cues: Dict[CognitiveState, int] = {}
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def _scan_tail(self, final: bool) -> TriggerScan:
+        hits, triggers, cues = list(self._hits), dict(self._triggers), dict(self._cues)
+        settle_before = len(self._tail) if final else len(self._tail) - self.matcher.max_keyword_length + 1
+        for match in self.matcher.pattern.finditer(self._tail):
+            start = match.start()
+            settled = start < settle_before
+            for keyword, keyword_triggers, keyword_cues in self.matcher._expansions[match.group(1)]:
+                absolute = self._tail_start + start
+                for trigger in keyword_triggers:
+                    hit = TriggerHit(trigger, keyword, absolute, absolute + len(keyword))
+                    hits.append(hit)
+                    triggers[trigger] = triggers.get(trigger, 0) + 1
+                    if settled:
+                        self._hits.append(hit)
+                        self._triggers[trigger] = self._triggers.get(trigger, 0) + 1
+                for state in keyword_cues:
+                    cues[state] = cues.get(state, 0) + 1
+                    if settled:
+                        self._cues[state] = self._cues.get(state, 0) + 1
+
+        # Positions before settle_before are done with; keep the rest for the next delta
+        if settle_before > 0:
+            self._tail_start += settle_before
+            self._tail = self._tail[settle_before:]
+
+        trigger_mask = cue_mask = 0
+        for trigger in triggers:
+            trigger_mask |= TRIGGER_BITS[trigger]
+        for state in cues:
+            cue_mask |= 1 << STATE_CODES[state]
+        hits.sort(key=lambda hit: hit.start)
+        return TriggerScan(hits=hits, triggers=triggers, state_cues=cues, trigger_mask=trigger_mask, cue_mask=cue_mask)
+
+    def feed(self, delta: str) -> TriggerScan:
+        """Provisional scan of everything received so far"""
+        self._parts.append(delta)
+        self._tail += delta.lower()
+        return self._scan_tail(final=False)
+
+    def close(self) -> TriggerScan:
+        return self._scan_tail(final=True)
+
+@dataclass
+class BatchClassification:
+    """Columnar classify_batch output, one row per input utterance"""
+
+    state_codes: array
+    trigger_masks: array
+
+    def __len__(self) -> int:
+        return len(self.state_codes)
+
+    def row(self, index: int) -> Tuple[CognitiveState, List[EmotionalTrigger]]:
+        return STATES_BY_CODE[self.state_codes[index]], triggers_from_mask(self.trigger_masks[index])
+
+    def state_counts(self) -> Dict[CognitiveState, int]:
+        counts = [0] * len(STATES_BY_CODE)
+        for code in self.state_codes:
+            counts[code] += 1
+        return {state: counts[code] for code, state in enumerate(STATES_BY_CODE) if counts[code]}
+
+    def episode_count(self) -> int:
+        """Entries into EPISODE; consecutive EPISODE rows are one episode"""
+        code = STATE_CODES[CognitiveState.EPISODE]
+        episodes, in_episode = 0, False
+        for state_code in self.state_codes:
+            if state_code == code and not in_episode:
+                episodes += 1
+            in_episode = state_code == code
+        return episodes
+
+    def trigger_counts(self) -> Dict[EmotionalTrigger, int]:
+        # Count distinct masks first; backfills repeat a handful of combinations
+        mask_counts: Dict[int, int] = {}
+        for mask in self.trigger_masks:
+            if mask:
+                mask_counts[mask] = mask_counts.get(mask, 0) + 1
+        counts = {}
+        for trigger, bit in TRIGGER_BITS.items():
+            total = sum(n for mask, n in mask_counts.items() if mask & bit)
+            if total:
+                counts[trigger] = total
+        return counts
@@ -0,0 +1,333 @@
+"""Prescribed dose schedules and the per-day ledger of confirmed and missed doses"""
+
+import datetime
+import json
+import os
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# A common four-dose schedule; ledgers only exist once a schedule is prescribed
+DEFAULT_DOSE_TIMES: Tuple[datetime.time, ...] = (
+    datetime.time(8, 0), datetime.time(13, 0), datetime.time(18, 0), datetime.time(21, 0)
+)
+
+# Doses confirmed before this minute of the day count towards sundown cover
+SUNDOWN_MINUTE = 16 * 60
+
+# last_before_sundown value for a day without a dose before SUNDOWN_MINUTE
+NO_DOSE = 0xFFFF
+
+_MINUTES_PER_DAY = 24 * 60
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+class DoseLedger:
+    """Per-day dose columns for one patient.
+
+    Every dose time ever prescribed gets a slot (bit) number; per day the
+    ledger keeps a uint32 bitmask of prescribed, taken and missed slots,
+    the minutes doses were taken late and the minute of the last dose
+    before 16:00, all indexed by days since `first_day` like
+    PatientDailySeries. close_due() only walks the doses that fell due
+    since its previous call, and the totals and current missed-dose
+    streak are updated as doses resolve, so neither the family view nor
+    the doctor's analysis reads more than the days they show.
+    """
+
+    def __init__(self, schedule: Sequence[datetime.time], grace_minutes: int = 60,
+                 late_limit_minutes: int = 240, start: Optional[datetime.datetime] = None):
+        self.grace_minutes = grace_minutes
+        self.late_limit_minutes = late_limit_minutes
+        self.slot_minutes: List[int] = []
+        self.schedule_mask = self._mask_for(schedule)
+        self.first_day: Optional[datetime.date] = None
+        self.days = 0
+        self.prescribed = array("I")
+        self.taken = array("I")
+        self.missed = array("I")
+        self.late_minutes = array("I")
+        self.last_before_sundown = array("H")
+        self.taken_total = 0
+        self.missed_total = 0
+        self.missed_streak = 0
+        # Absolute minutes (date ordinal * 1440 + minute of day): doses scheduled
+        # before _due_cursor have been through close_due; _last_resolved is the
+        # latest dose either taken or missed, where the streak is counted back from
+        self._due_cursor: Optional[int] = self._absolute(start) if start else None
+        self._last_resolved = -1
+
+    def _mask_for(self, schedule: Sequence[datetime.time]) -> int:
+        mask = 0
+        for dose_time in schedule:
+            minute = dose_time.hour * 60 + dose_time.minute
+            if minute not in self.slot_minutes:
+                if len(self.slot_minutes) == 32:
+                    raise ValueError("A ledger holds at most 32 distinct dose times")
+                self.slot_minutes.append(minute)
+            mask |= 1 << self.slot_minutes.index(minute)
+        return mask
+
+    @staticmethod
+    def _absolute(timestamp: datetime.datetime) -> int:
+        return timestamp.toordinal() * _MINUTES_PER_DAY + timestamp.hour * 60 + timestamp.minute
+
+    def _slots_in_order(self, mask: int) -> List[int]:
+        return sorted((slot for slot in range(len(self.slot_minutes)) if mask >> slot & 1),
+                      key=self.slot_minutes.__getitem__)
+
+    def _scheduled_at(self, date: datetime.date, slot: int) -> datetime.datetime:
+        return datetime.datetime.combine(date, datetime.time(*divmod(self.slot_minutes[slot], 60)))
+
+    def _columns(self) -> List[array]:
+        return [self.prescribed, self.taken, self.missed, self.late_minutes, self.last_before_sundown]
+
+    def day_index(self, date: datetime.date) -> int:
+        """Column index for `date`, growing every column to cover it; new days get the current schedule"""
+        if self.first_day is None:
+            self.first_day = date
+        offset = (date - self.first_day).days
+        if offset < 0:
+            for column in self._columns():
+                column[0:0] = array(column.typecode, [self._fill(column)] * -offset)
+            self.prescribed[0:-offset] = array("I", [self.schedule_mask] * -offset)
+            self.first_day = date
+            self.days -= offset
+            offset = 0
+        if offset >= self.days:
+            grow = offset + 1 - self.days
+            for column in self._columns():
+                column.extend([self._fill(column)] * grow)
+            self.prescribed[self.days:] = array("I", [self.schedule_mask] * grow)
+            self.days = offset + 1
+        return offset
+
+    def _fill(self, column: array) -> int:
+        return NO_DOSE if column is self.last_before_sundown else 0
+
+    def prescribe(self, schedule: Sequence[datetime.time], start: datetime.date) -> None:
+        """Replace the schedule from `start` on; doses dropped from it no longer count.
+
+        Days not in the ledger yet always get the newest schedule.
+        """
+        self.schedule_mask = self._mask_for(schedule)
+        if self.first_day is None or start > self.first_day + datetime.timedelta(days=self.days - 1):
+            return
+        for index in range(self.day_index(start), self.days):
+            self.prescribed[index] = self.schedule_mask
+            dropped_taken = self.taken[index] & ~self.schedule_mask
+            dropped_missed = self.missed[index] & ~self.schedule_mask
+            self.taken[index] &= self.schedule_mask
+            self.missed[index] &= self.schedule_mask
+            self.taken_total -= _popcount(dropped_taken)
+            self.missed_total -= _popcount(dropped_missed)
+        self._recount_streak()
+
+    def confirm(self, timestamp: datetime.datetime) -> Optional[datetime.datetime]:
+        """Record a dose taken at `timestamp`; returns the scheduled time it was matched to.
+
+        The earliest dose not yet taken that is within the grace period of
+        being due, and no more than late_limit_minutes overdue, is the one
+        taken. A dose already marked missed can still be confirmed late.
+        Returns None when no scheduled dose fits.
+        """
+        now = self._absolute(timestamp)
+        if self._due_cursor is None:
+            self._due_cursor = now
+        best: Optional[Tuple[int, int]] = None
+        for date in (timestamp.date() - datetime.timedelta(days=1), timestamp.date()):
+            if self.first_day is not None and 0 <= (date - self.first_day).days < self.days:
+                index = (date - self.first_day).days
+                open_slots = self.prescribed[index] & ~self.taken[index]
+            else:
+                open_slots = self.schedule_mask
+            for slot in self._slots_in_order(open_slots):
+                scheduled = date.toordinal() * _MINUTES_PER_DAY + self.slot_minutes[slot]
+                if scheduled - self.grace_minutes <= now <= scheduled + self.late_limit_minutes:
+                    best = (scheduled, slot)
+                    break
+            if best is not None:
+                break
+        if best is None:
+            return None
+
+        scheduled, slot = best
+        date = datetime.date.fromordinal(scheduled // _MINUTES_PER_DAY)
+        index = self.day_index(date)
+        bit = 1 << slot
+        self.taken[index] |= bit
+        self.taken_total += 1
+        if self.missed[index] & bit:
+            self.missed[index] &= ~bit
+            self.missed_total -= 1
+        self.late_minutes[index] += max(0, now - scheduled)
+        if timestamp.date() == date and timestamp.hour * 60 + timestamp.minute < SUNDOWN_MINUTE:
+            minute = timestamp.hour * 60 + timestamp.minute
+            last = self.last_before_sundown[index]
+            self.last_before_sundown[index] = minute if last == NO_DOSE else max(last, minute)
+        if scheduled >= self._last_resolved:
+            self._last_resolved = scheduled
+            self.missed_streak = 0
+        else:
+            self._recount_streak()
+        return self._scheduled_at(date, slot)
+
+    def close_due(self, now: datetime.datetime) -> List[datetime.datetime]:
+        """Mark doses whose grace period ended by `now` without being taken as missed.
+
+        Only doses scheduled since the previous call are looked at. Returns
+        the scheduled times of the newly missed doses.
+        """
+        current = self._absolute(now)
+        if self._due_cursor is None:
+            self._due_cursor = current
+            return []
+        newly_missed = []
+        day = self._due_cursor // _MINUTES_PER_DAY
+        last_day = (current - self.grace_minutes) // _MINUTES_PER_DAY
+        cursor = self._due_cursor
+        while day <= last_day:
+            date = datetime.date.fromordinal(day)
+            index = self.day_index(date)
+            for slot in self._slots_in_order(self.prescribed[index]):
+                scheduled = day * _MINUTES_PER_DAY + self.slot_minutes[slot]
+                if scheduled < self._due_cursor:
+                    continue
+                if scheduled + self.grace_minutes > current:
+                    day = last_day
+                    break
+                cursor = scheduled + 1
+                bit = 1 << slot
+                if not (self.taken[index] | self.missed[index]) & bit:
+                    self.missed[index] |= bit
+                    self.missed_total += 1
+                    if scheduled > self._last_resolved:
+                        self._last_resolved = scheduled
+                        self.missed_streak += 1
+                    else:
+                        self._recount_streak()
+                    newly_missed.append(self._scheduled_at(date, slot))
+            else:
+                cursor = max(cursor, (day + 1) * _MINUTES_PER_DAY)
+            day += 1
+        self._due_cursor = max(self._due_cursor, cursor)
+        return newly_missed
+
+    def _recount_streak(self) -> None:
+        """Missed doses counted back from the latest resolved one; stops at the first dose taken"""
+        self.missed_streak = 0
+        if self._last_resolved < 0 or self.first_day is None:
+            return
+        day = self._last_resolved // _MINUTES_PER_DAY
+        first = self.first_day.toordinal()
+        while day >= first:
+            index = day - first
+            if index < self.days:
+                for slot in reversed(self._slots_in_order(self.prescribed[index])):
+                    if day * _MINUTES_PER_DAY + self.slot_minutes[slot] > self._last_resolved:
+                        continue
+                    if self.taken[index] >> slot & 1:
+                        return
+                    self.missed_streak += self.missed[index] >> slot & 1
+            day -= 1
+
+    def day_counts(self, date: Optional[datetime.date]) -> Tuple[int, int]:
+        """(doses taken, doses prescribed) on `date`"""
+        if date is None or self.first_day is None or not 0 <= (date - self.first_day).days < self.days:
+            return 0, _popcount(self.schedule_mask)
+        index = (date - self.first_day).days
+        return _popcount(self.taken[index]), _popcount(self.prescribed[index])
+
+    def compliance(self, end: Optional[datetime.date] = None, days: Optional[int] = None) -> Optional[float]:
+        """Share of resolved doses that were taken: all time, or over the `days` ending at `end`"""
+        if days is None:
+            taken, missed = self.taken_total, self.missed_total
+        else:
+            end = end or datetime.date.today()
+            taken = sum(map(_popcount, self.window(self.taken, end, days)))
+            missed = sum(map(_popcount, self.window(self.missed, end, days)))
+        return taken / (taken + missed) if taken + missed else None
+
+    def window(self, column: array, end: datetime.date, days: int) -> List[int]:
+        """`days` values ending at `end`, filled outside the recorded range"""
+        fill = self._fill(column)
+        if self.first_day is None:
+            return [fill] * days
+        stop = (end - self.first_day).days + 1
+        start = stop - days
+        values = list(column[max(start, 0):max(min(stop, self.days), 0)])
+        return [fill] * max(-start, 0) + values + [fill] * (days - max(-start, 0) - len(values))
+
+    def summary(self, date: Optional[datetime.date]) -> Dict:
+        taken, total = self.day_counts(date)
+        return {"taken": taken, "total": total, "missed_streak": self.missed_streak}
+
+    def save(self, path: str) -> None:
+        header = {
+            "first_day": self.first_day.isoformat() if self.first_day else None,
+            "days": self.days,
+            "slot_minutes": self.slot_minutes,
+            "schedule_mask": self.schedule_mask,
+            "grace_minutes": self.grace_minutes,
+            "late_limit_minutes": self.late_limit_minutes,
+            "due_cursor": self._due_cursor,
+            "last_resolved": self._last_resolved,
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for column in self._columns():
+                column.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "DoseLedger":
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            ledger = cls((), header["grace_minutes"], header["late_limit_minutes"])
+            ledger.slot_minutes = header["slot_minutes"]
+            ledger.schedule_mask = header["schedule_mask"]
+            ledger.first_day = datetime.date.fromisoformat(header["first_day"]) if header["first_day"] else None
+            ledger.days = header["days"]
+            for column in ledger._columns():
+                column.fromfile(f, ledger.days)
+        ledger._due_cursor = header["due_cursor"]
+        ledger._last_resolved = header["last_resolved"]
+        ledger.taken_total = sum(map(_popcount, ledger.taken))
+        ledger.missed_total = sum(map(_popcount, ledger.missed))
+        ledger._recount_streak()
+        return ledger
+
+class DoseLedgerStore:
+    """DoseLedgers for a whole facility, one file per patient with a prescribed schedule"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._ledgers: Dict[str, DoseLedger] = {}
+
+    def _path(self, patient_id: str) -> str:
+        return os.path.join(self.root, f"{patient_id}.doses")
+
+    def get(self, patient_id: str) -> Optional[DoseLedger]:
+        """The patient's ledger, or None if nothing was ever prescribed"""
+        ledger = self._ledgers.get(patient_id)
+        if ledger is None:
+            path = self._path(patient_id)
+            if not os.path.exists(path):
+                return None
+            ledger = self._ledgers[patient_id] = DoseLedger.load(path)
+        return ledger
+
+    def put(self, patient_id: str, ledger: DoseLedger) -> None:
+        self._ledgers[patient_id] = ledger
+
+    def save(self, patient_id: Optional[str] = None) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        for pid in [patient_id] if patient_id else list(self._ledgers):
+            if pid in self._ledgers:
+                self._ledgers[pid].save(self._path(pid))
+
+    def release(self, patient_id: str) -> None:
+        """Save one patient's ledger and stop holding it in memory"""
+        self.save(patient_id)
+        self._ledgers.pop(patient_id, None)
@@ -0,0 +1,203 @@
+"""Patient context, cognitive states, triggers and the compact interaction record"""
+
+import datetime
+import weakref
+from typing import Dict, List, Sequence, Tuple
+from dataclasses import dataclass, fields, replace
+from enum import Enum, IntFlag
+
+class CognitiveState(Enum):
+    STABLE = "stable"
+    AGITATED = "agitated"
+    CONFUSED = "confused"
+    SUNDOWNING = "sundowning"
+    EPISODE = "episode"
+    TEMPORAL_DISPLACEMENT = "temporal_displacement"
+
+class EmotionalTrigger(Enum):
+    MONEY_ANXIETY = "money_anxiety"
+    SISTER_URGENCY = "sister_urgency"
+    PANKAJ_SAFETY = "pankaj_safety"
+    HOME_LONGING = "home_longing"
+    MATERNAL_GRIEF = "maternal_grief"
+    ISOLATION_PANIC = "isolation_panic"
+    COMPETENCE_LOSS = "competence_loss"
+
+@dataclass(frozen=True)
+class PatientContext:
+    """Core identity markers for Suhasini.
+
+    Immutable, so one instance can be shared by the patient, family and
+    doctor views of a patient and caches can key on its identity.
+    intern() returns that shared instance; with_overrides() returns a
+    copy carrying per-session edits, leaving the shared one untouched.
+    """
+   
+    maiden_name: str = "Suhasini Abhyankar"
+    married_name: str = "Anjali Pendarkar"
+    age: int = 75
+   
+    primary_attachment: str = "Pankaj"
+    deceased_attachments: Tuple[str, ...] = (
+        "Mother (deeply loved)",
+        "Elder brother (father figure to Pankaj)",
+        "3 other siblings",
+        "Husband (early death)"
+    )
+    conflicted_relationship: str = "Sister"
+   
+    career_identity: str = "Hospital Clerk at Vaishampa Hospital, Solapur"
+    # Spoken as-is by the reply templates ("your days at ...", "your ...")
+    workplace: str = "Vaishampa Hospital"
+    work_days: str = "hospital days"
+    achievement_markers: Tuple[str, ...] = (
+        "College degree in 1960s-70s era",
+        "Financial independence despite no husband/children",
+        "Owns two properties in Solapur",
+        "Career at Vaishampa Hospital"
+    )
+    trauma_history: Tuple[str, ...] = (
+        "Widowed shortly after marriage",
+        "Burned legs (permanent trauma)",
+        "Childless (Pankaj became substitute)",
+        "Raised nephew after brother's death",
+        "Lost 4 of 5 siblings"
+    )
+   
+    current_location: str = "Pune"
+    displacement_from: str = "Solapur"
+    displacement_duration: str = "Unknown to patient - believes 'just arrived yesterday'"
+    properties_owned: Tuple[str, ...] = (
+        "House in Shivajinagar, Solapur",
+        "House in Main City, Solapur"
+    )
+   
+    def __post_init__(self):
+        # Lists (e.g. from a stored JSON record) are frozen into tuples; None keeps the default
+        for name in ("deceased_attachments", "achievement_markers", "trauma_history", "properties_owned"):
+            value = getattr(self, name)
+            if value is None:
+                object.__setattr__(self, name, getattr(PatientContext, name))
+            elif not isinstance(value, tuple):
+                object.__setattr__(self, name, tuple(value))
+
+    def intern(self) -> "PatientContext":
+        """The shared instance equal to this context (this one if it is the first)"""
+        return _INTERNED_CONTEXTS.setdefault(self._values(), self)
+
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, field.name) for field in fields(self))
+
+    def with_overrides(self, **changes) -> "PatientContext":
+        """Interned copy with `changes` applied; this context is left as it is"""
+        return replace(self, **changes).intern()
+
+# Live contexts keyed by their field values, so the key holds no reference to the
+# context and an entry goes away with the last session using it
+_INTERNED_CONTEXTS: "weakref.WeakValueDictionary[Tuple, PatientContext]" = weakref.WeakValueDictionary()
+
+# Compact integer coding used by the columnar batch API
+STATES_BY_CODE: Tuple[CognitiveState, ...] = tuple(CognitiveState)
+STATE_CODES: Dict[CognitiveState, int] = {state: code for code, state in enumerate(STATES_BY_CODE)}
+
+class TriggerMask(IntFlag):
+    """A set of EmotionalTriggers as bits, in EmotionalTrigger order"""
+
+    MONEY_ANXIETY = 1 << 0
+    SISTER_URGENCY = 1 << 1
+    PANKAJ_SAFETY = 1 << 2
+    HOME_LONGING = 1 << 3
+    MATERNAL_GRIEF = 1 << 4
+    ISOLATION_PANIC = 1 << 5
+    COMPETENCE_LOSS = 1 << 6
+
+    @classmethod
+    def of(cls, triggers) -> "TriggerMask":
+        mask = 0
+        for trigger in triggers:
+            mask |= TRIGGER_BITS[trigger]
+        return cls(mask)
+
+    def triggers(self) -> List[EmotionalTrigger]:
+        return triggers_from_mask(self)
+
+TRIGGER_BITS: Dict[EmotionalTrigger, int] = {trigger: TriggerMask[trigger.name].value for trigger in EmotionalTrigger}
+
+def triggers_from_mask(mask: int) -> List[EmotionalTrigger]:
+    return [trigger for trigger, bit in TRIGGER_BITS.items() if mask & bit]
+
+# Wall-clock timestamps as integer microseconds, the form records and on-disk logs keep
+_WALL_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_DAY_MICROS = 86_400_000_000
+
+def _wall_micros(timestamp: datetime.datetime) -> int:
+    return (timestamp.replace(tzinfo=None) - _WALL_EPOCH) // _MICROSECOND
+
+def _from_wall_micros(micros: int) -> datetime.datetime:
+    return _WALL_EPOCH + micros * _MICROSECOND
+
+class InteractionRecord:
+    """One logged interaction, small enough to keep months of them in memory.
+
+    State and triggers are integer-coded (STATE_CODES, TriggerMask) and the
+    timestamp is wall-clock microseconds; to_log_dict gives the
+    log_to_doctor form for API callers.
+    """
+
+    __slots__ = ("micros", "state_code", "trigger_mask", "patient_said")
+
+    def __init__(self, micros: int, state_code: int, trigger_mask: int, patient_said: str = ""):
+        self.micros = micros
+        self.state_code = state_code
+        self.trigger_mask = trigger_mask
+        self.patient_said = patient_said
+
+    @classmethod
+    def of(cls, timestamp: datetime.datetime, state: CognitiveState,
+           triggers: Sequence[EmotionalTrigger] = (), patient_said: str = "") -> "InteractionRecord":
+        return cls(_wall_micros(timestamp), STATE_CODES[state], int(TriggerMask.of(triggers)), patient_said)
+
+    @classmethod
+    def from_log_dict(cls, entry: Dict) -> "InteractionRecord":
+        return cls.of(
+            datetime.datetime.fromisoformat(entry["timestamp"]),
+            CognitiveState(entry["state"]),
+            [EmotionalTrigger(t) for t in entry.get("triggers", ())],
+            entry.get("patient_said", "")
+        )
+
+    @property
+    def timestamp(self) -> datetime.datetime:
+        return _from_wall_micros(self.micros)
+
+    @property
+    def state(self) -> CognitiveState:
+        return STATES_BY_CODE[self.state_code]
+
+    @property
+    def triggers(self) -> TriggerMask:
+        return TriggerMask(self.trigger_mask)
+
+    def to_log_dict(self) -> Dict:
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "state": STATES_BY_CODE[self.state_code].value,
+            "triggers": [trigger.value for trigger in triggers_from_mask(self.trigger_mask)]
+        }
+
+    def to_dict(self) -> Dict:
+        return dict(self.to_log_dict(), patient_said=self.patient_said)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, InteractionRecord):
+            return NotImplemented
+        return (self.micros, self.state_code, self.trigger_mask, self.patient_said) == \
+            (other.micros, other.state_code, other.trigger_mask, other.patient_said)
+
+    def __hash__(self) -> int:
+        # Records are never changed after construction, so they hash by value
+        return hash((self.micros, self.state_code, self.trigger_mask, self.patient_said))
+
+    def __repr__(self) -> str:
+        return f"InteractionRecord({self.timestamp.isoformat()}, {self.state.value}, {self.triggers!r}, {self.patient_said!r})"
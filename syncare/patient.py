@@ -0,0 +1,275 @@
+"""Patient voice interface"""
+
+import datetime
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from .model import CognitiveState, EmotionalTrigger, PatientContext, STATE_CODES, STATES_BY_CODE, triggers_from_mask
+from .matching import StreamingTriggerScanner, TriggerScan
+from .instrumentation import _report_stage, StageHook
+from .analysis import BehavioralPatternAnalyzer
+from .companion import VoiceCompanionAI
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Executor
+    from .insights import DoctorInsightsGenerator
+    from .storage import InteractionLogStore
+    from .search import TranscriptIndex
+    from .scheduling import InterventionScheduler, ScheduledEvent
+    from .family import MaterializedFamilyView
+
+class PatientVoiceInterface:
+    """Voice-only interaction for patient.
+
+    The context, analyzer and companion are built on the first turn or
+    scheduled trigger rather than in the constructor.
+    """
+   
+    def __init__(self, patient_id: str = "SUHASINI_001", log_store: Optional["InteractionLogStore"] = None,
+                 insights_engine: Optional["DoctorInsightsGenerator"] = None,
+                 patient_context: Optional[PatientContext] = None,
+                 transcript_index: Optional["TranscriptIndex"] = None,
+                 family_view: Optional["MaterializedFamilyView"] = None):
+        self.patient_id = patient_id
+        self.log_store = log_store
+        self.transcript_index = transcript_index
+        self.insights_engine = insights_engine
+        self.family_view = family_view
+        if patient_context is not None:
+            self.patient = patient_context
+        # Shared with the companion, so one hook sees every stage of a turn
+        self.stage_hooks: List[StageHook] = []
+       
+        self.scheduled_triggers = [
+            {"time": "08:00", "purpose": "morning_medication"},
+            {"time": "15:30", "purpose": "pre_sundown_intervention"},
+            {"time": "18:00", "purpose": "evening_ritual"}
+        ]
+
+    @cached_property
+    def patient(self) -> PatientContext:
+        return PatientContext().intern()
+
+    @cached_property
+    def analyzer(self) -> BehavioralPatternAnalyzer:
+        return BehavioralPatternAnalyzer(self.patient)
+
+    @cached_property
+    def companion(self) -> VoiceCompanionAI:
+        companion = VoiceCompanionAI(self.patient, self.analyzer)
+        companion.stage_hooks = self.stage_hooks
+        return companion
+       
+    def check_scheduled_trigger(self, current_time: datetime.datetime) -> Optional[Dict]:
+        current_time_str = current_time.strftime("%H:%M")
+       
+        for trigger in self.scheduled_triggers:
+            if trigger["time"] == current_time_str:
+                return self._scheduled_trigger(trigger["purpose"])
+       
+        return None
+
+    def _scheduled_trigger(self, purpose: str) -> Dict:
+        return {
+            "type": "SCHEDULED",
+            "purpose": purpose,
+            "utterance": self.analyzer.templates.render(self.patient).get(purpose)
+        }
+
+    def register_schedule(self, scheduler: "InterventionScheduler", tz: Optional[datetime.tzinfo] = None,
+                          jitter_seconds: float = 0.0, now: Optional[datetime.datetime] = None) -> None:
+        """Hand this patient's scheduled_triggers to a shared scheduler"""
+        for trigger in self.scheduled_triggers:
+            scheduler.add(self.patient_id, datetime.time.fromisoformat(trigger["time"]), trigger["purpose"],
+                          tz=tz, jitter_seconds=jitter_seconds, now=now)
+
+    def update_sundown_schedule(self, scheduler: "InterventionScheduler", now: Optional[datetime.datetime] = None,
+                                lead_minutes: int = 30) -> Optional[datetime.time]:
+        """Move pre_sundown_intervention to lead the patient's predicted onset.
+
+        Returns the new time, or None while the profile is still learning
+        (the configured default then stays in place).
+        """
+        intervention = self.companion.sundown_profile.intervention_time(lead_minutes)
+        if intervention is None:
+            return None
+        now = now or datetime.datetime.now()
+        for trigger in self.scheduled_triggers:
+            if trigger["purpose"] != "pre_sundown_intervention":
+                continue
+            current = datetime.time.fromisoformat(trigger["time"])
+            if current == intervention:
+                return intervention
+            trigger["time"] = intervention.strftime("%H:%M")
+            # If today's intervention already went out, the new time starts tomorrow;
+            # if it hasn't but the new time has passed, today's goes out now
+            start_from, first_occurrence = now, None
+            if current <= now.time():
+                start_from = max(now, datetime.datetime.combine(now.date() + datetime.timedelta(days=1),
+                                                                datetime.time(), tzinfo=now.tzinfo))
+            elif intervention <= now.time():
+                first_occurrence = now
+            existing = [schedule for schedule in scheduler.schedules_for(self.patient_id)
+                        if schedule.purpose == "pre_sundown_intervention"]
+            scheduler.add(self.patient_id, intervention, "pre_sundown_intervention",
+                          tz=existing[0].tz if existing else None,
+                          jitter_seconds=existing[0].jitter_seconds if existing else 0.0,
+                          now=start_from, max_late_seconds=existing[0].max_late_seconds if existing else 3600.0,
+                          first_occurrence=first_occurrence)
+        return intervention
+
+    def scheduled_trigger_for(self, event: "ScheduledEvent") -> Dict:
+        """The SCHEDULED utterance for an event delivered by the scheduler"""
+        return self._scheduled_trigger(event.purpose)
+   
+    def listen_mode(self, voice_input: str, current_time: datetime.datetime, scan: Optional[TriggerScan] = None) -> Dict:
+        hooks = self.stage_hooks
+        if hooks:
+            started = time.perf_counter_ns()
+
+        record, ai_utterance, _, alert = self.companion.respond(voice_input, current_time, scan)
+        if hooks:
+            mark = time.perf_counter_ns()
+       
+        if self.log_store is not None:
+            self.log_store.append_record(self.patient_id, record)
+        if self.transcript_index is not None:
+            self.transcript_index.add(self.patient_id, current_time, voice_input)
+        if self.insights_engine is not None:
+            self.insights_engine.add_record(record)
+        if self.family_view is not None:
+            self.family_view.observe(record)
+       
+        # Dicts only from here on: this is what callers of listen_mode see
+        state = STATES_BY_CODE[record.state_code]
+        result = {
+            "patient_said": voice_input,
+            "ai_speaks": ai_utterance,
+            "should_alert_family": alert is not None,
+            "log_to_doctor": {
+                "timestamp": current_time.isoformat(),
+                "state": state.value,
+                "triggers": [trigger.value for trigger in triggers_from_mask(record.trigger_mask)]
+            }
+        }
+        if hooks:
+            _report_stage(hooks, "log_emission", mark)
+            _report_stage(hooks, "listen_mode", started)
+        return result
+
+    def open_utterance(self, started_at: Optional[datetime.datetime] = None) -> "StreamingUtterance":
+        """Classify an utterance while it is still being transcribed"""
+        return StreamingUtterance(self, started_at or datetime.datetime.now())
+
+    def add_stage_hook(self, hook: StageHook) -> None:
+        """Time every pipeline stage, e.g. add_stage_hook(LatencyRegistry())"""
+        self.stage_hooks.append(hook)
+
+    async def listen_stream(self, utterance_iter: AsyncIterator[Union[str, Tuple[str, datetime.datetime],
+                                                                      Tuple[str, datetime.datetime, bool]]],
+                            responses: "asyncio.Queue", doctor_log: Optional["asyncio.Queue"] = None,
+                            executor: Optional["Executor"] = None) -> int:
+        """Run listen_mode over an async stream of utterances.
+
+        Items are either text (timestamped on arrival), (text, datetime)
+        pairs or (text, datetime, is_final) triples. Items with is_final
+        False are interim transcripts, each the whole utterance so far as
+        a browser recognizer with interimResults sends them: they are fed
+        to an open_utterance() and only its provisional results (marked
+        "provisional") go to `responses`. The next final item commits the
+        utterance; a stream that ends mid-utterance commits nothing.
+        Classification and log writes run on `executor` (the loop's
+        default when None) so the event loop never blocks on them. Each
+        listen_mode result goes to `responses` and its log_to_doctor record
+        to `doctor_log`; give both a maxsize so a slow consumer pushes back
+        on the stream instead of buffering without limit. None is put on
+        both queues when the stream is exhausted. Returns the number of utterances
+        handled.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        handled = 0
+        utterance: Optional[StreamingUtterance] = None
+        async for item in utterance_iter:
+            is_final = True
+            if isinstance(item, tuple):
+                voice_input, current_time = item[0], item[1]
+                if len(item) > 2:
+                    is_final = item[2]
+            else:
+                voice_input, current_time = item, datetime.datetime.now()
+
+            # Interim transcripts are cumulative, so only the new tail is scanned;
+            # if the recognizer revised earlier words, the utterance is rescanned
+            if utterance is not None and not voice_input.startswith(utterance.scanner.text):
+                utterance = None
+            if not is_final:
+                if utterance is None:
+                    utterance = self.open_utterance(current_time)
+                provisional = utterance.feed(voice_input[len(utterance.scanner.text):])
+                if provisional is not None:
+                    await responses.put(provisional)
+                continue
+
+            if utterance is not None:
+                utterance.feed(voice_input[len(utterance.scanner.text):])
+                result = await loop.run_in_executor(executor, utterance.close)
+                utterance = None
+            else:
+                result = await loop.run_in_executor(executor, self.listen_mode, voice_input, current_time)
+            await responses.put(result)
+            if doctor_log is not None:
+                await doctor_log.put(result["log_to_doctor"])
+            handled += 1
+
+        await responses.put(None)
+        if doctor_log is not None:
+            await doctor_log.put(None)
+        return handled
+
+class StreamingUtterance:
+    """One patient utterance fed as transcript deltas.
+
+    feed() returns a provisional result the moment a delta completes a
+    keyword that changes the provisional state or primary trigger, so the
+    reply can start before the patient stops talking; otherwise None.
+    Provisional results have no side effects. close() runs the full
+    listen_mode turn on the whole utterance, reusing the streamed scan.
+    """
+
+    def __init__(self, interface: PatientVoiceInterface, started_at: datetime.datetime):
+        self.interface = interface
+        self.started_at = started_at
+        self.scanner = StreamingTriggerScanner(interface.companion.matcher)
+        self._emitted: Tuple[int, Optional[EmotionalTrigger]] = (STATE_CODES[CognitiveState.STABLE], None)
+        self.result: Optional[Dict] = None
+
+    def feed(self, delta: str) -> Optional[Dict]:
+        if self.result is not None:
+            raise RuntimeError("Utterance already closed")
+        scan = self.scanner.feed(delta)
+        companion = self.interface.companion
+        profile = companion.sundown_profile
+        sundown = profile.is_sundown(self.started_at)
+        provisional = (companion._state_code(self.started_at.hour, scan.cue_mask, sundown, profile.trained),
+                       scan.primary_trigger())
+        if provisional == self._emitted:
+            return None
+        self._emitted = provisional
+        state_code, trigger = provisional
+        templates = companion.analyzer.templates.render(companion.context)
+        return {
+            "provisional": True,
+            "patient_said": self.scanner.text,
+            "ai_speaks": templates[trigger.value] if trigger else None,
+            "cognitive_state": STATES_BY_CODE[state_code].value,
+            "detected_triggers": [t.value for t in scan.triggers]
+        }
+
+    def close(self) -> Dict:
+        """The final listen_mode result for the complete utterance"""
+        if self.result is None:
+            self.result = self.interface.listen_mode(self.scanner.text, self.started_at, self.scanner.close())
+        return self.result
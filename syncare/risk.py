@@ -0,0 +1,292 @@
+"""Sundown risk profile and episode escalation detection"""
+
+import datetime
+import math
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+from .model import CognitiveState, EmotionalTrigger, TRIGGER_BITS
+
+# Hours a learned profile may mark as sundown; onset_window scans the same span
+SUNDOWN_HOURS = range(12, 24)
+
+# Triggers that count as distress for the sundown profile; talk of Pankaj soothes
+DISTRESS_TRIGGER_MASK = sum(bit for trigger, bit in TRIGGER_BITS.items() if trigger is not EmotionalTrigger.PANKAJ_SAFETY)
+
+class SundownRiskProfile:
+    """Per-patient 24x7 (hour x weekday) distress histogram with exponential decay.
+
+    Every utterance adds weight to its hour-of-week cell, and to the
+    cell's distress weight when it carried agitation/displacement cues or
+    a distress trigger. Decay is applied lazily by growing the weight of
+    new observations instead of shrinking old ones, so an update touches
+    one cell. A precomputed high-risk table makes lookups O(1). Until
+    enough turns have been seen, the fixed 16:00-19:59 window applies.
+    Only afternoon/evening cells (SUNDOWN_HOURS) can become high risk;
+    morning distress is counted but never labelled sundowning.
+    """
+
+    def __init__(self, half_life_days: float = 28.0, risk_threshold: float = 0.5,
+                 min_cell_weight: float = 2.0, min_observations: int = 50):
+        self.decay_rate = math.log(2) / (half_life_days * 86400)
+        self.risk_threshold = risk_threshold
+        self.min_cell_weight = min_cell_weight
+        self.min_observations = min_observations
+        self.observations = 0
+        self.total = [0.0] * 168
+        self.distress = [0.0] * 168
+        self.high_risk = bytearray(16 <= cell % 24 <= 19 for cell in range(168))
+        self._origin: Optional[float] = None
+
+    @staticmethod
+    def cell(timestamp: datetime.datetime) -> int:
+        return timestamp.weekday() * 24 + timestamp.hour
+
+    def _weight(self, now: float) -> float:
+        if self._origin is None:
+            self._origin = now
+        weight = math.exp(self.decay_rate * (now - self._origin))
+        if weight > 1e100:  # Rebase before the growth factor overflows
+            self.total = [w / weight for w in self.total]
+            self.distress = [w / weight for w in self.distress]
+            self._origin, weight = now, 1.0
+        return weight
+
+    def observe(self, timestamp: datetime.datetime, distressed: bool) -> None:
+        weight = self._weight(timestamp.timestamp())
+        cell = self.cell(timestamp)
+        self.total[cell] += weight
+        if distressed:
+            self.distress[cell] += weight
+        self.observations += 1
+        hour = timestamp.hour
+        if hour not in SUNDOWN_HOURS:
+            return
+
+        # Decay scales both sums alike, so ratios only change here. A cell
+        # with too little weight of its own borrows the hour's pooled ratio
+        # across all weekdays, then the fixed window.
+        cells = range(hour, 168, 24)
+        pooled_total = sum(self.total[c] for c in cells)
+        pooled_distress = sum(self.distress[c] for c in cells)
+        if pooled_total >= self.min_cell_weight * weight:
+            pooled = pooled_distress >= self.risk_threshold * pooled_total
+        else:
+            pooled = 16 <= hour <= 19
+        for c in cells:
+            if self.total[c] >= self.min_cell_weight * weight:
+                self.high_risk[c] = self.distress[c] >= self.risk_threshold * self.total[c]
+            else:
+                self.high_risk[c] = pooled
+
+    @property
+    def trained(self) -> bool:
+        return self.observations >= self.min_observations
+
+    def is_sundown(self, timestamp: datetime.datetime) -> bool:
+        if not self.trained:
+            return 16 <= timestamp.hour <= 19
+        return bool(self.high_risk[self.cell(timestamp)])
+
+    def onset_window(self, weekday: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """(first, last) hour of the longest afternoon/evening high-risk run"""
+        if not self.trained:
+            return None
+        if weekday is not None:
+            hourly = [bool(self.high_risk[weekday * 24 + hour]) for hour in range(24)]
+        else:
+            # Across the whole week: an hour is high risk if its pooled ratio is
+            hourly = []
+            for hour in range(24):
+                total = sum(self.total[day * 24 + hour] for day in range(7))
+                distress = sum(self.distress[day * 24 + hour] for day in range(7))
+                hourly.append(total > 0 and distress >= self.risk_threshold * total)
+        best, start = None, None
+        for hour in range(12, 25):
+            if hour < 24 and hourly[hour]:
+                start = hour if start is None else start
+            elif start is not None:
+                if best is None or hour - start > best[1] + 1 - best[0]:
+                    best = (start, hour - 1)
+                start = None
+        return best
+
+    def intervention_time(self, lead_minutes: int = 30, weekday: Optional[int] = None) -> Optional[datetime.time]:
+        window = self.onset_window(weekday)
+        if window is None:
+            return None
+        minutes = max(window[0] * 60 - lead_minutes, 0)
+        return datetime.time(minutes // 60, minutes % 60)
+
+    def to_dict(self) -> Dict:
+        return {
+            "decay_rate": self.decay_rate,
+            "risk_threshold": self.risk_threshold,
+            "min_cell_weight": self.min_cell_weight,
+            "min_observations": self.min_observations,
+            "observations": self.observations,
+            "total": self.total,
+            "distress": self.distress,
+            "high_risk": list(self.high_risk),
+            "origin": self._origin,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SundownRiskProfile":
+        profile = cls(risk_threshold=data["risk_threshold"], min_cell_weight=data["min_cell_weight"],
+                      min_observations=data["min_observations"])
+        profile.decay_rate = data["decay_rate"]
+        profile.observations = data["observations"]
+        profile.total = list(data["total"])
+        profile.distress = list(data["distress"])
+        profile.high_risk = bytearray(data["high_risk"])
+        profile._origin = data["origin"]
+        return profile
+
+@dataclass
+class EscalationAlert:
+    """Raised once when a patient's distress escalates into an episode"""
+
+    detected_at: datetime.datetime
+    episode_started: datetime.datetime
+    reason: str
+    distress_streak: int
+    trigger_density: int
+    latency_ns: int  # From the turn reaching the companion to this alert
+
+class EscalationDetector:
+    """Per-patient episode state machine over the classified turn stream.
+
+    A turn is distressed when it carries agitation/displacement cues or a
+    distress trigger. The patient is escalated to EPISODE after
+    `streak_threshold` distressed turns in a row (no more than
+    `max_gap_seconds` apart) or `density_threshold` distress hits within
+    `window_seconds`; both thresholds drop by one inside the patient's
+    sundown window. The episode ends after `calm_turns` calm turns or
+    `quiet_seconds` without distress. Entering an episode emits one alert,
+    unless one was emitted less than `min_alert_interval_seconds` ago.
+    Detection runs inline in the turn, so an alert is never more than one
+    utterance behind its cause.
+    """
+
+    def __init__(self, streak_threshold: int = 3, density_threshold: int = 5, window_seconds: float = 600,
+                 max_gap_seconds: float = 600, calm_turns: int = 2, quiet_seconds: float = 1800,
+                 min_alert_interval_seconds: float = 1800):
+        self.streak_threshold = streak_threshold
+        self.density_threshold = density_threshold
+        self.window_seconds = window_seconds
+        self.max_gap_seconds = max_gap_seconds
+        self.calm_turns = calm_turns
+        self.quiet_seconds = quiet_seconds
+        self.min_alert_interval_seconds = min_alert_interval_seconds
+        self.in_episode = False
+        self.streak = 0
+        self.calm_streak = 0
+        self.streak_started: Optional[datetime.datetime] = None
+        self.last_distress: Optional[datetime.datetime] = None
+        self.last_alert: Optional[datetime.datetime] = None
+        self._hits: "deque[Tuple[datetime.datetime, int]]" = deque()
+        self._density = 0
+        self.subscribers: List[Callable[[EscalationAlert], None]] = []
+
+    def update(self, timestamp: datetime.datetime, state: CognitiveState, trigger_mask: int, cue_mask: int,
+               sundown: bool, received_ns: Optional[int] = None) -> Tuple[CognitiveState, Optional[EscalationAlert]]:
+        """Fold in one turn; returns its (possibly escalated) state and any alert it raised"""
+        hits = bin(trigger_mask & DISTRESS_TRIGGER_MASK).count("1") + (1 if cue_mask else 0)
+        quiet_for = (timestamp - self.last_distress).total_seconds() if self.last_distress else None
+
+        # Trigger density over the trailing window
+        horizon = timestamp - datetime.timedelta(seconds=self.window_seconds)
+        while self._hits and self._hits[0][0] <= horizon:
+            self._density -= self._hits.popleft()[1]
+        if hits:
+            self._hits.append((timestamp, hits))
+            self._density += hits
+
+        if not hits:
+            self.calm_streak += 1
+            if self.in_episode and (self.calm_streak >= self.calm_turns or (quiet_for or 0) > self.quiet_seconds):
+                self._end_episode()
+            return (CognitiveState.EPISODE if self.in_episode else state), None
+
+        if quiet_for is None or quiet_for > self.max_gap_seconds or self.calm_streak:
+            self.streak, self.streak_started = 0, timestamp
+        self.streak += 1
+        self.calm_streak = 0
+        self.last_distress = timestamp
+        if self.in_episode:
+            if quiet_for is None or quiet_for <= self.quiet_seconds:
+                return CognitiveState.EPISODE, None
+            self._end_episode()
+            self._hits.append((timestamp, hits))
+            self._density = hits
+            self.streak, self.streak_started = 1, timestamp
+
+        relief = 1 if sundown else 0
+        if self.streak >= self.streak_threshold - relief:
+            reason = f"{self.streak} distressed turns in a row"
+        elif self._density >= self.density_threshold - relief:
+            reason = f"{self._density} distress signals in {self.window_seconds / 60:g} minutes"
+        else:
+            return state, None
+
+        self.in_episode = True
+        if sundown:
+            reason += " during sundown hours"
+        if self.last_alert is not None and \
+                (timestamp - self.last_alert).total_seconds() < self.min_alert_interval_seconds:
+            return CognitiveState.EPISODE, None  # Family was told moments ago
+        self.last_alert = timestamp
+        alert = EscalationAlert(
+            detected_at=timestamp,
+            episode_started=self.streak_started or timestamp,
+            reason=reason,
+            distress_streak=self.streak,
+            trigger_density=self._density,
+            latency_ns=time.perf_counter_ns() - received_ns if received_ns is not None else 0
+        )
+        for subscriber in list(self.subscribers):
+            subscriber(alert)
+        return CognitiveState.EPISODE, alert
+
+    def _end_episode(self) -> None:
+        # A new episode has to build from fresh evidence, not this one's tail
+        self.in_episode = False
+        self.streak = 0
+        self._hits.clear()
+        self._density = 0
+
+    def subscribe(self, callback: Callable[[EscalationAlert], None]) -> None:
+        """Call `callback(alert)` the moment an alert is raised, before the turn returns"""
+        self.subscribers.append(callback)
+
+    def to_dict(self) -> Dict:
+        """Episode state; thresholds and subscribers belong to the instance"""
+        return {
+            "in_episode": self.in_episode,
+            "streak": self.streak,
+            "calm_streak": self.calm_streak,
+            "streak_started": _isoformat(self.streak_started),
+            "last_distress": _isoformat(self.last_distress),
+            "last_alert": _isoformat(self.last_alert),
+            "hits": [[timestamp.isoformat(), hits] for timestamp, hits in self._hits],
+        }
+
+    def restore(self, data: Dict) -> None:
+        """Resume from a to_dict() snapshot"""
+        self.in_episode = data["in_episode"]
+        self.streak = data["streak"]
+        self.calm_streak = data["calm_streak"]
+        self.streak_started = _fromisoformat(data["streak_started"])
+        self.last_distress = _fromisoformat(data["last_distress"])
+        self.last_alert = _fromisoformat(data["last_alert"])
+        self._hits = deque((datetime.datetime.fromisoformat(timestamp), hits) for timestamp, hits in data["hits"])
+        self._density = sum(hits for _, hits in self._hits)
+
+def _isoformat(timestamp: Optional[datetime.datetime]) -> Optional[str]:
+    return timestamp.isoformat() if timestamp is not None else None
+
+def _fromisoformat(value: Optional[str]) -> Optional[datetime.datetime]:
+    return datetime.datetime.fromisoformat(value) if value is not None else None
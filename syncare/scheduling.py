@@ -0,0 +1,131 @@
+"""Timed interventions for patient sessions"""
+
+import datetime
+import heapq
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+@dataclass
+class InterventionSchedule:
+    """A daily proactive utterance for one patient"""
+
+    patient_id: str
+    purpose: str
+    time_of_day: datetime.time
+    tz: Optional[datetime.tzinfo] = None
+    jitter_seconds: float = 0.0
+    max_late_seconds: Optional[float] = 3600.0  # Later than this the occurrence is skipped; None never expires
+    active: bool = True
+
+@dataclass
+class ScheduledEvent:
+    """A schedule occurrence that has come due"""
+
+    patient_id: str
+    purpose: str
+    scheduled_for: datetime.datetime
+    fired_at: datetime.datetime
+    late_by_seconds: float
+
+class InterventionScheduler:
+    """Heap of next-fire times across every patient's daily schedules.
+
+    pop_due hands back each occurrence at most once, so a delayed poll
+    still delivers the 15:30 intervention rather than skipping it, unless
+    it is more than the schedule's max_late_seconds overdue: a morning
+    reminder is not spoken in the afternoon. Times without a tz follow the
+    host's local clock.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self._heap: List[Tuple[float, int, InterventionSchedule, float]] = []
+        self._schedules: Dict[Tuple[str, str], InterventionSchedule] = {}
+        self._sequence = 0
+        self._random = random.Random(seed)
+
+    def add(self, patient_id: str, time_of_day: datetime.time, purpose: str,
+            tz: Optional[datetime.tzinfo] = None, jitter_seconds: float = 0.0,
+            now: Optional[datetime.datetime] = None,
+            max_late_seconds: Optional[float] = 3600.0,
+            first_occurrence: Optional[datetime.datetime] = None) -> InterventionSchedule:
+        """Schedule (or replace) the patient's daily `purpose` at `time_of_day`.
+
+        `first_occurrence` overrides when the first run is due, e.g. to
+        deliver once now a run that a schedule change moved into the past.
+        """
+        self.remove(patient_id, purpose)
+        schedule = InterventionSchedule(patient_id, purpose, time_of_day, tz, jitter_seconds, max_late_seconds)
+        self._schedules[(patient_id, purpose)] = schedule
+        if first_occurrence is not None:
+            self._push(schedule, first_occurrence.timestamp())
+        else:
+            after = (now or datetime.datetime.now()).timestamp()
+            self._push(schedule, self._next_occurrence(schedule, after - 1e-6))
+        return schedule
+
+    def remove(self, patient_id: str, purpose: str) -> None:
+        # Lazy deletion: the heap entry is dropped when it surfaces
+        schedule = self._schedules.pop((patient_id, purpose), None)
+        if schedule is not None:
+            schedule.active = False
+
+    def remove_patient(self, patient_id: str) -> None:
+        for key in [key for key in self._schedules if key[0] == patient_id]:
+            self.remove(*key)
+
+    def schedules_for(self, patient_id: str) -> List[InterventionSchedule]:
+        return [schedule for key, schedule in self._schedules.items() if key[0] == patient_id]
+
+    def _next_occurrence(self, schedule: InterventionSchedule, after: float) -> float:
+        """Epoch seconds of the first occurrence strictly after `after`"""
+        day = datetime.datetime.fromtimestamp(after, schedule.tz).date()
+        while True:
+            occurrence = datetime.datetime.combine(day, schedule.time_of_day, tzinfo=schedule.tz).timestamp()
+            if occurrence > after:
+                return occurrence
+            day += datetime.timedelta(days=1)
+
+    def _push(self, schedule: InterventionSchedule, occurrence: float) -> None:
+        fire_at = occurrence + (self._random.uniform(0, schedule.jitter_seconds) if schedule.jitter_seconds else 0)
+        self._sequence += 1
+        heapq.heappush(self._heap, (fire_at, self._sequence, schedule, occurrence))
+
+    def next_fire_time(self) -> Optional[float]:
+        """Epoch seconds of the earliest pending occurrence"""
+        while self._heap and not self._heap[0][2].active:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[datetime.datetime] = None) -> List[ScheduledEvent]:
+        now = now or datetime.datetime.now()
+        now_ts = now.timestamp()
+        events = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            fire_at, _, schedule, occurrence = heapq.heappop(self._heap)
+            if not schedule.active:
+                continue
+            late_by = max(0.0, now_ts - fire_at)
+            if schedule.max_late_seconds is None or late_by <= schedule.max_late_seconds:
+                events.append(ScheduledEvent(
+                    patient_id=schedule.patient_id,
+                    purpose=schedule.purpose,
+                    scheduled_for=datetime.datetime.fromtimestamp(occurrence, schedule.tz),
+                    fired_at=now,
+                    late_by_seconds=late_by
+                ))
+            # At most one delivery per missed stretch: resume from the next future occurrence
+            self._push(schedule, self._next_occurrence(schedule, max(occurrence, now_ts)))
+        return events
+
+    async def run(self, deliver: Callable[[ScheduledEvent], Any], max_sleep: float = 30.0) -> None:
+        """Deliver events as they fall due; sleeps until the next fire time"""
+        import asyncio  # Already loaded by whoever runs the loop; keeps cron imports light
+        while True:
+            for event in self.pop_due():
+                result = deliver(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            next_fire = self.next_fire_time()
+            delay = max_sleep if next_fire is None else next_fire - datetime.datetime.now().timestamp()
+            await asyncio.sleep(min(max(delay, 0.0), max_sleep))
@@ -0,0 +1,224 @@
+"""Per-patient positional index over transcribed utterances"""
+
+import datetime
+import os
+import re
+import struct
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .model import _DAY_MICROS, _from_wall_micros, _wall_micros
+
+_TRANSCRIPT_TOKEN = re.compile(r"[\w\u0900-\u097F']+")
+
+def tokenize_transcript(text: str) -> List[str]:
+    """Lower-cased words of mixed English/Marathi/Hindi text, Devanagari vowel signs kept"""
+    return [token for token in (raw.strip("'") for raw in _TRANSCRIPT_TOKEN.findall(text.lower())) if token]
+
+class _PatientTranscripts:
+    """One patient's utterance index: doc table, text heap, term list, postings log"""
+
+    DOC = struct.Struct("<qII")       # wall-clock micros, text offset, text length
+    POSTING = struct.Struct("<IIH")   # term id, doc id, token position
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.docs = open(os.path.join(directory, "docs.bin"), "ab+")
+        self.text = open(os.path.join(directory, "text.utt"), "ab+")
+        self.terms = open(os.path.join(directory, "terms.txt"), "ab+")
+        self.postings = open(os.path.join(directory, "postings.bin"), "ab+")
+
+        self.docs.seek(0)
+        raw_docs = self.docs.read()
+        if len(raw_docs) % self.DOC.size:
+            raw_docs = raw_docs[:len(raw_docs) - len(raw_docs) % self.DOC.size]
+            self.docs.truncate(len(raw_docs))
+        self.doc_micros = array("q")
+        self.doc_spans: List[Tuple[int, int]] = []
+        for micros, offset, length in self.DOC.iter_unpack(raw_docs):
+            self.doc_micros.append(micros)
+            self.doc_spans.append((offset, length))
+        self.text_size = os.fstat(self.text.fileno()).st_size
+
+        # A torn last term line has no newline yet; drop it
+        self.terms.seek(0)
+        raw_terms = self.terms.read()
+        complete = raw_terms[:raw_terms.rfind(b"\n") + 1]
+        if len(complete) != len(raw_terms):
+            self.terms.truncate(len(complete))
+        self.term_ids: Dict[str, int] = {}
+        for term in complete.decode("utf-8").splitlines():
+            self.term_ids[term] = len(self.term_ids)
+
+        # term id -> (doc ids, positions), both in append order
+        self.term_postings: Dict[int, Tuple[array, array]] = {}
+        self.postings.seek(0)
+        raw_postings = self.postings.read()
+        valid = 0
+        for term_id, doc_id, position in self.POSTING.iter_unpack(raw_postings[:len(raw_postings) - len(raw_postings) % self.POSTING.size]):
+            if term_id >= len(self.term_ids) or doc_id >= len(self.doc_micros):
+                break
+            self._post(term_id, doc_id, position)
+            valid += self.POSTING.size
+        if valid != len(raw_postings):
+            self.postings.truncate(valid)
+
+    def _post(self, term_id: int, doc_id: int, position: int) -> None:
+        entry = self.term_postings.get(term_id)
+        if entry is None:
+            entry = self.term_postings[term_id] = (array("I"), array("H"))
+        entry[0].append(doc_id)
+        entry[1].append(position)
+
+    def add(self, micros: int, utterance: str) -> None:
+        encoded = utterance.encode("utf-8")
+        doc_id = len(self.doc_micros)
+        # Doc before postings: a crash in between leaves an unsearchable doc, never a dangling posting
+        self.text.write(encoded)
+        self.docs.write(self.DOC.pack(micros, self.text_size, len(encoded)))
+        self.doc_micros.append(micros)
+        self.doc_spans.append((self.text_size, len(encoded)))
+        self.text_size += len(encoded)
+
+        new_terms = []
+        postings = bytearray()
+        for position, token in enumerate(tokenize_transcript(utterance)[:0xFFFF]):
+            term_id = self.term_ids.get(token)
+            if term_id is None:
+                term_id = self.term_ids[token] = len(self.term_ids)
+                new_terms.append(token)
+            self._post(term_id, doc_id, position)
+            postings += self.POSTING.pack(term_id, doc_id, position)
+        if new_terms:
+            self.terms.write("".join(term + "\n" for term in new_terms).encode("utf-8"))
+        self.postings.write(postings)
+
+    def matching_docs(self, terms: Sequence[str], phrases: Sequence[Sequence[str]]) -> Optional[set]:
+        """Doc ids containing every term and every phrase; None for an empty query"""
+        result: Optional[set] = None
+        for term in terms:
+            entry = self.term_postings.get(self.term_ids.get(term, -1))
+            docs = set(entry[0]) if entry else set()
+            result = docs if result is None else result & docs
+        for phrase in phrases:
+            # Phrase starts: (doc, position of word 0) present for every word at its offset
+            starts: Optional[set] = None
+            for offset, word in enumerate(phrase):
+                entry = self.term_postings.get(self.term_ids.get(word, -1))
+                shifted = {(doc, position - offset) for doc, position in zip(*entry)} if entry else set()
+                starts = shifted if starts is None else starts & shifted
+                if not starts:
+                    break
+            docs = {doc for doc, _ in starts} if starts else set()
+            result = docs if result is None else result & docs
+        return result
+
+    def utterance(self, doc_id: int) -> str:
+        offset, length = self.doc_spans[doc_id]
+        self.text.flush()
+        self.text.seek(offset)
+        return self.text.read(length).decode("utf-8")
+
+    def flush(self) -> None:
+        for handle in (self.text, self.docs, self.terms, self.postings):
+            handle.flush()
+
+    def close(self) -> None:
+        for handle in (self.text, self.docs, self.terms, self.postings):
+            handle.close()
+
+class TranscriptIndex:
+    """On-disk inverted index over everything each patient has said.
+
+    Postings are positional, so quoted phrases ("ghar jaana") match only
+    as consecutive words. Each patient's files are append-only and are
+    read back into memory the first time that patient is searched or
+    indexed. Timestamps are wall-clock, like InteractionLogStore.
+    """
+
+    _QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+    def __init__(self, root: str, max_open_patients: int = 64):
+        self.root = root
+        self.max_open_patients = max_open_patients
+        self._patients: "OrderedDict[str, _PatientTranscripts]" = OrderedDict()
+
+    def _patient(self, patient_id: str, create: bool) -> Optional[_PatientTranscripts]:
+        transcripts = self._patients.get(patient_id)
+        if transcripts is not None:
+            self._patients.move_to_end(patient_id)
+            return transcripts
+        directory = os.path.join(self.root, patient_id)
+        if not create and not os.path.isdir(directory):
+            return None
+        transcripts = self._patients[patient_id] = _PatientTranscripts(directory)
+        while len(self._patients) > self.max_open_patients:
+            self._patients.popitem(last=False)[1].close()
+        return transcripts
+
+    def add(self, patient_id: str, timestamp: datetime.datetime, utterance: str) -> None:
+        self._patient(patient_id, create=True).add(_wall_micros(timestamp), utterance)
+
+    def search(self, patient_id: str, query: str, since: Optional[datetime.datetime] = None,
+               until: Optional[datetime.datetime] = None, after: Optional[datetime.time] = None,
+               before: Optional[datetime.time] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Utterances matching every word and "quoted phrase" of `query`, oldest first.
+
+        since/until bound the timestamp (until exclusive); after/before
+        bound the time of day, e.g. after=datetime.time(15) for "after 15:00".
+        """
+        transcripts = self._patient(patient_id, create=False)
+        if transcripts is None:
+            return []
+        terms, phrases = [], []
+        for phrase, word in self._QUERY.findall(query):
+            tokens = tokenize_transcript(phrase or word)
+            if len(tokens) > 1 and phrase:
+                phrases.append(tokens)
+            else:
+                terms.extend(tokens)
+        docs = transcripts.matching_docs(terms, phrases)
+        if not docs:
+            return []
+
+        low = _wall_micros(since) if since else None
+        high = _wall_micros(until) if until else None
+        day_from = self._time_micros(after) if after else None
+        day_to = self._time_micros(before) if before else None
+        micros_of = transcripts.doc_micros
+        hits = []
+        for doc_id in docs:
+            micros = micros_of[doc_id]
+            if (low is not None and micros < low) or (high is not None and micros >= high):
+                continue
+            of_day = micros % _DAY_MICROS
+            if (day_from is not None and of_day < day_from) or (day_to is not None and of_day >= day_to):
+                continue
+            hits.append((micros, doc_id))
+        hits.sort()
+        return [
+            {
+                "timestamp": _from_wall_micros(micros).isoformat(),
+                "patient_said": transcripts.utterance(doc_id)
+            }
+            for micros, doc_id in hits[:limit]
+        ]
+
+    @staticmethod
+    def _time_micros(moment: datetime.time) -> int:
+        return ((moment.hour * 60 + moment.minute) * 60 + moment.second) * 1_000_000 + moment.microsecond
+
+    def flush(self) -> None:
+        for transcripts in self._patients.values():
+            transcripts.flush()
+
+    def close(self) -> None:
+        while self._patients:
+            self._patients.popitem()[1].close()
+
+    def __enter__(self) -> "TranscriptIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,256 @@
+"""Daily summaries and per-patient daily time series"""
+
+import datetime
+import heapq
+import json
+import os
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .model import CognitiveState, EmotionalTrigger, InteractionRecord, STATES_BY_CODE, triggers_from_mask
+
+class DailySummaryAggregator:
+    """Running counters behind one day's summary, updated per interaction"""
+
+    def __init__(self):
+        self.total = 0
+        self.state_counts: Dict[str, int] = {}
+        self.trigger_counts: Dict[str, int] = {}
+        self.episodes = 0  # Entries into EPISODE, as the family view counts them
+        self._in_episode = False
+        self._snapshot: Optional[Dict] = None
+
+    @classmethod
+    def from_log(cls, interaction_log: Sequence[Union[Dict, InteractionRecord]]) -> "DailySummaryAggregator":
+        aggregate = cls()
+        for interaction in interaction_log:
+            if isinstance(interaction, InteractionRecord):
+                aggregate.add_record(interaction)
+            else:
+                aggregate.add(interaction.get("state", "stable"), interaction.get("triggers", ()))
+        return aggregate
+
+    def add(self, state: str, triggers: Sequence[str]) -> None:
+        self.total += 1
+        self.state_counts[state] = self.state_counts.get(state, 0) + 1
+        if state == "episode" and not self._in_episode:
+            self.episodes += 1
+        self._in_episode = state == "episode"
+        for trigger in triggers:
+            self.trigger_counts[trigger] = self.trigger_counts.get(trigger, 0) + 1
+        self._snapshot = None
+
+    def add_record(self, record: InteractionRecord) -> None:
+        self.add(STATES_BY_CODE[record.state_code].value,
+                 [trigger.value for trigger in triggers_from_mask(record.trigger_mask)])
+
+    def add_counts(self, total: int, state_counts: Dict[str, int], trigger_counts: Dict[str, int],
+                   episodes: int = 0) -> None:
+        self.total += total
+        self.episodes += episodes
+        for state, n in state_counts.items():
+            self.state_counts[state] = self.state_counts.get(state, 0) + n
+        for trigger, n in trigger_counts.items():
+            self.trigger_counts[trigger] = self.trigger_counts.get(trigger, 0) + n
+        self._snapshot = None
+
+    def to_dict(self) -> Dict:
+        return {"total": self.total, "state_counts": dict(self.state_counts),
+                "trigger_counts": dict(self.trigger_counts), "episodes": self.episodes,
+                "in_episode": self._in_episode}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DailySummaryAggregator":
+        aggregate = cls()
+        aggregate.add_counts(data["total"], data["state_counts"], data["trigger_counts"], data["episodes"])
+        aggregate._in_episode = data["in_episode"]
+        return aggregate
+
+    def sundowning_severity(self) -> str:
+        sundowning = self.state_counts.get("sundowning", 0)
+        return "SEVERE" if sundowning > 2 else "MODERATE" if sundowning > 0 else "NONE"
+
+    def dominant_concerns(self, n: int = 3) -> List[Tuple[str, int]]:
+        # Bounded by the number of distinct triggers, not by the day's log size
+        return heapq.nlargest(n, self.trigger_counts.items(), key=lambda x: x[1])
+
+    def snapshot(self, date: datetime.date) -> Dict:
+        if self._snapshot is None or self._snapshot["date"] != date.isoformat():
+            self._snapshot = {
+                "date": date.isoformat(),
+                "overall_state": "STABLE" if self.state_counts.get("stable", 0) > self.total/2 else "ELEVATED_DISTRESS",
+                "dominant_concerns": self.dominant_concerns(),
+                "episode_count": self.episodes,
+                "sundowning_severity": self.sundowning_severity(),
+                "narrative_summary": f"Patient experienced {self.total} interactions with varying cognitive states.",
+                "actionable_insights": ["Monitor sundown episodes", "Track trigger patterns"]
+            }
+        return self._snapshot
+
+# Parts of the day that state time is also split into
+TIME_BANDS: Tuple[str, ...] = ("night", "morning", "afternoon", "evening")
+
+def _time_band(hour: int) -> str:
+    if 6 <= hour < 12:
+        return "morning"
+    if 12 <= hour < 16:
+        return "afternoon"
+    if 16 <= hour < 20:
+        return "evening"
+    return "night"
+
+class PatientDailySeries:
+    """Columnar per-day history for one patient.
+
+    One uint32 column per EmotionalTrigger (mentions per day), one per
+    CognitiveState (seconds spent in the state per day) and one per
+    (CognitiveState, time band), all indexed by days since `first_day`.
+    Pattern analysis slices these columns instead of walking interaction
+    dicts.
+    """
+
+    # Longest gap between interactions still credited to the earlier state
+    MAX_DWELL_SECONDS = 30 * 60
+
+    def __init__(self, first_day: Optional[datetime.date] = None):
+        self.first_day = first_day
+        self.days = 0
+        self.trigger_columns: Dict[EmotionalTrigger, array] = {trigger: array("I") for trigger in EmotionalTrigger}
+        self.state_columns: Dict[CognitiveState, array] = {state: array("I") for state in CognitiveState}
+        self.band_columns: Dict[Tuple[CognitiveState, str], array] = {
+            (state, band): array("I") for state in CognitiveState for band in TIME_BANDS
+        }
+        self._last_interaction: Optional[Tuple[datetime.datetime, CognitiveState]] = None
+
+    def _columns(self) -> List[array]:
+        return list(self.trigger_columns.values()) + list(self.state_columns.values()) + list(self.band_columns.values())
+
+    def day_index(self, date: datetime.date) -> int:
+        """Column index for `date`, growing every column to cover it"""
+        if self.first_day is None:
+            self.first_day = date
+        offset = (date - self.first_day).days
+        if offset < 0:
+            padding = array("I", bytes(4 * -offset))
+            for column in self._columns():
+                column[0:0] = padding
+            self.first_day = date
+            self.days -= offset
+            offset = 0
+        if offset >= self.days:
+            padding = array("I", bytes(4 * (offset + 1 - self.days)))
+            for column in self._columns():
+                column.extend(padding)
+            self.days = offset + 1
+        return offset
+
+    def add_trigger_counts(self, date: datetime.date, counts: Dict[EmotionalTrigger, int]) -> None:
+        index = self.day_index(date)
+        for trigger, n in counts.items():
+            self.trigger_columns[trigger][index] += n
+
+    def add_state_seconds(self, date: datetime.date, state: CognitiveState, seconds: int,
+                          band: Optional[str] = None) -> None:
+        index = self.day_index(date)
+        self.state_columns[state][index] += seconds
+        if band is not None:
+            self.band_columns[(state, band)][index] += seconds
+
+    def record_interaction(self, timestamp: datetime.datetime, state: CognitiveState,
+                           triggers: Sequence[EmotionalTrigger]) -> None:
+        """Count the triggers and credit the time since the last interaction to its state"""
+        index = self.day_index(timestamp.date())
+        for trigger in triggers:
+            self.trigger_columns[trigger][index] += 1
+        if self._last_interaction is not None:
+            last_time, last_state = self._last_interaction
+            gap = (timestamp - last_time).total_seconds()
+            if gap > 0:
+                self.add_state_seconds(last_time.date(), last_state, int(min(gap, self.MAX_DWELL_SECONDS)),
+                                       _time_band(last_time.hour))
+        if self._last_interaction is None or timestamp >= self._last_interaction[0]:
+            self._last_interaction = (timestamp, state)
+
+    def last_day(self) -> Optional[datetime.date]:
+        return self.first_day + datetime.timedelta(days=self.days - 1) if self.days else None
+
+    def window(self, column: array, end: datetime.date, days: int) -> List[int]:
+        """`days` values ending at `end`, zero-filled outside the recorded range"""
+        if self.first_day is None:
+            return [0] * days
+        stop = (end - self.first_day).days + 1
+        start = stop - days
+        values = list(column[max(start, 0):max(min(stop, self.days), 0)])
+        return [0] * max(-start, 0) + values + [0] * (days - max(-start, 0) - len(values))
+
+    def recorded_days(self, end: datetime.date, days: int) -> List[bool]:
+        """For each day of window(column, end, days), whether any trigger or state time was recorded"""
+        columns = list(self.trigger_columns.values()) + list(self.state_columns.values())
+        return [any(day) for day in zip(*(self.window(column, end, days) for column in columns))]
+
+    def save(self, path: str) -> None:
+        header = {
+            "first_day": self.first_day.isoformat() if self.first_day else None,
+            "days": self.days,
+            "triggers": [trigger.value for trigger in self.trigger_columns],
+            "states": [state.value for state in self.state_columns],
+            "bands": [f"{state.value}:{band}" for state, band in self.band_columns],
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for column in self._columns():
+                column.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PatientDailySeries":
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            series = cls(datetime.date.fromisoformat(header["first_day"]) if header["first_day"] else None)
+            series.days = header["days"]
+            for name in header["triggers"]:
+                series.trigger_columns[EmotionalTrigger(name)].fromfile(f, series.days)
+            for name in header["states"]:
+                series.state_columns[CognitiveState(name)].fromfile(f, series.days)
+            for name in header.get("bands", []):
+                state, band = name.split(":")
+                series.band_columns[(CognitiveState(state), band)].fromfile(f, series.days)
+            if "bands" not in header:  # Written before time bands existed
+                for column in series.band_columns.values():
+                    column.extend(array("I", bytes(4 * series.days)))
+        return series
+
+class DailySeriesStore:
+    """PatientDailySeries for a whole facility, one file per patient"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._series: Dict[str, PatientDailySeries] = {}
+
+    def _path(self, patient_id: str) -> str:
+        return os.path.join(self.root, f"{patient_id}.series")
+
+    def get(self, patient_id: str) -> PatientDailySeries:
+        series = self._series.get(patient_id)
+        if series is None:
+            path = self._path(patient_id)
+            series = PatientDailySeries.load(path) if os.path.exists(path) else PatientDailySeries()
+            self._series[patient_id] = series
+        return series
+
+    def patient_ids(self) -> List[str]:
+        stored = {name[:-len(".series")] for name in os.listdir(self.root) if name.endswith(".series")} \
+            if os.path.isdir(self.root) else set()
+        return sorted(stored | set(self._series))
+
+    def save(self, patient_id: Optional[str] = None) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        for pid in [patient_id] if patient_id else list(self._series):
+            if pid in self._series:
+                self._series[pid].save(self._path(pid))
+
+    def release(self, patient_id: str) -> None:
+        """Save one patient's series and stop holding it in memory"""
+        self.save(patient_id)
+        self._series.pop(patient_id, None)
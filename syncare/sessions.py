@@ -0,0 +1,276 @@
+"""Per-patient sessions, in process or sharded across worker processes"""
+
+import datetime
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Sequence
+
+from .model import PatientContext
+from .risk import SundownRiskProfile
+from .templates import _template_fields
+from .series import DailySeriesStore, PatientDailySeries
+from .insights import DoctorInsightsGenerator
+from .storage import InteractionLogStore, PatientContextStore
+from .search import TranscriptIndex
+from .patient import PatientVoiceInterface
+from .family import MaterializedFamilyView
+from .medication import DoseLedger, DoseLedgerStore
+from .doctor import DoctorDashboard
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+class PatientSession:
+    """Patient, doctor and insights objects for one patient, sharing one interned context"""
+
+    def __init__(self, patient_id: str, context: PatientContext, log_store: Optional[InteractionLogStore] = None,
+                 daily_series: Optional[PatientDailySeries] = None,
+                 transcript_index: Optional[TranscriptIndex] = None, dose_ledger: Optional[DoseLedger] = None):
+        self.patient_id = patient_id
+        self.context = context = context.intern()
+        self.doses = dose_ledger
+        self.family = MaterializedFamilyView(_template_fields(context)["name"], dose_ledger=self.doses)
+        self.voice = PatientVoiceInterface(patient_id, log_store=log_store, patient_context=context,
+                                           transcript_index=transcript_index, family_view=self.family)
+        self.insights_engine = DoctorInsightsGenerator(context, self.voice.analyzer, daily_series=daily_series,
+                                                       dose_ledger=self.doses)
+        self.voice.insights_engine = self.insights_engine
+        self.doctor = DoctorDashboard(patient_id, log_store=log_store, insights_engine=self.insights_engine,
+                                      transcript_index=transcript_index)
+
+    def override_context(self, **changes) -> PatientContext:
+        """Edit this session's context copy-on-write; other sessions keep the shared one"""
+        context = self.context.with_overrides(**changes)
+        self.context = context
+        voice = self.voice
+        voice.patient = voice.analyzer.context = voice.companion.context = context
+        self.insights_engine.context = self.doctor.patient_context = context
+        self.family.rename(_template_fields(context)["name"])
+        return context
+
+    def prescribe(self, schedule: Sequence[datetime.time], start: datetime.datetime) -> DoseLedger:
+        """Start, or change from `start` on, this patient's dose schedule"""
+        if self.doses is None:
+            self.doses = DoseLedger(schedule, start=start)
+            self.insights_engine.dose_ledger = self.doses
+            self.family.set_dose_ledger(self.doses)
+        else:
+            self.doses.prescribe(schedule, start.date())
+        return self.doses
+
+    def state(self) -> Dict:
+        """Learned and in-progress state that can't be rebuilt from the other stores"""
+        companion = self.voice.companion
+        return {
+            "sundown_profile": companion.sundown_profile.to_dict(),
+            "frequencies": companion.analyzer.frequencies.to_dict(),
+            "escalation": companion.escalation.to_dict(),
+            "family": self.family.to_dict(),
+            "insights": self.insights_engine.to_dict(),
+        }
+
+    def restore(self, state: Dict) -> None:
+        companion = self.voice.companion
+        if "sundown_profile" in state:
+            companion.sundown_profile = SundownRiskProfile.from_dict(state["sundown_profile"])
+        if "frequencies" in state:
+            companion.analyzer.frequencies.restore(state["frequencies"])
+        if "escalation" in state:
+            companion.escalation.restore(state["escalation"])
+        if "family" in state:
+            self.family.restore(state["family"])
+        if "insights" in state:
+            self.insights_engine.restore(state["insights"])
+
+    def daily_summary(self, date: datetime.date) -> Dict:
+        """The day's summary, rebuilt from the log when this session holds no counters for it"""
+        insights = self.insights_engine
+        log_store = self.voice.log_store
+        if date not in insights.daily_aggregates and log_store is not None:
+            return insights.rebuild_daily_summary(date, log_store.read_day_records(self.patient_id, date))
+        return insights.generate_daily_summary(date)
+
+class SessionStateStore:
+    """PatientSession.state() for a whole facility, one JSON file per patient"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, patient_id: str) -> str:
+        return os.path.join(self.root, f"{patient_id}.state.json")
+
+    def load(self, patient_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(patient_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, patient_id: str, state: Dict) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(patient_id)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+class SessionManager:
+    """Hot PatientSessions for many patients, evicted least-recently-used first"""
+
+    def __init__(self, context_store: Optional[PatientContextStore] = None,
+                 log_store: Optional[InteractionLogStore] = None, capacity: int = 1024,
+                 series_store: Optional[DailySeriesStore] = None,
+                 transcript_index: Optional[TranscriptIndex] = None,
+                 dose_store: Optional[DoseLedgerStore] = None,
+                 state_store: Optional[SessionStateStore] = None):
+        self.context_store = context_store
+        self.log_store = log_store
+        self.series_store = series_store
+        self.dose_store = dose_store
+        self.state_store = state_store
+        self.transcript_index = transcript_index
+        self.capacity = capacity
+        self._sessions: "OrderedDict[str, PatientSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, patient_id: str) -> PatientSession:
+        with self._lock:
+            session = self._sessions.get(patient_id)
+            if session is not None:
+                self._sessions.move_to_end(patient_id)
+                return session
+
+        # Load outside the lock so a slow context read doesn't stall other patients
+        context = self.context_store.load(patient_id) if self.context_store else PatientContext().intern()
+        series = self.series_store.get(patient_id) if self.series_store else None
+        doses = self.dose_store.get(patient_id) if self.dose_store else None
+        session = PatientSession(patient_id, context, self.log_store, series, self.transcript_index, doses)
+        state = self.state_store.load(patient_id) if self.state_store else None
+        if state is not None:
+            session.restore(state)
+
+        evicted = []
+        with self._lock:
+            session = self._sessions.setdefault(patient_id, session)
+            self._sessions.move_to_end(patient_id)
+            while len(self._sessions) > self.capacity:
+                evicted.append(self._sessions.popitem(last=False))
+        for evicted_id, evicted_session in evicted:
+            self._persist(evicted_id, evicted_session, release=True)
+        return session
+
+    def prescribe(self, patient_id: str, schedule: Sequence[datetime.time], start: datetime.datetime) -> DoseLedger:
+        ledger = self.get(patient_id).prescribe(schedule, start)
+        if self.dose_store is not None:
+            self.dose_store.put(patient_id, ledger)
+        return ledger
+
+    def evict(self, patient_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(patient_id, None)
+        self._persist(patient_id, session, release=True)
+
+    def save(self) -> None:
+        """Persist every hot session without evicting it"""
+        with self._lock:
+            sessions = list(self._sessions.items())
+        for patient_id, session in sessions:
+            self._persist(patient_id, session, release=False)
+
+    def _persist(self, patient_id: str, session: Optional[PatientSession], release: bool) -> None:
+        if self.state_store is not None and session is not None:
+            self.state_store.save(patient_id, session.state())
+        # An evicted patient's series and ledger leave memory with its session
+        for store in (self.series_store, self.dose_store):
+            if store is None:
+                continue
+            if release:
+                store.release(patient_id)
+            else:
+                store.save(patient_id)
+
+    def __contains__(self, patient_id: str) -> bool:
+        return patient_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def listen(self, patient_id: str, voice_input: str, current_time: datetime.datetime) -> Dict:
+        return self.get(patient_id).voice.listen_mode(voice_input, current_time)
+
+def shard_for_patient(patient_id: str, shard_count: int) -> int:
+    """Stable shard number for a patient (unlike hash(), identical across processes)"""
+    return zlib.crc32(patient_id.encode("utf-8")) % shard_count
+
+# Per-process state of a ShardedSessionPool worker
+_shard_sessions: Optional[SessionManager] = None
+
+def _init_shard_worker(context_root: Optional[str], log_root: Optional[str], capacity: int,
+                       series_root: Optional[str] = None, index_root: Optional[str] = None,
+                       dose_root: Optional[str] = None, state_root: Optional[str] = None) -> None:
+    global _shard_sessions
+    _shard_sessions = SessionManager(
+        context_store=PatientContextStore(context_root) if context_root else None,
+        log_store=InteractionLogStore(log_root) if log_root else None,
+        capacity=capacity,
+        series_store=DailySeriesStore(series_root) if series_root else None,
+        transcript_index=TranscriptIndex(index_root) if index_root else None,
+        dose_store=DoseLedgerStore(dose_root) if dose_root else None,
+        state_store=SessionStateStore(state_root) if state_root else None
+    )
+
+def _shard_listen(patient_id: str, voice_input: str, current_time: datetime.datetime) -> Dict:
+    return _shard_sessions.listen(patient_id, voice_input, current_time)
+
+def _shard_daily_summary(patient_id: str, date: datetime.date) -> Dict:
+    return _shard_sessions.get(patient_id).daily_summary(date)
+
+def _shard_close() -> None:
+    _shard_sessions.save()
+    if _shard_sessions.log_store is not None:
+        _shard_sessions.log_store.close()
+    if _shard_sessions.transcript_index is not None:
+        _shard_sessions.transcript_index.close()
+
+class ShardedSessionPool:
+    """Spreads patients over worker processes, each owning a SessionManager.
+
+    Every patient always lands on the same single-process shard, so its
+    session state and log segments are only ever touched by one worker.
+    """
+
+    def __init__(self, shard_count: int = os.cpu_count() or 1, context_root: Optional[str] = None,
+                 log_root: Optional[str] = None, capacity_per_shard: int = 1024,
+                 series_root: Optional[str] = None, index_root: Optional[str] = None,
+                 dose_root: Optional[str] = None, state_root: Optional[str] = None):
+        from concurrent.futures import ProcessPoolExecutor  # Kept out of module import for short-lived jobs
+        self.shard_count = shard_count
+        self._shards = [
+            ProcessPoolExecutor(max_workers=1, initializer=_init_shard_worker,
+                                initargs=(context_root, log_root, capacity_per_shard,
+                                          series_root, index_root, dose_root, state_root))
+            for _ in range(shard_count)
+        ]
+
+    def _shard(self, patient_id: str) -> "ProcessPoolExecutor":
+        return self._shards[shard_for_patient(patient_id, self.shard_count)]
+
+    def listen(self, patient_id: str, voice_input: str, current_time: datetime.datetime) -> "Future":
+        return self._shard(patient_id).submit(_shard_listen, patient_id, voice_input, current_time)
+
+    def daily_summary(self, patient_id: str, date: datetime.date) -> "Future":
+        return self._shard(patient_id).submit(_shard_daily_summary, patient_id, date)
+
+    def shutdown(self) -> None:
+        for shard in self._shards:
+            shard.submit(_shard_close).result()
+            shard.shutdown()
+
+    def __enter__(self) -> "ShardedSessionPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
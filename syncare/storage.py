@@ -0,0 +1,183 @@
+"""Append-only interaction log and patient context persistence"""
+
+import datetime
+import json
+import os
+import struct
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+from dataclasses import asdict
+
+from .model import CognitiveState, _DAY_MICROS, EmotionalTrigger, InteractionRecord, PatientContext, _WALL_EPOCH
+
+class _LogSegment:
+    """One patient-month of the interaction log: records, utterance heap, day index"""
+
+    def __init__(self, base_path: str):
+        self.base_path = base_path
+        self.records = open(base_path + ".rec", "ab+")
+        self.utterances = open(base_path + ".utt", "ab+")
+        self.index = open(base_path + ".idx", "ab+")
+
+        # Drop a torn trailing record left by a crash mid-append, and records
+        # whose utterance never reached the heap; later appends would reuse that range
+        record_size = InteractionLogStore.RECORD.size
+        size = os.fstat(self.records.fileno()).st_size
+        self.record_count = size // record_size
+        self.utterance_size = os.fstat(self.utterances.fileno()).st_size
+        while self.record_count:
+            self.records.seek((self.record_count - 1) * record_size)
+            *_, offset, length = InteractionLogStore.RECORD.unpack(self.records.read(record_size))
+            if offset + length <= self.utterance_size:
+                break
+            self.record_count -= 1
+        if size != self.record_count * record_size:
+            self.records.truncate(self.record_count * record_size)
+
+        # Day runs: (date ordinal, first record number), in append order
+        self.index.seek(0)
+        raw_index = self.index.read()
+        raw_index = raw_index[:len(raw_index) - len(raw_index) % InteractionLogStore.DAY_RUN.size]
+        self.day_runs: List[Tuple[int, int]] = [
+            (ordinal, start) for ordinal, start in InteractionLogStore.DAY_RUN.iter_unpack(raw_index)
+            if start < self.record_count
+        ]
+        # Cut a torn entry, and runs for records lost above, so appends stay aligned
+        index_size = len(self.day_runs) * InteractionLogStore.DAY_RUN.size
+        if os.fstat(self.index.fileno()).st_size != index_size:
+            self.index.truncate(index_size)
+        self.last_ordinal = self.day_runs[-1][0] if self.day_runs else None
+
+    def append(self, micros: int, ordinal: int, state_code: int, trigger_mask: int, utterance: bytes) -> None:
+        if ordinal != self.last_ordinal:
+            self.day_runs.append((ordinal, self.record_count))
+            self.index.write(InteractionLogStore.DAY_RUN.pack(ordinal, self.record_count))
+            self.last_ordinal = ordinal
+        self.utterances.write(utterance)
+        self.records.write(InteractionLogStore.RECORD.pack(micros, state_code, trigger_mask, self.utterance_size, len(utterance)))
+        self.utterance_size += len(utterance)
+        self.record_count += 1
+
+    def read_day(self, ordinal: int) -> List[Tuple[int, int, int, str]]:
+        self.flush()
+        rows = []
+        record_size = InteractionLogStore.RECORD.size
+        for i, (run_ordinal, start) in enumerate(self.day_runs):
+            if run_ordinal != ordinal:
+                continue
+            end = self.day_runs[i + 1][1] if i + 1 < len(self.day_runs) else self.record_count
+            self.records.seek(start * record_size)
+            run = list(InteractionLogStore.RECORD.iter_unpack(self.records.read((end - start) * record_size)))
+            if not run:
+                continue
+            # A run's utterances are contiguous in the heap: one read covers them
+            heap_start = run[0][3]
+            self.utterances.seek(heap_start)
+            heap = self.utterances.read(run[-1][3] + run[-1][4] - heap_start)
+            for micros, state_code, trigger_mask, offset, length in run:
+                text = heap[offset - heap_start:offset - heap_start + length].decode("utf-8")
+                rows.append((micros, state_code, trigger_mask, text))
+        return rows
+
+    def flush(self) -> None:
+        # Utterances before the records that point into them
+        self.utterances.flush()
+        self.records.flush()
+        self.index.flush()
+
+    def close(self) -> None:
+        for handle in (self.utterances, self.records, self.index):
+            handle.close()
+
+class InteractionLogStore:
+    """Append-only, segment-per-patient-month interaction log on disk.
+
+    Records are fixed-size binary (timestamp, state code, trigger mask,
+    utterance offset/length); utterance text lives in a separate heap file.
+    A per-segment day index lets a single day be read without replaying
+    the rest of the month. Timestamps are stored as wall-clock time.
+    """
+
+    RECORD = struct.Struct("<qBHII")
+    DAY_RUN = struct.Struct("<iI")
+    _EPOCH_ORDINAL = _WALL_EPOCH.toordinal()
+
+    def __init__(self, root: str, max_open_segments: int = 64):
+        self.root = root
+        self.max_open_segments = max_open_segments
+        self._segments: "OrderedDict[Tuple[str, str], _LogSegment]" = OrderedDict()
+
+    def _segment(self, patient_id: str, month: str, create: bool) -> Optional[_LogSegment]:
+        key = (patient_id, month)
+        segment = self._segments.get(key)
+        if segment is not None:
+            self._segments.move_to_end(key)
+            return segment
+
+        directory = os.path.join(self.root, patient_id)
+        base_path = os.path.join(directory, month)
+        if not create and not os.path.exists(base_path + ".rec"):
+            return None
+        os.makedirs(directory, exist_ok=True)
+
+        segment = self._segments[key] = _LogSegment(base_path)
+        while len(self._segments) > self.max_open_segments:
+            self._segments.popitem(last=False)[1].close()
+        return segment
+
+    def append(self, patient_id: str, timestamp: datetime.datetime, state: CognitiveState,
+               triggers: Sequence[EmotionalTrigger], utterance: str) -> None:
+        self.append_record(patient_id, InteractionRecord.of(timestamp, state, triggers, utterance))
+
+    def append_record(self, patient_id: str, record: InteractionRecord) -> None:
+        ordinal = self._EPOCH_ORDINAL + record.micros // _DAY_MICROS
+        date = datetime.date.fromordinal(ordinal)
+        segment = self._segment(patient_id, f"{date.year:04d}-{date.month:02d}", create=True)
+        segment.append(record.micros, ordinal, record.state_code, record.trigger_mask, record.patient_said.encode("utf-8"))
+
+    def read_day(self, patient_id: str, date: datetime.date) -> List[Dict]:
+        """All interactions logged for one day, oldest first"""
+        return [record.to_dict() for record in self.read_day_records(patient_id, date)]
+
+    def read_day_records(self, patient_id: str, date: datetime.date) -> List[InteractionRecord]:
+        segment = self._segment(patient_id, date.strftime("%Y-%m"), create=False)
+        if segment is None:
+            return []
+        return [InteractionRecord(*row) for row in sorted(segment.read_day(date.toordinal()))]
+
+    def flush(self) -> None:
+        for segment in self._segments.values():
+            segment.flush()
+
+    def close(self) -> None:
+        while self._segments:
+            self._segments.popitem()[1].close()
+
+    def __enter__(self) -> "InteractionLogStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class PatientContextStore:
+    """Per-patient PatientContext records kept as JSON files"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, patient_id: str) -> str:
+        return os.path.join(self.root, f"{patient_id}.json")
+
+    def load(self, patient_id: str) -> PatientContext:
+        try:
+            with open(self._path(patient_id), encoding="utf-8") as f:
+                return PatientContext(**json.load(f)).intern()
+        except FileNotFoundError:
+            raise KeyError(f"No stored context for patient {patient_id!r}") from None
+
+    def save(self, patient_id: str, context: PatientContext) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self._path(patient_id) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(context), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path(patient_id))
@@ -0,0 +1,86 @@
+"""Patient-facing reply templates"""
+
+import re
+import weakref
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from .model import PatientContext
+
+# Patient-facing replies, filled in from each patient's PatientContext
+RESPONSE_TEMPLATES: Dict[str, str] = {
+    "money_anxiety": "{name}, you're right to keep track. You worked hard for your {properties} in {home_town}. Let's make sure everything is documented - tell me about your {home_locality} property.",
+    "sister_urgency": "I know you have something important for your sister. She'll want to hear about your {workplace} days. Should we call her?",
+    "pankaj_hallucination": "{attachment} is safe. He wanted your advice about something - what should I tell him from you?",
+    "home_longing": "I know {home_town} is where your heart is. Tell me about your {home_locality} home.",
+    "pankaj_safety": "{attachment} is safe. He wanted your guidance - what advice should I give him?",
+    "maternal_grief": "Your mother would be so proud of how strong you've been, {name}. What memory of her comforts you today?",
+    "isolation_panic": "You're not alone, {name}. {attachment} and I are right here. Let's talk about your favorite family gathering.",
+    "competence_loss": "It's okay, {name}. You remember the important things, like your {work_days}. What was your favorite part of the job?",
+    "baseline": "I'm here with you, {name}. What are you thinking about?",
+    "morning_medication": "Good morning, {name}. {attachment} wanted me to remind you - your tablets are ready.",
+    "pre_sundown_intervention": "{name}, let's have chai. Tell me about your days at {workplace}.",
+    "evening_ritual": "You've had a productive day. Shall we call {attachment}?",
+}
+
+_NUMBER_WORDS = ["no", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten"]
+
+def _template_fields(context: PatientContext) -> Dict[str, str]:
+    """Values the templates interpolate, derived from a patient's context"""
+    properties = context.properties_owned or ()
+    locality = re.search(r"\bin ([^,]+)", properties[0]) if properties else None
+    count = len(properties)
+    return {
+        "name": context.maiden_name.split()[0] if context.maiden_name else "",
+        "attachment": context.primary_attachment,
+        "home_town": context.displacement_from,
+        "home_locality": locality.group(1).strip() if locality else context.displacement_from,
+        "properties": "home" if count == 0 else "house" if count == 1 else
+                      f"{_NUMBER_WORDS[count] if count < len(_NUMBER_WORDS) else count} houses",
+        "workplace": context.workplace or "work",
+        "work_days": context.work_days or "working days",
+    }
+
+class TemplateRegistry:
+    """Renders RESPONSE_TEMPLATES once per patient context and caches the strings.
+
+    Contexts are immutable, so a render is cached against the context's
+    identity and a turn costs one dict lookup instead of rebuilding every
+    reply. An edited context is a new object and renders afresh. Entries
+    hold the context weakly and drop out when it is collected.
+    """
+
+    def __init__(self, templates: Dict[str, str] = RESPONSE_TEMPLATES, capacity: int = 4096):
+        self.templates = templates
+        self.capacity = capacity
+        # id(context) -> (weak ref to context, rendered); the ref's callback
+        # drops the entry before the id can be reused
+        self._cache: "OrderedDict[int, Tuple[weakref.ref, Dict[str, str]]]" = OrderedDict()
+
+    def render(self, context: PatientContext) -> Dict[str, str]:
+        entry = self._cache.get(id(context))
+        if entry is not None and entry[0]() is context:
+            self._cache.move_to_end(id(context))
+            return entry[1]
+
+        fields = _template_fields(context)
+        rendered = {key: template.format(**fields) for key, template in self.templates.items()}
+        self._cache[id(context)] = (weakref.ref(context, self._discard(id(context))), rendered)
+        self._cache.move_to_end(id(context))
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+        return rendered
+
+    def _discard(self, key: int):
+        cache = self._cache
+
+        def discard(ref: weakref.ref) -> None:
+            entry = cache.get(key)
+            if entry is not None and entry[0] is ref:
+                del cache[key]
+        return discard
+
+    def invalidate(self, context: PatientContext) -> None:
+        self._cache.pop(id(context), None)
+
+DEFAULT_TEMPLATE_REGISTRY = TemplateRegistry()
@@ -0,0 +1,225 @@
+"""Memory-mapped ingestion of uploaded MP4 recordings"""
+
+import bisect
+import datetime
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+@dataclass
+class VideoChunk:
+    """A fixed-size byte range of an uploaded video, handed to chunk analyzers"""
+
+    path: str
+    offset: int
+    length: int
+    start_seconds: float
+    end_seconds: float
+
+@dataclass
+class VideoIngestResult:
+    path: str
+    size_bytes: int
+    duration_seconds: float
+    creation_time: Optional[datetime.datetime]
+    keyframes: List[Tuple[float, int]]  # (seconds, byte offset) of each sync sample
+    chunk_results: List[Dict]
+
+def _iter_boxes(buf, start: int, end: int):
+    """(type, payload start, box end) for each ISO BMFF box in buf[start:end]"""
+    while start + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", buf, start)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", buf, start + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - start
+        if size < header or start + size > end:
+            raise ValueError(f"Corrupt box {box_type!r} at offset {start}")
+        yield box_type.decode("latin-1"), start + header, start + size
+        start += size
+
+def _child(buf, start: int, end: int, box_type: str) -> Optional[Tuple[int, int]]:
+    for found_type, payload, box_end in _iter_boxes(buf, start, end):
+        if found_type == box_type:
+            return payload, box_end
+    return None
+
+def _require(buf, start: int, end: int, box_type: str) -> Tuple[int, int]:
+    box = _child(buf, start, end, box_type)
+    if box is None:
+        raise ValueError(f"Missing {box_type} box")
+    return box
+
+def _video_track_index(buf, moov: Tuple[int, int]) -> Optional[Dict]:
+    """Timescale, sample timing and sync-sample offsets of the first video track"""
+    for box_type, trak_start, trak_end in _iter_boxes(buf, *moov):
+        if box_type != "trak":
+            continue
+        mdia = _child(buf, trak_start, trak_end, "mdia")
+        hdlr = mdia and _child(buf, *mdia, "hdlr")
+        if not hdlr or bytes(buf[hdlr[0] + 8:hdlr[0] + 12]) != b"vide":
+            continue
+        mdhd = _require(buf, *mdia, "mdhd")
+        version = buf[mdhd[0]]
+        timescale = struct.unpack_from(">I", buf, mdhd[0] + (20 if version == 1 else 12))[0]
+        stbl = _require(buf, *_require(buf, *mdia, "minf"), "stbl")
+
+        def entries(name: str, box: Tuple[int, int], fmt: str, entry_offset: int, count: int) -> List[Tuple]:
+            start = box[0] + entry_offset
+            end = start + count * struct.calcsize(fmt)
+            # A count running past the box would read the next boxes as entries
+            if end > box[1]:
+                raise ValueError(f"Corrupt {name} box: {count} entries overrun it")
+            return list(struct.iter_unpack(fmt, buf[start:end]))
+
+        def table(name: str, fmt: str) -> List[Tuple]:
+            box = _child(buf, *stbl, name)
+            if box is None:
+                return []
+            return entries(name, box, fmt, 8, struct.unpack_from(">I", buf, box[0] + 4)[0])
+
+        stsz = _require(buf, *stbl, "stsz")
+        uniform_size, sample_count = struct.unpack_from(">II", buf, stsz[0] + 4)
+        sizes = [uniform_size] * sample_count if uniform_size else \
+            [size for (size,) in entries("stsz", stsz, ">I", 12, sample_count)]
+        return {
+            "timescale": timescale,
+            "stts": table("stts", ">II"),
+            "stss": table("stss", ">I"),  # Missing table: every sample is a sync sample
+            "stsc": table("stsc", ">III"),
+            "chunk_offsets": [o for (o,) in table("stco", ">I")] or [o for (o,) in table("co64", ">Q")],
+            "sizes": sizes,
+        }
+    return None
+
+def _keyframes(track: Dict) -> List[Tuple[float, int]]:
+    sync = {n for (n,) in track["stss"]} if track["stss"] else None
+    # Sample decode times from the run-length stts table
+    times, t = [], 0
+    for count, delta in track["stts"]:
+        for _ in range(count):
+            times.append(t)
+            t += delta
+    keyframes = []
+    sample = 0
+    stsc = track["stsc"]
+    for i, (first_chunk, per_chunk, _) in enumerate(stsc):
+        last_chunk = stsc[i + 1][0] - 1 if i + 1 < len(stsc) else len(track["chunk_offsets"])
+        for chunk in range(first_chunk, last_chunk + 1):
+            offset = track["chunk_offsets"][chunk - 1]
+            for _ in range(per_chunk):
+                if sample >= len(track["sizes"]):
+                    break
+                if sync is None or sample + 1 in sync:
+                    seconds = times[sample] / track["timescale"] if sample < len(times) else 0.0
+                    keyframes.append((seconds, offset))
+                offset += track["sizes"][sample]
+                sample += 1
+    return keyframes
+
+def video_chunk_bitrate(data: memoryview, chunk: VideoChunk) -> Dict:
+    """Default chunk analyzer: bitrate, a cheap proxy for on-screen motion"""
+    seconds = max(chunk.end_seconds - chunk.start_seconds, 1e-3)
+    return {
+        "offset": chunk.offset,
+        "start_seconds": round(chunk.start_seconds, 3),
+        "end_seconds": round(chunk.end_seconds, 3),
+        "kbps": round(len(data) * 8 / seconds / 1000, 1),
+    }
+
+def _analyze_video_chunk(analyzer: Callable[[memoryview, VideoChunk], Dict], chunk: VideoChunk) -> Dict:
+    # Runs in a pool worker: map the file there rather than pickling its bytes
+    with open(chunk.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            return analyzer(view[chunk.offset:chunk.offset + chunk.length], chunk)
+        finally:
+            view.release()
+
+class VideoIngestor:
+    """Memory-mapped MP4/MOV ingestion for uploaded episode recordings.
+
+    Only box headers and the moov index are read to find the duration,
+    recording time and keyframes; sample data is never decoded. The file
+    is then cut into fixed-size chunks that `analyzer` sees one at a time,
+    on `executor` when given, else on a process pool of `workers` started
+    for the upload (workers map the file themselves); workers=0 analyzes
+    inline. A malformed file raises ValueError. creation_time is naive
+    local time, like every other timestamp in the system.
+    """
+
+    _MP4_EPOCH = datetime.datetime(1904, 1, 1, tzinfo=datetime.timezone.utc)
+    # Older QuickTime files may open with something other than ftyp
+    _LEADING_BOXES = {b"ftyp", b"moov", b"mdat", b"wide", b"free", b"skip"}
+
+    def __init__(self, analyzer: Callable[[memoryview, VideoChunk], Dict] = video_chunk_bitrate,
+                 chunk_size: int = 8 * 1024 * 1024, executor: Optional["Executor"] = None,
+                 workers: Optional[int] = None):
+        self.analyzer = analyzer
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self.workers = workers
+
+    def ingest(self, path: str) -> VideoIngestResult:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                raise ValueError(f"{path} is empty")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                if bytes(buf[4:8]) not in self._LEADING_BOXES:
+                    raise ValueError(f"{path} is not an MP4/MOV (ISO BMFF) file")
+                moov = _child(buf, 0, size, "moov")
+                if moov is None:
+                    raise ValueError(f"{path} has no moov index (upload may be truncated)")
+                try:
+                    mvhd = _require(buf, *moov, "mvhd")
+                    version = buf[mvhd[0]]
+                    if version == 1:
+                        created, _, timescale, duration = struct.unpack_from(">QQIQ", buf, mvhd[0] + 4)
+                    else:
+                        created, _, timescale, duration = struct.unpack_from(">IIII", buf, mvhd[0] + 4)
+                    track = _video_track_index(buf, moov)
+                    keyframes = _keyframes(track) if track else []
+                except (struct.error, IndexError) as exc:
+                    raise ValueError(f"{path} has a corrupt moov index ({exc})") from exc
+                except ValueError as exc:
+                    raise ValueError(f"{path}: {exc}") from exc
+
+        duration_seconds = duration / timescale if timescale else 0.0
+        creation_time = (self._MP4_EPOCH + datetime.timedelta(seconds=created)).astimezone().replace(tzinfo=None) \
+            if created else None
+        chunks = self._chunks(path, size, duration_seconds, keyframes)
+        if self.executor is not None:
+            chunk_results = list(self.executor.map(_analyze_video_chunk, [self.analyzer] * len(chunks), chunks))
+        elif self.workers == 0 or len(chunks) < 2:
+            chunk_results = [_analyze_video_chunk(self.analyzer, chunk) for chunk in chunks]
+        else:
+            from concurrent.futures import ProcessPoolExecutor  # Kept out of module import for short-lived jobs
+            with ProcessPoolExecutor(max_workers=min(self.workers or os.cpu_count() or 1, len(chunks))) as pool:
+                chunk_results = list(pool.map(_analyze_video_chunk, [self.analyzer] * len(chunks), chunks))
+        return VideoIngestResult(path, size, duration_seconds, creation_time, keyframes, chunk_results)
+
+    def _chunks(self, path: str, size: int, duration_seconds: float,
+                keyframes: List[Tuple[float, int]]) -> List[VideoChunk]:
+        # Byte offsets map to time by interpolating between keyframes
+        points = sorted((offset, seconds) for seconds, offset in keyframes)
+        points = [(0, 0.0)] + points + [(size, duration_seconds)]
+        offsets = [offset for offset, _ in points]
+
+        def seconds_at(position: int) -> float:
+            i = min(max(bisect.bisect_right(offsets, position), 1), len(points) - 1)
+            (lo, lo_s), (hi, hi_s) = points[i - 1], points[i]
+            return lo_s if hi == lo else lo_s + (hi_s - lo_s) * (position - lo) / (hi - lo)
+
+        return [
+            VideoChunk(path, offset, min(self.chunk_size, size - offset),
+                       seconds_at(offset), seconds_at(min(offset + self.chunk_size, size)))
+            for offset in range(0, size, self.chunk_size)
+        ]
@@ -0,0 +1,45 @@
+import datetime
+import math
+
+from syncare import CorrelationEngine, EmotionalTrigger, PatientDailySeries
+from syncare.correlation import _benjamini_hochberg, _fisher_interval, _fisher_p_value, _pearson
+
+def test_pearson_against_hand_computed_value():
+    # dx = -2..2, dy = (-2, 0, 1, 0, 1): sxy = 6, sxx = 10, syy = 6
+    assert math.isclose(_pearson([1, 2, 3, 4, 5], [2, 4, 5, 4, 5]), 6 / math.sqrt(60))
+    assert math.isclose(_pearson([1, 2, 3], [3, 2, 1]), -1.0)
+    assert _pearson([1, 2, 3], [4, 4, 4]) is None
+    assert _pearson([1, 2], [1, 2]) is None
+
+def test_fisher_z_p_value_and_interval_against_hand_computed_values():
+    # r = 0.5, n = 12: z = atanh(0.5) = 0.549306, standard error 1/3
+    assert math.isclose(_fisher_p_value(0.5, 12), 0.099369, abs_tol=1e-6)
+    low, high = _fisher_interval(0.5, 12)
+    # tanh(0.549306 -/+ 1.959964 / 3)
+    assert math.isclose(low, -0.103642, abs_tol=1e-6)
+    assert math.isclose(high, 0.834454, abs_tol=1e-6)
+    assert _fisher_p_value(0.0, 30) == 1.0
+    low, high = _fisher_interval(0.0, 30)
+    assert math.isclose(low, -high) and math.isclose(high, math.tanh(1.959964 / math.sqrt(27)), abs_tol=1e-6)
+
+def test_benjamini_hochberg_against_hand_computed_values():
+    # Ranks 1..4 give 0.005*4/1, 0.01*4/2, 0.03*4/3, 0.04*4/4, then a running minimum from the top
+    assert [round(p, 10) for p in _benjamini_hochberg([0.01, 0.04, 0.03, 0.005])] == [0.02, 0.04, 0.04, 0.02]
+    assert [round(p, 10) for p in _benjamini_hochberg([0.01, 0.02, 0.03, 0.5])] == [0.04, 0.04, 0.04, 0.5]
+    assert _benjamini_hochberg([]) == []
+
+def test_correlate_finds_a_one_day_lead():
+    series = PatientDailySeries()
+    start = datetime.date(2026, 1, 1)
+    sister = [1, 4, 2, 6, 3, 5, 1, 7, 2, 4, 6, 3, 5, 2]
+    for day, n in enumerate(sister):
+        counts = {EmotionalTrigger.SISTER_URGENCY: n}
+        if day:
+            counts[EmotionalTrigger.PANKAJ_SAFETY] = sister[day - 1]
+        series.add_trigger_counts(start + datetime.timedelta(days=day), counts)
+    end = start + datetime.timedelta(days=len(sister) - 1)
+
+    found = CorrelationEngine(max_lag=2).correlate(series, end, len(sister))
+    lead = next(c for c in found if (c.leader, c.follower, c.lag_days) == ("sister urgency", "pankaj safety", 1))
+    assert math.isclose(lead.r, 1.0) and lead.n == len(sister) - 1
+    assert lead.interval[0] > 0.99
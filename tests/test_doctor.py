@@ -0,0 +1,62 @@
+import datetime
+
+from syncare import ChatAnswerCache, SessionManager
+from syncare.doctor import normalize_question
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = ChatAnswerCache(ttl_seconds=60, clock=clock)
+    cache.put("P", "money", 0, {"answer": 1})
+    clock.now += 59.9
+    assert cache.get("P", "money", 0) == {"answer": 1}
+    clock.now += 0.1
+    assert cache.get("P", "money", 0) is None
+    assert len(cache) == 0
+
+def test_entries_from_an_older_generation_are_dropped():
+    cache = ChatAnswerCache(clock=FakeClock())
+    cache.put("P", "money", 3, {"answer": 1})
+    cache.put("Q", "money", 3, {"answer": 2})
+    assert cache.get("P", "money", 4) is None
+    assert cache.get("Q", "money", 3) == {"answer": 2}
+    cache.invalidate("Q")
+    assert len(cache) == 0
+
+def test_least_recently_used_entry_goes_first():
+    cache = ChatAnswerCache(max_entries=2, clock=FakeClock())
+    cache.put("P", "a", 0, {"answer": "a"})
+    cache.put("P", "b", 0, {"answer": "b"})
+    cache.get("P", "a", 0)
+    cache.put("P", "c", 0, {"answer": "c"})
+    assert cache.get("P", "b", 0) is None and cache.get("P", "a", 0) == {"answer": "a"}
+
+def test_chat_answers_refresh_after_new_interactions():
+    clock = FakeClock()
+    session = SessionManager().get("A")
+    cache = session.doctor.chat_cache = ChatAnswerCache(ttl_seconds=900, clock=clock)
+    question = "Why is she so paranoid about money?"
+    key = normalize_question(question)
+    start = datetime.datetime(2026, 2, 8, 10, 0)
+    session.voice.listen_mode("someone took my money", start)
+
+    assert session.doctor.chat_with_ai(question)["mentions_last_7_days"] == 1
+    # The same question with other casing and punctuation shares the entry
+    session.doctor.chat_with_ai("WHY is she so paranoid about money")
+    assert len(cache) == 1
+
+    # A new interaction bumps the generation, so the next answer is recomputed
+    session.voice.listen_mode("where is my money", start + datetime.timedelta(minutes=5))
+    assert cache.get("A", key, session.insights_engine.interactions_recorded) is None
+    assert session.doctor.chat_with_ai(question)["mentions_last_7_days"] == 2
+
+    # Without new interactions the TTL alone expires it
+    assert cache.get("A", key, session.insights_engine.interactions_recorded) is not None
+    clock.now += 901
+    assert cache.get("A", key, session.insights_engine.interactions_recorded) is None
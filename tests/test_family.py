@@ -0,0 +1,35 @@
+import datetime
+
+from syncare import CognitiveState, EmotionalTrigger, InteractionRecord, MaterializedFamilyView, PatientVoiceInterface
+from syncare.family import FAMILY_ALERT_MESSAGES
+
+def test_escalation_reaches_the_rendered_alerts():
+    family = MaterializedFamilyView("Suhasini (Aai)")
+    voice = PatientVoiceInterface("FAMILY", family_view=family)
+    start = datetime.datetime(2026, 2, 8, 10, 0)
+    results = [voice.listen_mode("someone stole my money, they took it", start + datetime.timedelta(minutes=i))
+               for i in range(3)]
+    assert results[-1]["log_to_doctor"]["state"] == "episode"
+
+    dashboard = family.render_dashboard()
+    assert FAMILY_ALERT_MESSAGES["episode_alert"] in dashboard["alerts"]
+    assert dashboard["todays_overview"]["episodes"] == 1
+    assert dashboard["current_state"]["needs_attention"]
+
+def test_late_record_from_an_earlier_day_leaves_today_alone():
+    family = MaterializedFamilyView("Suhasini (Aai)")
+    today = datetime.datetime(2026, 2, 9, 9, 0)
+    family.observe(InteractionRecord.of(today, CognitiveState.EPISODE, [EmotionalTrigger.MATERNAL_GRIEF]))
+    family.record_meal(today)
+    version = family.version
+
+    family.observe(InteractionRecord.of(today - datetime.timedelta(days=1), CognitiveState.STABLE))
+    family.record_meal(today - datetime.timedelta(hours=12))
+
+    assert family.version == version
+    assert family.day == today.date()
+    assert (family.meals, family.episodes, family.mood) == (1, 1, "distressed")
+    assert {alert["type"] for alert in family.alerts} == {"episode_alert", "maternal_grief_alert"}
+
+    family.observe(InteractionRecord.of(today + datetime.timedelta(days=1), CognitiveState.STABLE))
+    assert (family.meals, family.episodes, family.alerts) == (0, 0, [])
@@ -0,0 +1,71 @@
+import datetime
+import random
+
+from syncare import SlidingWindowCounter
+
+T0 = datetime.datetime(2026, 2, 8, 10, 30)
+
+def _at(minutes):
+    return T0 + datetime.timedelta(minutes=minutes)
+
+def test_minute_ring_expiry():
+    counter = SlidingWindowCounter()
+    counter.add(_at(0))
+    counter.add(_at(0), 2)
+    assert counter.count(60, _at(59)) == 3
+    assert counter.count(60, _at(60)) == 0
+
+def test_hour_ring_expiry_after_the_minute_handoff():
+    counter = SlidingWindowCounter()
+    counter.add(_at(0))
+    # Gone from the hour window, still counted by the day and week windows
+    assert [counter.count(window, _at(90)) for window in (60, 1440, 10080)] == [0, 1, 1]
+    # The day window is the current hour plus the 23 whole hours before it
+    assert counter.count(1440, T0.replace(minute=59) + datetime.timedelta(hours=23)) == 1
+    assert counter.count(1440, T0.replace(minute=0) + datetime.timedelta(hours=24)) == 0
+    assert counter.count(10080, T0.replace(minute=0) + datetime.timedelta(hours=24)) == 1
+    assert counter.count(10080, T0.replace(minute=0) + datetime.timedelta(hours=168)) == 0
+
+def test_gaps_longer_than_each_ring():
+    counter = SlidingWindowCounter()
+    counter.add(_at(0), 4)
+    # Past the whole minute ring but inside the hour ring
+    counter.add(_at(3 * 60))
+    assert [counter.count(window) for window in (60, 1440, 10080)] == [1, 5, 5]
+    # Past both rings
+    counter.add(_at(3 * 60 + 2 * 10080))
+    assert [counter.count(window) for window in (60, 1440, 10080)] == [1, 1, 1]
+    assert sum(counter.minutes) == sum(counter.hours) == 1
+
+def test_late_events_count_only_in_windows_they_still_fall_in():
+    counter = SlidingWindowCounter()
+    counter.add(_at(120))
+    counter.add(_at(100))
+    counter.add(_at(30))
+    assert [counter.count(window) for window in (60, 1440, 10080)] == [2, 3, 3]
+
+def test_matches_a_brute_force_count():
+    rng = random.Random(11)
+    counter = SlidingWindowCounter((15, 60, 180, 1440, 10080))
+    base = SlidingWindowCounter.minute_of(T0)
+    events, minute = [], 0
+    for _ in range(1500):
+        minute += rng.choice([0, 1, 2, 7, 45, 61, 200, 1500, 11000]) if rng.random() < 0.9 else -rng.randrange(30)
+        counter.add(_at(minute))
+        events.append(base + minute)
+        now = max(events)
+        for window in counter.windows:
+            if window <= 60:
+                expected = sum(1 for m in events if now - m < window)
+            else:
+                expected = sum(1 for m in events if now // 60 - m // 60 < -(-window // 60))
+            assert counter.count(window) == expected, (window, minute)
+
+def test_round_trip():
+    counter = SlidingWindowCounter()
+    for minute in (0, 5, 70, 1500):
+        counter.add(_at(minute))
+    restored = SlidingWindowCounter.from_dict(counter.to_dict())
+    restored.add(_at(1510))
+    counter.add(_at(1510))
+    assert restored.to_dict() == counter.to_dict()
@@ -0,0 +1,34 @@
+import random
+
+from syncare.matching import DEFAULT_TRIGGER_MATCHER, STATE_CUE_VOCABULARY, TRIGGER_VOCABULARY, StreamingTriggerScanner
+
+KEYWORDS = sorted({keyword for vocabulary in (TRIGGER_VOCABULARY, STATE_CUE_VOCABULARY)
+                   for keywords in vocabulary.values() for keyword in keywords})
+FILLER = ["where", "is", "my", "the", "today", "HOME", "Money", "homework", "stolen", "pankaj's", "तो", "घर",
+          "can't", "remember", "forgetful", "bus", "  ", ",", "...", "\n"]
+
+def _utterance(rng: random.Random) -> str:
+    words = [rng.choice(KEYWORDS if rng.random() < 0.4 else FILLER) for _ in range(rng.randint(0, 16))]
+    return "".join(word + rng.choice([" ", "", ", ", "-"]) for word in words)
+
+def _random_deltas(rng: random.Random, text: str):
+    cuts = sorted(rng.sample(range(len(text) + 1), rng.randint(0, len(text) + 1)))
+    bounds = [0] + cuts + [len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+def test_streamed_scan_matches_whole_utterance_scan():
+    rng = random.Random(20260208)
+    for _ in range(2000):
+        text = _utterance(rng)
+        scanner = StreamingTriggerScanner(DEFAULT_TRIGGER_MATCHER)
+        for delta in _random_deltas(rng, text):
+            scanner.feed(delta)
+        assert scanner.text == text
+        assert scanner.close() == DEFAULT_TRIGGER_MATCHER.scan(text), text
+
+def test_character_at_a_time_matches_whole_utterance_scan():
+    for text in ["they took my money and my sister", "I can't remember", "moneymoney home", "Solapur ghar घर"]:
+        scanner = StreamingTriggerScanner(DEFAULT_TRIGGER_MATCHER)
+        for char in text:
+            scanner.feed(char)
+        assert scanner.close() == DEFAULT_TRIGGER_MATCHER.scan(text)
@@ -0,0 +1,76 @@
+import datetime
+
+from syncare import DoseLedger, DoseLedgerStore
+from syncare.medication import DEFAULT_DOSE_TIMES
+
+DAY = datetime.date(2026, 2, 8)
+
+def _at(hour, minute=0, day=DAY):
+    return datetime.datetime.combine(day, datetime.time(hour, minute))
+
+def _ledger():
+    return DoseLedger(DEFAULT_DOSE_TIMES, start=_at(7, 0))
+
+def test_confirm_matches_the_dose_inside_its_window():
+    ledger = _ledger()
+    assert ledger.confirm(_at(6, 59)) is None  # More than the 60-minute grace early
+    assert ledger.confirm(_at(7, 0)) == _at(8, 0)
+    # 08:00 is taken; 12:10 is past its 240-minute late limit anyway, and within 13:00's grace
+    assert ledger.confirm(_at(12, 10)) == _at(13, 0)
+    assert ledger.confirm(_at(12, 20)) is None
+    assert ledger.day_counts(DAY) == (2, 4)
+
+def test_close_due_marks_untaken_doses_missed_once():
+    ledger = _ledger()
+    assert ledger.close_due(_at(8, 59)) == []
+    assert ledger.close_due(_at(9, 0)) == [_at(8, 0)]
+    assert ledger.close_due(_at(9, 30)) == []
+    assert ledger.missed_streak == 1
+    ledger.confirm(_at(13, 5))
+    assert ledger.close_due(_at(22, 30)) == [_at(18, 0), _at(21, 0)]
+    assert (ledger.taken_total, ledger.missed_total, ledger.missed_streak) == (1, 3, 2)
+    # A poll after midnight picks up the previous evening too, without repeating it
+    assert ledger.close_due(_at(9, 0, DAY + datetime.timedelta(days=1))) == [_at(8, 0, DAY + datetime.timedelta(days=1))]
+    assert ledger.missed_streak == 3
+
+def test_a_late_confirmation_recounts_the_streak():
+    ledger = _ledger()
+    ledger.close_due(_at(14, 0))
+    assert ledger.missed_streak == 2
+    # The 08:00 dose, taken late: only the 13:00 one is still missed
+    assert ledger.confirm(_at(11, 30)) == _at(8, 0)
+    assert (ledger.missed_total, ledger.missed_streak) == (1, 1)
+    assert ledger.late_minutes[0] == 210
+    ledger.close_due(_at(22, 0))
+    assert ledger.missed_streak == 3
+    # Taking the 21:00 dose late ends the streak
+    ledger.confirm(_at(22, 30))
+    assert ledger.missed_streak == 0
+
+def test_save_and_load_round_trip(tmp_path):
+    ledger = _ledger()
+    ledger.confirm(_at(7, 50))
+    ledger.close_due(_at(14, 30))
+    ledger.confirm(_at(15, 0))
+    ledger.close_due(_at(10, 0, DAY + datetime.timedelta(days=1)))
+    path = str(tmp_path / "P.doses")
+    ledger.save(path)
+
+    loaded = DoseLedger.load(path)
+    for column, loaded_column in zip(ledger._columns(), loaded._columns()):
+        assert column == loaded_column
+    assert (loaded.first_day, loaded.days, loaded.slot_minutes, loaded.schedule_mask) == \
+        (ledger.first_day, ledger.days, ledger.slot_minutes, ledger.schedule_mask)
+    assert (loaded.taken_total, loaded.missed_total, loaded.missed_streak) == \
+        (ledger.taken_total, ledger.missed_total, ledger.missed_streak)
+    later = _at(22, 0, DAY + datetime.timedelta(days=1))
+    assert loaded.close_due(later) == ledger.close_due(later)
+
+def test_store_only_holds_prescribed_patients(tmp_path):
+    store = DoseLedgerStore(str(tmp_path))
+    assert store.get("P") is None
+    ledger = _ledger()
+    ledger.close_due(_at(9, 0))
+    store.put("P", ledger)
+    store.release("P")
+    assert DoseLedgerStore(str(tmp_path)).get("P").missed_total == 1
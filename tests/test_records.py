@@ -0,0 +1,70 @@
+import datetime
+import gzip
+import json
+import os
+import random
+
+from syncare import InteractionLogStore, InteractionRecord, PatientVoiceInterface, STATES_BY_CODE, triggers_from_mask
+from syncare.matching import STATE_CUE_VOCABULARY, TRIGGER_VOCABULARY
+
+WORDS = sorted({keyword for vocabulary in (TRIGGER_VOCABULARY, STATE_CUE_VOCABULARY)
+                for keywords in vocabulary.values() for keyword in keywords})
+FILLER = ["where", "is", "my", "the", "today", "please", "I", "want", "to", "go", "now", "kuthe", "aahe", "आज", "बहन"]
+
+# listen_mode outputs for _corpus(20_000), frozen; regenerate after an intended change with
+# PYTHONPATH=. python tests/test_records.py
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden", "listen_mode_20k.jsonl.gz")
+# Utterances go round-robin to this many patients, so escalation doesn't hold one patient in EPISODE
+PATIENTS = 200
+
+def _corpus(size: int, seed: int = 18):
+    """(utterance, timestamp) pairs over three days, with sub-second timestamps"""
+    rng = random.Random(seed)
+    start = datetime.datetime(2026, 2, 8, 6, 0)
+    return [
+        (" ".join(rng.choice(WORDS if rng.random() < 0.35 else FILLER) for _ in range(rng.randint(1, 20))),
+         start + datetime.timedelta(seconds=3 * 86400 * i / size, microseconds=rng.randrange(1_000_000)))
+        for i in range(size)
+    ]
+
+def _outputs(result):
+    log = result["log_to_doctor"]
+    return [log["state"], log["triggers"], result["ai_speaks"], result["should_alert_family"]]
+
+def test_records_match_frozen_outputs_over_20k_utterances(tmp_path):
+    corpus = _corpus(20_000)
+    with gzip.open(GOLDEN_PATH, "rt", encoding="utf-8") as f:
+        golden = [json.loads(line) for line in f]
+    assert len(golden) == len(corpus)
+
+    voices = [PatientVoiceInterface(f"FUZZ{i}") for i in range(PATIENTS)]
+    records = []
+    for i, ((text, timestamp), expected) in enumerate(zip(corpus, golden)):
+        result = voices[i % PATIENTS].listen_mode(text, timestamp)
+        assert _outputs(result) == expected, text
+        assert result["log_to_doctor"]["timestamp"] == timestamp.isoformat()
+        record = InteractionRecord.from_log_dict(dict(result["log_to_doctor"], patient_said=text))
+        assert record.to_dict()["state"] == STATES_BY_CODE[record.state_code].value
+        assert [t.value for t in triggers_from_mask(record.trigger_mask)] == expected[1]
+
+        again = InteractionRecord.from_log_dict(record.to_dict())
+        assert again == record and hash(again) == hash(record)
+        assert again.timestamp == timestamp
+        records.append(record)
+
+    assert len(set(records)) == len({(r.micros, r.patient_said, r.state_code, r.trigger_mask) for r in records})
+
+    with InteractionLogStore(str(tmp_path)) as store:
+        for record in records:
+            store.append_record("FUZZ", record)
+        stored = [record for day in range(4)
+                  for record in store.read_day_records("FUZZ", datetime.date(2026, 2, 8 + day))]
+    assert stored == sorted(records, key=lambda r: (r.micros, r.state_code, r.trigger_mask, r.patient_said))
+
+if __name__ == "__main__":
+    os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+    voices = [PatientVoiceInterface(f"FUZZ{i}") for i in range(PATIENTS)]
+    with gzip.open(GOLDEN_PATH, "wt", encoding="utf-8") as f:
+        for i, (text, timestamp) in enumerate(_corpus(20_000)):
+            result = voices[i % PATIENTS].listen_mode(text, timestamp)
+            f.write(json.dumps(_outputs(result), ensure_ascii=False) + "\n")
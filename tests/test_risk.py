@@ -0,0 +1,88 @@
+import datetime
+import json
+
+from syncare import CognitiveState, EmotionalTrigger, EscalationDetector
+from syncare.model import TRIGGER_BITS
+
+START = datetime.datetime(2026, 2, 8, 10, 0)
+MONEY = TRIGGER_BITS[EmotionalTrigger.MONEY_ANXIETY]
+THREE_HITS = MONEY | TRIGGER_BITS[EmotionalTrigger.HOME_LONGING] | TRIGGER_BITS[EmotionalTrigger.ISOLATION_PANIC]
+
+def _turn(detector, minutes, mask=MONEY, sundown=False, state=CognitiveState.AGITATED):
+    if not mask:
+        state = CognitiveState.STABLE
+    return detector.update(START + datetime.timedelta(minutes=minutes), state, mask, 0, sundown)
+
+def test_streak_escalates_on_the_threshold_turn():
+    detector = EscalationDetector()
+    assert _turn(detector, 0) == (CognitiveState.AGITATED, None)
+    assert _turn(detector, 1) == (CognitiveState.AGITATED, None)
+    state, alert = _turn(detector, 2)
+    assert state is CognitiveState.EPISODE
+    assert alert.distress_streak == 3 and alert.episode_started == START
+    assert alert.reason == "3 distressed turns in a row"
+
+def test_streak_resets_after_a_long_gap_or_a_calm_turn():
+    detector = EscalationDetector()
+    _turn(detector, 0)
+    _turn(detector, 1)
+    assert _turn(detector, 12) == (CognitiveState.AGITATED, None)  # 11 minutes > max_gap_seconds
+    _turn(detector, 13)
+    assert _turn(detector, 14, mask=0) == (CognitiveState.STABLE, None)
+    assert _turn(detector, 15) == (CognitiveState.AGITATED, None)
+    assert detector.streak == 1
+
+def test_sundown_lowers_both_thresholds():
+    detector = EscalationDetector()
+    _turn(detector, 0, sundown=True)
+    state, alert = _turn(detector, 1, sundown=True)
+    assert state is CognitiveState.EPISODE and alert.reason == "2 distressed turns in a row during sundown hours"
+
+def test_density_escalates_within_the_window_only():
+    detector = EscalationDetector(streak_threshold=99, max_gap_seconds=60)
+    _turn(detector, 0, mask=THREE_HITS)
+    # Outside the 10-minute window the first turn's hits have expired
+    assert _turn(detector, 11, mask=THREE_HITS) == (CognitiveState.AGITATED, None)
+    state, alert = _turn(detector, 15, mask=THREE_HITS)
+    assert state is CognitiveState.EPISODE
+    assert alert.trigger_density == 6 and alert.reason == "6 distress signals in 10 minutes"
+
+def test_one_alert_per_episode_and_rate_limited_between_episodes():
+    detector = EscalationDetector()
+    alerts = []
+    detector.subscribe(alerts.append)
+    for minute in range(6):
+        state, _ = _turn(detector, minute)
+    assert state is CognitiveState.EPISODE and len(alerts) == 1
+
+    # Two calm turns end it; a new episode 10 minutes later is not announced again
+    assert _turn(detector, 6, mask=0)[0] is CognitiveState.EPISODE
+    assert _turn(detector, 7, mask=0)[0] is CognitiveState.STABLE
+    for minute in (8, 9, 10):
+        state, alert = _turn(detector, minute)
+    assert state is CognitiveState.EPISODE and alert is None and len(alerts) == 1
+
+    for minute in (11, 12):
+        _turn(detector, minute, mask=0)
+    for minute in (60, 61, 62):
+        state, alert = _turn(detector, minute)
+    assert alert is not None and alerts == [alerts[0], alert]
+
+def test_quiet_time_calms_an_episode_out():
+    detector = EscalationDetector()
+    for minute in range(3):
+        _turn(detector, minute)
+    assert detector.in_episode
+    # Distress after more than quiet_seconds starts over rather than extending the episode
+    assert _turn(detector, 40) == (CognitiveState.AGITATED, None)
+    assert not detector.in_episode and detector.streak == 1
+
+def test_restore_resumes_mid_streak():
+    detector = EscalationDetector()
+    _turn(detector, 0, mask=THREE_HITS)
+    _turn(detector, 1)
+    restored = EscalationDetector()
+    restored.restore(json.loads(json.dumps(detector.to_dict())))
+    assert restored.to_dict() == detector.to_dict()
+    assert _turn(restored, 2) == _turn(detector, 2)
+    assert restored.in_episode and restored.to_dict() == detector.to_dict()
@@ -0,0 +1,92 @@
+import datetime
+
+import pytest
+
+from syncare import InterventionScheduler, PatientVoiceInterface
+
+def _voice_with_early_onset():
+    """A patient whose profile has learned distress from 14:00 on"""
+    voice = PatientVoiceInterface("EARLY")
+    profile = voice.companion.sundown_profile
+    start = datetime.datetime(2026, 1, 1)
+    for day in range(14):
+        for hour in range(12, 20):
+            profile.observe(start + datetime.timedelta(days=day, hours=hour), distressed=hour >= 14)
+    assert profile.intervention_time(30) == datetime.time(13, 30)
+    return voice
+
+def test_moving_a_pending_intervention_into_the_past_delivers_it_today():
+    voice = _voice_with_early_onset()
+    scheduler = InterventionScheduler(seed=1)
+    morning = datetime.datetime(2026, 2, 8, 9, 0)
+    voice.register_schedule(scheduler, now=morning)
+
+    # 14:00: the 15:30 run hasn't gone out, and the learned 13:30 has already passed
+    now = datetime.datetime(2026, 2, 8, 14, 0)
+    assert voice.update_sundown_schedule(scheduler, now=now) == datetime.time(13, 30)
+    events = [event for event in scheduler.pop_due(now) if event.purpose == "pre_sundown_intervention"]
+    assert len(events) == 1 and events[0].scheduled_for == now
+
+    # Nothing more today; tomorrow it runs at the new time
+    assert not [e for e in scheduler.pop_due(datetime.datetime(2026, 2, 8, 23, 0))
+                if e.purpose == "pre_sundown_intervention"]
+    tomorrow = scheduler.pop_due(datetime.datetime(2026, 2, 9, 13, 31))
+    assert [event.scheduled_for for event in tomorrow if event.purpose == "pre_sundown_intervention"] == \
+        [datetime.datetime(2026, 2, 9, 13, 30)]
+
+def test_moving_an_intervention_that_already_ran_starts_tomorrow():
+    voice = _voice_with_early_onset()
+    scheduler = InterventionScheduler(seed=1)
+    voice.register_schedule(scheduler, now=datetime.datetime(2026, 2, 8, 9, 0))
+    assert [e.purpose for e in scheduler.pop_due(datetime.datetime(2026, 2, 8, 15, 31))] == \
+        ["pre_sundown_intervention"]
+
+    now = datetime.datetime(2026, 2, 8, 16, 0)
+    voice.update_sundown_schedule(scheduler, now=now)
+    assert not [e for e in scheduler.pop_due(datetime.datetime(2026, 2, 8, 17, 0))
+                if e.purpose == "pre_sundown_intervention"]
+
+def test_occurrences_later_than_max_late_seconds_are_skipped():
+    scheduler = InterventionScheduler()
+    scheduler.add("P", datetime.time(8, 0), "morning_medication", now=datetime.datetime(2026, 2, 8, 7, 0))
+    scheduler.add("P", datetime.time(8, 0), "evening_ritual", now=datetime.datetime(2026, 2, 8, 7, 0),
+                  max_late_seconds=None)
+    # 90 minutes late: only the schedule that never expires still delivers
+    assert [event.purpose for event in scheduler.pop_due(datetime.datetime(2026, 2, 8, 9, 30))] == ["evening_ritual"]
+    # The skipped one resumes at its next occurrence
+    events = scheduler.pop_due(datetime.datetime(2026, 2, 9, 8, 10))
+    assert sorted(event.purpose for event in events) == ["evening_ritual", "morning_medication"]
+    assert all(event.late_by_seconds == 600 for event in events)
+
+def test_jitter_stays_within_bounds():
+    scheduler = InterventionScheduler(seed=7)
+    occurrence = datetime.datetime(2026, 2, 8, 15, 30)
+    for i in range(200):
+        scheduler.add(f"P{i}", occurrence.time(), "pre_sundown_intervention", jitter_seconds=300,
+                      now=datetime.datetime(2026, 2, 8, 9, 0))
+    assert scheduler.next_fire_time() >= occurrence.timestamp()
+    assert scheduler.pop_due(occurrence - datetime.timedelta(seconds=1)) == []
+
+    events = scheduler.pop_due(occurrence + datetime.timedelta(seconds=300))
+    assert len(events) == 200
+    assert all(event.scheduled_for == occurrence and 0 <= event.late_by_seconds <= 300 for event in events)
+    # Spread out rather than all at one instant
+    assert len({round(event.late_by_seconds) for event in events}) > 100
+
+def test_local_time_holds_across_a_dst_change():
+    zoneinfo = pytest.importorskip("zoneinfo")
+    try:
+        london = zoneinfo.ZoneInfo("Europe/London")
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip("no tz database")
+    utc = datetime.timezone.utc
+    scheduler = InterventionScheduler()
+    # Clocks go forward at 01:00 UTC on 29 March 2026
+    scheduler.add("P", datetime.time(8, 0), "morning_medication", tz=london,
+                  now=datetime.datetime(2026, 3, 28, 9, 0, tzinfo=london))
+    assert scheduler.next_fire_time() == datetime.datetime(2026, 3, 29, 7, 0, tzinfo=utc).timestamp()
+
+    [event] = scheduler.pop_due(datetime.datetime(2026, 3, 29, 7, 0, 30, tzinfo=utc))
+    assert event.scheduled_for == datetime.datetime(2026, 3, 29, 8, 0, tzinfo=london)
+    assert event.scheduled_for.utcoffset() == datetime.timedelta(hours=1)
+    assert scheduler.next_fire_time() == datetime.datetime(2026, 3, 30, 7, 0, tzinfo=utc).timestamp()
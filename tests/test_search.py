@@ -0,0 +1,54 @@
+import datetime
+
+from syncare import TranscriptIndex
+
+DAY = datetime.datetime(2026, 2, 8)
+UTTERANCES = [
+    (DAY.replace(hour=9), "Mala ghar jaana aahe"),
+    (DAY.replace(hour=14, minute=30), "jaana ghar, now!"),
+    (DAY.replace(hour=15), "I want to go ghar, jaana today"),
+    (DAY.replace(hour=17, minute=45), "Where is my money? Ghar jaana."),
+    (DAY.replace(hour=18) + datetime.timedelta(days=1), "मला घर जायचं आहे, ghar jaana"),
+]
+
+def _index(tmp_path):
+    index = TranscriptIndex(str(tmp_path))
+    for timestamp, text in UTTERANCES:
+        index.add("P", timestamp, text)
+    return index
+
+def _said(results):
+    return [result["patient_said"] for result in results]
+
+def test_phrases_match_only_adjacent_words_in_order(tmp_path):
+    with _index(tmp_path) as index:
+        # All five have both words; only four have them next to each other in order
+        assert len(index.search("P", "ghar jaana")) == 5
+        assert _said(index.search("P", '"ghar jaana"')) == [text for i, (_, text) in enumerate(UTTERANCES) if i != 1]
+        assert _said(index.search("P", '"jaana ghar"')) == ["jaana ghar, now!"]
+        assert _said(index.search("P", '"ghar jaana" money')) == ["Where is my money? Ghar jaana."]
+        assert _said(index.search("P", '"मला घर"')) == ["मला घर जायचं आहे, ghar jaana"]
+        assert index.search("P", '"jaana aahe ghar"') == []
+        assert index.search("P", "nothing") == []
+
+def test_since_until_and_time_of_day_filters(tmp_path):
+    with _index(tmp_path) as index:
+        assert _said(index.search("P", "ghar", since=DAY.replace(hour=15))) == \
+            [text for _, text in UTTERANCES[2:]]
+        # until is exclusive
+        assert _said(index.search("P", "ghar", until=DAY.replace(hour=15))) == \
+            [text for _, text in UTTERANCES[:2]]
+        assert _said(index.search("P", "ghar", since=DAY.replace(hour=10), until=DAY + datetime.timedelta(days=1))) == \
+            [text for _, text in UTTERANCES[1:4]]
+        assert _said(index.search("P", "ghar", after=datetime.time(15))) == [text for _, text in UTTERANCES[2:]]
+        assert _said(index.search("P", "ghar", after=datetime.time(14), before=datetime.time(17, 45))) == \
+            [text for _, text in UTTERANCES[1:3]]
+        assert _said(index.search("P", '"ghar jaana"', after=datetime.time(17), limit=1)) == [UTTERANCES[3][1]]
+        assert index.search("P", "ghar")[0]["timestamp"] == UTTERANCES[0][0].isoformat()
+
+def test_reopened_index_answers_the_same(tmp_path):
+    with _index(tmp_path) as index:
+        before = index.search("P", '"ghar jaana"', after=datetime.time(12))
+    with TranscriptIndex(str(tmp_path)) as index:
+        assert index.search("P", '"ghar jaana"', after=datetime.time(12)) == before
+        assert index.search("Q", "ghar") == []
@@ -0,0 +1,65 @@
+import datetime
+
+from syncare import (DailySeriesStore, DoseLedgerStore, EmotionalTrigger, InteractionLogStore, SessionManager,
+                     SessionStateStore)
+from syncare.medication import DEFAULT_DOSE_TIMES
+
+START = datetime.datetime(2026, 2, 8, 9, 0)
+UTTERANCES = ["where is my money", "I want to go home", "they took my money", "where is Pankaj", "I can't remember"]
+
+def _talk(manager, patient_id):
+    for i, text in enumerate(UTTERANCES):
+        manager.listen(patient_id, text, START + datetime.timedelta(minutes=i))
+
+def test_eviction_persists_state_and_get_restores_it(tmp_path):
+    manager = SessionManager(capacity=1, state_store=SessionStateStore(str(tmp_path / "state")))
+    _talk(manager, "A")
+    session = manager.get("A")
+    before = session.insights_engine.generate_daily_summary(START.date())
+    frequencies = session.voice.analyzer.frequencies.to_dict()
+    family = session.family.render_dashboard()
+
+    manager.get("B")
+    assert "A" not in manager and len(manager) == 1
+
+    restored = manager.get("A")
+    assert restored is not session
+    assert restored.insights_engine.generate_daily_summary(START.date()) == before
+    assert "5 interactions" in before["narrative_summary"]
+    assert restored.voice.analyzer.frequencies.to_dict() == frequencies
+    assert restored.family.render_dashboard() == family
+    assert restored.voice.companion.escalation.to_dict() == session.voice.companion.escalation.to_dict()
+
+def test_summary_is_rebuilt_from_the_log_without_saved_state(tmp_path):
+    with InteractionLogStore(str(tmp_path / "logs")) as log_store:
+        manager = SessionManager(capacity=1, log_store=log_store)
+        _talk(manager, "A")
+        before = manager.get("A").daily_summary(START.date())
+        manager.get("B")
+
+        restored = manager.get("A")
+        assert START.date() not in restored.insights_engine.daily_aggregates
+        assert restored.daily_summary(START.date()) == before
+        assert restored.doctor.view_calendar_insights(START.date())["ai_narrative"] == before["narrative_summary"]
+
+def test_evicted_series_and_doses_come_back_from_their_stores(tmp_path):
+    series_store = DailySeriesStore(str(tmp_path / "series"))
+    dose_store = DoseLedgerStore(str(tmp_path / "doses"))
+    manager = SessionManager(capacity=1, series_store=series_store, dose_store=dose_store,
+                             state_store=SessionStateStore(str(tmp_path / "state")))
+    manager.prescribe("A", DEFAULT_DOSE_TIMES, START)
+    manager.get("A").family.record_medication(START.replace(hour=8, minute=5))
+    _talk(manager, "A")
+    session = manager.get("A")
+    money = session.insights_engine.daily_series.window(
+        session.insights_engine.daily_series.trigger_columns[EmotionalTrigger.MONEY_ANXIETY], START.date(), 1)
+    assert money[0] > 0
+
+    manager.evict("A")
+    assert "A" not in manager and "A" not in series_store._series and "A" not in dose_store._ledgers
+
+    restored = manager.get("A")
+    series = restored.insights_engine.daily_series
+    assert series.window(series.trigger_columns[EmotionalTrigger.MONEY_ANXIETY], START.date(), 1) == money
+    assert restored.doses.day_counts(START.date()) == (1, 4)
+    assert restored.family.render_dashboard()["todays_overview"]["medications"] == "1/4"
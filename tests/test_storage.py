@@ -0,0 +1,38 @@
+import datetime
+import os
+
+from syncare import CognitiveState, EmotionalTrigger, InteractionLogStore
+
+DAY = datetime.date(2026, 2, 8)
+
+def _write(root, texts, start=datetime.datetime(2026, 2, 8, 9, 0)):
+    with InteractionLogStore(root) as store:
+        for i, text in enumerate(texts):
+            store.append("P", start + datetime.timedelta(minutes=i), CognitiveState.STABLE,
+                         [EmotionalTrigger.HOME_LONGING], text)
+
+def _texts(root):
+    with InteractionLogStore(root) as store:
+        return [record.patient_said for record in store.read_day_records("P", DAY)]
+
+def test_records_past_the_utterance_heap_are_dropped(tmp_path):
+    root = str(tmp_path)
+    _write(root, ["first", "second", "third"])
+    # A crash after the records reached disk but before the last utterances did
+    utt_path = os.path.join(root, "P", "2026-02.utt")
+    os.truncate(utt_path, len("first") + 2)
+
+    assert _texts(root) == ["first"]
+    _write(root, ["fourth"], start=datetime.datetime(2026, 2, 8, 10, 0))
+    assert _texts(root) == ["first", "fourth"]
+
+def test_torn_record_tail_is_dropped(tmp_path):
+    root = str(tmp_path)
+    _write(root, ["first", "second"])
+    rec_path = os.path.join(root, "P", "2026-02.rec")
+    os.truncate(rec_path, os.path.getsize(rec_path) - 3)
+
+    assert _texts(root) == ["first"]
+    _write(root, ["third"], start=datetime.datetime(2026, 2, 8, 10, 0))
+    assert _texts(root) == ["first", "third"]
+    assert os.path.getsize(rec_path) == 2 * InteractionLogStore.RECORD.size
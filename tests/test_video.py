@@ -0,0 +1,79 @@
+import datetime
+import struct
+
+import pytest
+
+from syncare import VideoIngestor
+
+RECORDED = datetime.datetime(2026, 2, 8, 16, 0, tzinfo=datetime.timezone.utc)
+MP4_EPOCH = datetime.datetime(1904, 1, 1, tzinfo=datetime.timezone.utc)
+SAMPLE_SIZE = 100
+
+def _box(box_type: bytes, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(body), box_type) + body
+
+def _full_box(box_type: bytes, *payload: bytes) -> bytes:
+    return _box(box_type, b"\0\0\0\0", *payload)
+
+def _mp4(stsz_count: int = 6, with_mvhd: bool = True) -> bytes:
+    """ftyp, mdat with six 100-byte samples in two chunks, then moov indexing them.
+
+    Samples are 0.5 s apart (delta 300 at timescale 600); samples 1 and 4 are sync samples.
+    """
+    ftyp = _box(b"ftyp", b"isom", struct.pack(">I", 512), b"isomiso2")
+    mdat_start = len(ftyp) + 8
+    mdat = _box(b"mdat", bytes(range(SAMPLE_SIZE)) * 6)
+    created = int((RECORDED - MP4_EPOCH).total_seconds())
+    stbl = _box(
+        b"stbl",
+        _full_box(b"stts", struct.pack(">III", 1, 6, 300)),
+        _full_box(b"stss", struct.pack(">III", 2, 1, 4)),
+        _full_box(b"stsc", struct.pack(">IIII", 1, 1, 3, 1)),
+        _full_box(b"stsz", struct.pack(">II", 0, stsz_count), struct.pack(">6I", *[SAMPLE_SIZE] * 6)),
+        _full_box(b"stco", struct.pack(">III", 2, mdat_start, mdat_start + 3 * SAMPLE_SIZE)),
+    )
+    trak = _box(
+        b"trak",
+        _box(
+            b"mdia",
+            _full_box(b"mdhd", struct.pack(">IIII", created, created, 600, 1800), b"\0" * 4),
+            _full_box(b"hdlr", b"\0" * 4, b"vide", b"\0" * 12, b"VideoHandler\0"),
+            _box(b"minf", stbl),
+        ),
+    )
+    mvhd = _full_box(b"mvhd", struct.pack(">IIII", created, created, 1000, 3000), b"\0" * 80)
+    moov = _box(b"moov", *([mvhd] if with_mvhd else []), trak)
+    return ftyp + mdat + moov
+
+def _write(tmp_path, data: bytes) -> str:
+    path = tmp_path / "episode.mp4"
+    path.write_bytes(data)
+    return str(path)
+
+def test_parses_duration_creation_time_and_keyframes(tmp_path):
+    data = _mp4()
+    path = _write(tmp_path, data)
+    result = VideoIngestor(chunk_size=256, workers=0).ingest(path)
+
+    mdat_start = data.index(b"mdat") + 4
+    assert result.size_bytes == len(data)
+    assert result.duration_seconds == 3.0
+    assert result.creation_time == RECORDED.astimezone().replace(tzinfo=None)
+    assert result.keyframes == [(0.0, mdat_start), (1.5, mdat_start + 3 * SAMPLE_SIZE)]
+    assert [chunk["offset"] for chunk in result.chunk_results] == list(range(0, len(data), 256))
+    assert result.chunk_results[-1]["end_seconds"] == 3.0
+
+@pytest.mark.parametrize("data, message", [
+    (b"", "is empty"),
+    (b"\0\0\0\x10RIFFxxxxWAVE", "not an MP4"),
+    (_mp4()[:-40], "Corrupt box"),
+    (_mp4()[:_mp4().index(b"moov") - 4], "no moov index"),
+    (_mp4(with_mvhd=False), "Missing mvhd box"),
+    (_mp4(stsz_count=10_000), "Corrupt stsz box"),
+    (_box(b"ftyp", b"isom") + _box(b"moov", _full_box(b"mvhd")), "corrupt moov index"),
+], ids=["empty", "not-mp4", "truncated-moov", "no-moov", "no-mvhd", "overrun-table", "short-mvhd"])
+def test_malformed_files_raise_value_error(tmp_path, data, message):
+    path = _write(tmp_path, data)
+    with pytest.raises(ValueError, match=message):
+        VideoIngestor(workers=0).ingest(path)